@@ -5,9 +5,9 @@ Provides functions to calculate and analyze company hiring behavior,
 including posting patterns, reliability scores, and new grad friendliness.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
-from job_tracker.db import Database
+from job_tracker.db import Database, to_epoch
 import json
 import sqlite3
 
@@ -32,6 +32,10 @@ def calculate_company_analytics(
         snapshot_date = datetime.now()
     
     cur = db.conn.cursor()
+    # Catalog timestamps are epoch seconds (see db.to_epoch).
+    now = to_epoch(datetime.now(timezone.utc))
+    since_90_days = now - 90 * 86400
+    since_30_days = now - 30 * 86400
     
     # Get job posting stats (last 90 days)
     cur.execute(
@@ -39,11 +43,11 @@ def calculate_company_analytics(
         SELECT 
             COUNT(*) as total_posted,
             COUNT(CASE WHEN removed_at IS NOT NULL THEN 1 END) as total_removed,
-            AVG(JULIANDAY(removed_at) - JULIANDAY(first_seen)) as avg_duration
+            AVG(removed_at - first_seen) / 86400.0 as avg_duration
         FROM jobs
-        WHERE company_id = ? AND first_seen >= date('now', '-90 days')
+        WHERE company_id = ? AND first_seen >= ?
         """,
-        (company_id,)
+        (company_id, since_90_days)
     )
     stats = cur.fetchone()
     
@@ -54,10 +58,10 @@ def calculate_company_analytics(
         FROM jobs
         WHERE company_id = ?
           AND removed_at IS NOT NULL
-          AND JULIANDAY(removed_at) - JULIANDAY(first_seen) <= 7
-          AND first_seen >= date('now', '-90 days')
+          AND removed_at - first_seen <= 7 * 86400
+          AND first_seen >= ?
         """,
-        (company_id,)
+        (company_id, since_90_days)
     )
     ghost_result = cur.fetchone()
     ghost_count = ghost_result["ghost_count"] if ghost_result else 0
@@ -73,9 +77,9 @@ def calculate_company_analytics(
         """
         SELECT COUNT(*) as count
         FROM jobs
-        WHERE company_id = ? AND first_seen >= date('now', '-30 days')
+        WHERE company_id = ? AND first_seen >= ?
         """,
-        (company_id,)
+        (company_id, since_30_days)
     )
     monthly_result = cur.fetchone()
     monthly_postings = monthly_result["count"] if monthly_result else 0
@@ -85,9 +89,9 @@ def calculate_company_analytics(
         """
         SELECT COUNT(*) as count
         FROM jobs
-        WHERE company_id = ? AND removed_at >= date('now', '-30 days')
+        WHERE company_id = ? AND removed_at >= ?
         """,
-        (company_id,)
+        (company_id, since_30_days)
     )
     removal_result = cur.fetchone()
     monthly_removals = removal_result["count"] if removal_result else 0
@@ -108,15 +112,15 @@ def calculate_company_analytics(
     cur.execute(
         """
         SELECT 
-            COUNT(DISTINCT CASE WHEN sj.is_new_grad = 1 THEN j.job_id END) as new_grad_count,
-            COUNT(DISTINCT j.job_id) as total_count
+            COUNT(DISTINCT CASE WHEN sj.is_new_grad = 1 THEN j.job_key END) as new_grad_count,
+            COUNT(DISTINCT j.job_key) as total_count
         FROM jobs j
-        JOIN snapshot_jobs sj ON sj.job_id = j.job_id
+        JOIN snapshot_jobs sj ON sj.job_key = j.job_key
         JOIN snapshots s ON s.snapshot_id = sj.snapshot_id
         WHERE j.company_id = ?
-          AND s.timestamp >= date('now', '-90 days')
+          AND s.timestamp >= ?
         """,
-        (company_id,)
+        (company_id, since_90_days)
     )
     ng_result = cur.fetchone()
     if ng_result and ng_result["total_count"] and ng_result["total_count"] > 0:
@@ -137,15 +141,18 @@ def calculate_company_analytics(
     }
 
 
-def update_company_analytics(db: Database, company_id: int) -> None:
+def update_company_analytics(db: Database, company_id: int, analytics: Optional[Dict] = None) -> None:
     """
     Calculate and store company analytics in the database.
     
     Args:
         db: Database instance
         company_id: Company ID to analyze
+        analytics: Metrics already calculated (e.g. on a connection with
+            the archive attached); calculated on ``db`` if omitted
     """
-    analytics = calculate_company_analytics(db, company_id)
+    if analytics is None:
+        analytics = calculate_company_analytics(db, company_id)
     snapshot_date = datetime.now().date()
     
     cur = db.conn.cursor()
@@ -173,7 +180,7 @@ def update_company_analytics(db: Database, company_id: int) -> None:
             json.dumps(analytics)
         )
     )
-    db.conn.commit()
+    db.commit()
 
 
 def calculate_user_analytics(db: Database, user_id: int) -> Dict:
@@ -226,12 +233,7 @@ def calculate_user_analytics(db: Database, user_id: int) -> Dict:
         SELECT v.sector, COUNT(*) as count
         FROM applications a
         JOIN jobs j ON j.job_id = a.job_id
-        JOIN job_versions v ON v.job_id = j.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        JOIN jobs_current v ON v.job_key = j.job_key
         WHERE a.user_id = ? AND v.sector IS NOT NULL
         GROUP BY v.sector
         ORDER BY count DESC
@@ -264,12 +266,7 @@ def calculate_market_analytics(db: Database) -> Dict:
         """
         SELECT v.sector, COUNT(DISTINCT j.job_id) as job_count
         FROM jobs j
-        JOIN job_versions v ON v.job_id = j.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        JOIN jobs_current v ON v.job_key = j.job_key
         WHERE j.active = 1 AND v.sector IS NOT NULL
         GROUP BY v.sector
         ORDER BY job_count DESC
@@ -5,27 +5,142 @@ Provides database connection, authentication, and other shared dependencies
 used across API endpoints.
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from job_tracker.api.pool import DatabasePool, PoolTimeout
+from job_tracker.archive import attach_archive
 from job_tracker.db import Database
-from pathlib import Path
+from job_tracker.writer import WriteService
+import os
 import secrets
 from datetime import datetime, timedelta
-import sqlite3
-import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
 
 security = HTTPBearer(auto_error=False)
 
+_pool_lock = threading.Lock()
+
+
+def get_pool(app: FastAPI) -> DatabasePool:
+    """Return the app's connection pool.
+
+    The lifespan handler normally creates it at startup; it is created on
+    first use when the app runs without lifespan events (e.g. a bare
+    ``TestClient(app)``).
+    """
+    pool = getattr(app.state, "db_pool", None)
+    if pool is None:
+        with _pool_lock:
+            pool = getattr(app.state, "db_pool", None)
+            if pool is None:
+                pool = app.state.db_pool = DatabasePool.from_env()
+    return pool
+
+
+def get_writer(app: FastAPI) -> WriteService:
+    """Return the app's write service, created on first use like the pool."""
+    writer = getattr(app.state, "writer", None)
+    if writer is None:
+        with _pool_lock:
+            writer = getattr(app.state, "writer", None)
+            if writer is None:
+                pool = get_pool(app)
+                writer = app.state.writer = WriteService(pool.db_path, users_path=pool.users_path)
+    return writer
+
+
+def get_history_pool(app: FastAPI) -> DatabasePool:
+    """Return the app's pool for history queries, created on first use.
+
+    Kept apart from the main pool so the archive attachment and its
+    history views (see ``job_tracker/archive.py``) never slow down
+    ordinary reads. DB_HISTORY_POOL_SIZE bounds it (default 2).
+    """
+    pool = getattr(app.state, "history_pool", None)
+    if pool is None:
+        main = get_pool(app)  # takes _pool_lock itself, so not under it
+        with _pool_lock:
+            pool = getattr(app.state, "history_pool", None)
+            if pool is None:
+                pool = app.state.history_pool = DatabasePool(
+                    main.db_path,
+                    size=int(os.getenv("DB_HISTORY_POOL_SIZE", 2)),
+                    users_path=main.users_path,
+                )
+    return pool
+
+
+def _checkout(pool: DatabasePool) -> Database:
+    try:
+        return pool.acquire()
+    except PoolTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database busy, try again"
+        )
+
 
-def get_db(db_path: str | None = None) -> Database:
+def get_db(request: Request) -> Iterator[Database]:
     """Dependency to get database connection.
     
-    Uses DB_PATH environment variable if provided, otherwise defaults to
-    'live_jobs.db' in the current working directory.
+    Checks a connection out of the app's pool (see ``api/pool.py``) for the
+    duration of the request and returns it afterwards. The database is
+    DB_PATH if set, otherwise 'live_jobs.db' in the current working
+    directory, with the user database (USERS_DB_PATH, by default
+    'live_jobs.users.db' next to it) attached.
+    """
+    pool = get_pool(request.app)
+    db = _checkout(pool)
+    try:
+        yield db
+    finally:
+        pool.release(db)
+
+
+def get_history_db(request: Request) -> Iterator[Database]:
+    """Dependency for read-only handlers that need full catalog history.
+
+    Like ``get_db``, but the connection comes from the history pool and
+    has the archive file attached, so ``job_versions``,
+    ``snapshot_membership``, ``snapshot_jobs`` and ``blobs`` include
+    archived rows. Without an archive file it behaves like ``get_db``.
+    """
+    with history_connection(request.app) as db:
+        yield db
+
+
+@contextmanager
+def history_connection(app: FastAPI) -> Iterator[Database]:
+    """Check out a history connection (see ``get_history_db``) in a handler.
+
+    For handlers that only sometimes need archived history.
+    """
+    pool = get_history_pool(app)
+    db = _checkout(pool)
+    try:
+        attach_archive(db)
+        yield db
+    finally:
+        pool.release(db)
+
+
+def get_write_db(request: Request) -> Iterator[Database]:
+    """Dependency for handlers that write.
+
+    Yields the write service's connection for the duration of the handler
+    (see ``job_tracker/writer.py``). The handler's writes run as one task
+    of a group commit: an exception rolls them back. Concurrent writers
+    queue in-process instead of contending for SQLite's write lock.
+
+    Declare it as ``Depends(get_write_db, scope="function")``. With the
+    default request scope FastAPI exits it only after the response is
+    sent, so the client would see success before the commit (or a failed
+    commit) and the writer would stay leased while the body goes out.
     """
-    if db_path is None:
-        db_path = os.getenv("DB_PATH", "live_jobs.db")
-    return Database(Path(db_path))
+    with get_writer(request.app).session() as db:
+        yield db
 
 
 def get_current_user(
@@ -101,5 +216,5 @@ def create_session(user_id: int, db: Database, days: int = 30) -> str:
         "INSERT INTO user_sessions (session_id, user_id, created_at, expires_at) VALUES (?, ?, ?, ?)",
         (session_id, user_id, datetime.now(), expires_at)
     )
-    db.conn.commit()
+    db.commit()
     return session_id
@@ -5,6 +5,8 @@ This module sets up the FastAPI app with CORS, static file serving,
 and route registration.
 """
 
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,16 +14,49 @@ from fastapi.responses import FileResponse
 from pathlib import Path
 import os
 
+from .pool import DatabasePool
+from job_tracker.writer import WriteService
+
 # Determine the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 WEB_DIR = PROJECT_ROOT / "web"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the per-worker database connection pools and write service.
+
+    Route handlers are plain ``def`` functions, so FastAPI runs them (and
+    their blocking sqlite3 calls) on its worker threadpool instead of the
+    event loop. API_THREADS bounds that pool (anyio's default is 40).
+    """
+    if os.getenv("API_THREADS"):
+        to_thread.current_default_thread_limiter().total_tokens = int(os.environ["API_THREADS"])
+    app.state.db_pool = DatabasePool.from_env()
+    app.state.history_pool = DatabasePool(
+        app.state.db_pool.db_path,
+        size=int(os.getenv("DB_HISTORY_POOL_SIZE", 2)),
+        users_path=app.state.db_pool.users_path,
+    )
+    app.state.writer = WriteService(app.state.db_pool.db_path, users_path=app.state.db_pool.users_path)
+    try:
+        yield
+    finally:
+        app.state.writer.close()
+        app.state.writer = None
+        app.state.history_pool.close()
+        app.state.history_pool = None
+        app.state.db_pool.close()
+        app.state.db_pool = None
+
+
 app = FastAPI(
     title="Job Tracker API",
     description="Comprehensive job management platform API",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware - configure appropriately for production
@@ -67,7 +102,7 @@ if WEB_DIR.exists():
     app.mount("/web", StaticFiles(directory=str(WEB_DIR), html=True), name="web")
 
 # Import routes
-from .routes import jobs, applications, auth, companies, analytics, notifications, settings, dashboard, searches, export, import_data, documents, templates, sharing, search, tags
+from .routes import jobs, applications, auth, companies, analytics, notifications, settings, dashboard, searches, export, import_data, documents, templates, sharing, search, snapshots, tags
 
 @app.get("/api/health")
 async def health_check():
@@ -125,4 +160,5 @@ app.include_router(documents.router)
 app.include_router(templates.router)
 app.include_router(sharing.router)
 app.include_router(search.router)
+app.include_router(snapshots.router)
 app.include_router(tags.router)
@@ -0,0 +1,137 @@
+"""
+Database connection pool for the API.
+
+Each worker process owns one ``DatabasePool``, created by the app's
+lifespan handler and stored on ``app.state``. Requests check a
+``Database`` out through the ``get_db`` dependency and always return it,
+so open connections are bounded by the pool size rather than by request
+rate, and only the first connection per worker pays the schema check.
+
+A connection is used by exactly one request at a time. The sqlite3
+module lets a connection opened with ``check_same_thread=False`` move
+between threads (FastAPI runs sync dependencies and handlers on its
+threadpool, not necessarily the same thread for both), but it must not be
+used by two threads at once; exclusive checkout is what guarantees that.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from job_tracker.db import Database, users_path_for
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_ACQUIRE_TIMEOUT = 10.0
+
+
+class PoolTimeout(RuntimeError):
+    """No connection became free within the acquire timeout."""
+
+
+class DatabasePool:
+    """A bounded pool of ``Database`` connections to one file.
+
+    Connections are opened lazily, up to ``size``. ``acquire`` blocks
+    (up to ``timeout`` seconds) when all of them are checked out.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        size: int = DEFAULT_POOL_SIZE,
+        profile: str = "api-read",
+        timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        users_path: Optional[Path] = None,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_path = Path(db_path)
+        self.users_path = Path(users_path) if users_path is not None else users_path_for(self.db_path)
+        self.size = size
+        self.profile = profile
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Database]" = queue.LifoQueue()
+        self._all: List[Database] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> Database | None:
+        """Open a new connection if under the size limit."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Database pool is closed")
+            if len(self._all) >= self.size:
+                return None
+            db = Database(self.db_path, profile=self.profile, users_path=self.users_path)
+            self._all.append(db)
+            return db
+
+    def acquire(self) -> Database:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        db = self._open()
+        if db is not None:
+            return db
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"No database connection free after {self.timeout}s") from None
+
+    def release(self, db: Database) -> None:
+        """Return ``db`` to the pool, rolling back anything left open."""
+        try:
+            if db.conn.in_transaction:
+                db.conn.rollback()
+        except sqlite3.Error:
+            self._discard(db)
+            return
+        if self._closed:
+            self._discard(db)
+            return
+        self._idle.put(db)
+
+    def _discard(self, db: Database) -> None:
+        with self._lock:
+            if db in self._all:
+                self._all.remove(db)
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[Database]:
+        db = self.acquire()
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones close when released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(db)
+
+    @classmethod
+    def from_env(cls) -> "DatabasePool":
+        """Build a pool from ``DB_PATH``, ``USERS_DB_PATH`` and ``DB_POOL_SIZE``."""
+        users_path = os.getenv("USERS_DB_PATH")
+        return cls(
+            Path(os.getenv("DB_PATH", "live_jobs.db")),
+            size=int(os.getenv("DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            users_path=Path(users_path) if users_path else None,
+        )
@@ -18,17 +18,17 @@ from job_tracker.api.schemas import (
     OfferCreate, OfferUpdate, OfferResponse,
     JobResponse
 )
-from job_tracker.api.dependencies import get_db, require_auth
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/applications", tags=["applications"])
 
 
 @router.post("", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
-async def create_application(
+def create_application(
     application: ApplicationCreate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """
     Create a new job application.
@@ -82,7 +82,7 @@ async def create_application(
 
 
 @router.get("", response_model=Dict[str, Any])
-async def list_applications(
+def list_applications(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     job_id: Optional[str] = Query(None, description="Filter by job ID"),
     page: int = Query(1, ge=1, description="Page number"),
@@ -157,7 +157,7 @@ async def list_applications(
 
 
 @router.get("/stats", response_model=Dict[str, Any])
-async def get_application_stats(
+def get_application_stats(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -222,7 +222,7 @@ async def get_application_stats(
 
 
 @router.get("/{application_id}", response_model=Dict[str, Any])
-async def get_application(
+def get_application(
     application_id: int,
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -321,11 +321,11 @@ async def get_application(
 
 
 @router.patch("/{application_id}", response_model=ApplicationResponse)
-async def update_application(
+def update_application(
     application_id: int,
     update: ApplicationUpdate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """
     Update an application.
@@ -368,10 +368,10 @@ async def update_application(
 
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_application(
+def delete_application(
     application_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete an application and all associated data."""
     deleted = db.delete_application(application_id, user_id)
@@ -389,10 +389,10 @@ class BulkStatusUpdateRequest(BaseModel):
 
 
 @router.patch("/bulk/status")
-async def bulk_update_status(
+def bulk_update_status(
     payload: BulkStatusUpdateRequest = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: Database = Depends(get_write_db, scope="function"),
 ):
     """
     Bulk update application statuses for the authenticated user.
@@ -418,11 +418,11 @@ async def bulk_update_status(
 
 # Interview endpoints
 @router.post("/{application_id}/interviews", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
-async def create_interview(
+def create_interview(
     application_id: int,
     interview: InterviewCreate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new interview for an application."""
     # Verify application exists and belongs to user
@@ -460,7 +460,7 @@ async def create_interview(
 
 
 @router.get("/{application_id}/interviews", response_model=List[InterviewResponse])
-async def list_application_interviews(
+def list_application_interviews(
     application_id: int,
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -479,11 +479,11 @@ async def list_application_interviews(
 
 
 @router.patch("/interviews/{interview_id}", response_model=InterviewResponse)
-async def update_interview(
+def update_interview(
     interview_id: int,
     interview_update: InterviewUpdate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update an interview."""
     # Verify interview exists and belongs to user's application
@@ -533,10 +533,10 @@ async def update_interview(
 
 
 @router.delete("/interviews/{interview_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_interview(
+def delete_interview(
     interview_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete an interview."""
     # Verify interview exists and belongs to user's application
@@ -565,11 +565,11 @@ async def delete_interview(
 
 # Offer endpoints
 @router.post("/{application_id}/offers", response_model=OfferResponse, status_code=status.HTTP_201_CREATED)
-async def create_offer(
+def create_offer(
     application_id: int,
     offer: OfferCreate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new offer for an application."""
     # Verify application exists and belongs to user
@@ -613,7 +613,7 @@ async def create_offer(
 
 
 @router.get("/{application_id}/offers", response_model=Optional[OfferResponse])
-async def get_application_offer(
+def get_application_offer(
     application_id: int,
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -635,11 +635,11 @@ async def get_application_offer(
 
 
 @router.patch("/{application_id}/offers", response_model=OfferResponse)
-async def update_offer(
+def update_offer(
     application_id: int,
     offer_update: OfferUpdate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update an offer."""
     # Verify application exists and belongs to user
@@ -683,7 +683,7 @@ async def update_offer(
 
 # Calendar/upcoming endpoints
 @router.get("/upcoming/interviews")
-async def get_upcoming_interviews(
+def get_upcoming_interviews(
     days: int = Query(30, ge=1, le=365, description="Number of days ahead to look"),
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -4,9 +4,9 @@ Authentication API endpoints.
 Provides endpoints for user registration, login, logout, and session management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from datetime import datetime, timedelta
 import secrets
 import sqlite3
@@ -18,7 +18,7 @@ from job_tracker.api.schemas import (
     PasswordResetRequest,
     PasswordResetConfirm,
 )
-from job_tracker.api.dependencies import get_db, get_current_user, create_session
+from job_tracker.api.dependencies import get_db, get_write_db, get_writer, get_current_user, create_session
 from job_tracker.api.auth_utils import (
     hash_password, verify_password, validate_password_strength, validate_username
 )
@@ -30,15 +30,17 @@ security = HTTPBearer(auto_error=False)
 
 
 @router.post("/register", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_data: UserCreate,
+    request: Request,
     db: Database = Depends(get_db)
 ):
     """
     Register a new user.
     
     Validates username and password strength, creates user account,
-    and returns a session token.
+    and returns a session token. The password is hashed before the
+    writer is involved, so bcrypt never holds up other API writes.
     """
     # Validate username
     username_valid, username_error = validate_username(user_data.username)
@@ -76,24 +78,24 @@ async def register(
     # Hash password
     password_hash = hash_password(user_data.password)
     
-    # Create user
-    try:
-        user_id = db.create_user(
+    def create(wdb: Database) -> Tuple[int, str, sqlite3.Row]:
+        user_id = wdb.create_user(
             username=user_data.username,
             password_hash=password_hash,
             email=user_data.email
         )
+        session_token = create_session(user_id, wdb, days=30)
+        return user_id, session_token, wdb.get_user_by_id(user_id)
+
+    # Create user and session
+    try:
+        user_id, session_token, user = get_writer(request.app).run(create)
     except sqlite3.IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username or email already exists"
         )
     
-    # Create session
-    session_token = create_session(user_id, db, days=30)
-    
-    # Get created user
-    user = db.get_user_by_id(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -113,14 +115,17 @@ async def register(
 
 
 @router.post("/login", response_model=Dict[str, Any])
-async def login(
+def login(
     login_data: UserLogin,
+    request: Request,
     db: Database = Depends(get_db)
 ):
     """
     Login a user with username and password.
     
     Returns a session token that can be used for authenticated requests.
+    The password is checked on a read connection; only the session and
+    last-login writes go through the writer.
     """
     # Get user by username
     user = db.get_user_by_username(login_data.username)
@@ -143,12 +148,14 @@ async def login(
             detail="Invalid username or password"
         )
     
-    # Update last login
-    db.update_last_login(int(user["user_id"]))
-    
-    # Create session (longer expiry if remember_me is checked)
+    # Update last login and create session (longer expiry if remember_me is checked)
     session_days = 90 if login_data.remember_me else 30
-    session_token = create_session(int(user["user_id"]), db, days=session_days)
+
+    def start_session(wdb: Database) -> str:
+        wdb.update_last_login(int(user["user_id"]))
+        return create_session(int(user["user_id"]), wdb, days=session_days)
+
+    session_token = get_writer(request.app).run(start_session)
     
     return {
         "message": "Login successful",
@@ -163,9 +170,9 @@ async def login(
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(
+def logout(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """
     Logout the current user by invalidating their session token.
@@ -189,7 +196,7 @@ async def logout(
 
 
 @router.get("/me", response_model=Dict[str, Any])
-async def get_current_user_info(
+def get_current_user_info(
     user_id: int = Depends(get_current_user),
     db: Database = Depends(get_db)
 ):
@@ -213,7 +220,7 @@ async def get_current_user_info(
 
 
 @router.get("/check", response_model=Dict[str, Any])
-async def check_auth(
+def check_auth(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     db: Database = Depends(get_db)
 ):
@@ -246,9 +253,9 @@ async def check_auth(
 
 
 @router.post("/password/reset-request", status_code=status.HTTP_200_OK)
-async def request_password_reset(
+def request_password_reset(
     payload: PasswordResetRequest,
-    db: Database = Depends(get_db),
+    db: Database = Depends(get_write_db, scope="function"),
 ):
     """
     Request a password reset link.
@@ -275,12 +282,16 @@ async def request_password_reset(
 
 
 @router.post("/password/reset-confirm", status_code=status.HTTP_200_OK)
-async def confirm_password_reset(
+def confirm_password_reset(
     payload: PasswordResetConfirm,
+    request: Request,
     db: Database = Depends(get_db),
 ):
     """
     Confirm a password reset using a token and set a new password.
+
+    The new password is hashed on a read connection; the writer then
+    checks the token again, so it is still used at most once.
     """
     # Look up token and ensure it is valid
     token_row = db.get_valid_password_reset_token(payload.token)
@@ -302,9 +313,19 @@ async def confirm_password_reset(
 
     # Hash and store new password, then invalidate token
     password_hash = hash_password(payload.new_password)
-    db.update_user_password_hash(user_id, password_hash)
-    db.mark_password_reset_token_used(int(token_row["token_id"]))
-    # Optionally, existing sessions could be revoked here:
-    # db.delete_user_sessions(user_id)
+
+    def reset(wdb: Database) -> None:
+        # Another request may have used the token while we were hashing.
+        if not wdb.get_valid_password_reset_token(payload.token):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired reset token",
+            )
+        wdb.update_user_password_hash(user_id, password_hash)
+        wdb.mark_password_reset_token_used(int(token_row["token_id"]))
+        # Optionally, existing sessions could be revoked here:
+        # wdb.delete_user_sessions(user_id)
+
+    get_writer(request.app).run(reset)
 
     return {"message": "Password has been reset successfully."}
@@ -5,18 +5,18 @@ Provides endpoints for viewing company profiles, analytics, notes,
 and managing company-related data.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body, Query
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import json
 import sqlite3
 
 from job_tracker.api.schemas import (
     CompanyResponse, CompanyAnalyticsResponse, CompanyNoteCreate,
     CompanyNoteUpdate, CompanyNoteResponse, CompanyProfileUpdate
 )
-from job_tracker.api.dependencies import get_db, require_auth, get_current_user
-from job_tracker.db import Database
+from job_tracker.api.dependencies import get_db, get_history_db, get_write_db, get_writer, require_auth, get_current_user
+from job_tracker.blobs import hydrate_extra
+from job_tracker.db import Database, from_epoch
 from job_tracker.analytics import calculate_company_analytics, update_company_analytics
 
 router = APIRouter(prefix="/api/companies", tags=["companies"])
@@ -90,7 +90,7 @@ def _company_note_row_to_response(row: sqlite3.Row) -> CompanyNoteResponse:
 
 
 @router.get("", response_model=List[CompanyResponse])
-async def list_companies(
+def list_companies(
     search: Optional[str] = Query(None, description="Search companies by name"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     size: Optional[str] = Query(None, description="Filter by size label"),
@@ -160,7 +160,7 @@ async def list_companies(
 
 
 @router.get("/{company_id}", response_model=CompanyResponse)
-async def get_company(
+def get_company(
     company_id: int,
     db: Database = Depends(get_db)
 ):
@@ -175,11 +175,11 @@ async def get_company(
 
 
 @router.patch("/{company_id}/profile", response_model=CompanyResponse)
-async def update_company_profile(
+def update_company_profile(
     company_id: int,
     profile: CompanyProfileUpdate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update company profile information."""
     # Verify company exists
@@ -211,10 +211,11 @@ async def update_company_profile(
 
 
 @router.get("/{company_id}/analytics", response_model=CompanyAnalyticsResponse)
-async def get_company_analytics(
+def get_company_analytics(
     company_id: int,
+    request: Request,
     refresh: bool = Query(False, description="Force recalculation of analytics"),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_history_db)
 ):
     """Get company hiring analytics."""
     # Verify company exists
@@ -225,9 +226,11 @@ async def get_company_analytics(
             detail=f"Company {company_id} not found"
         )
     
-    # Refresh analytics if requested
+    # Refresh analytics if requested: calculated here over full history,
+    # stored through the write service
     if refresh:
-        update_company_analytics(db, company_id)
+        analytics_data = calculate_company_analytics(db, company_id)
+        get_writer(request.app).run(update_company_analytics, company_id, analytics_data)
     
     # Get cached analytics
     analytics = db.get_company_analytics(company_id)
@@ -257,10 +260,11 @@ async def get_company_analytics(
 
 
 @router.post("/{company_id}/analytics/refresh")
-async def refresh_company_analytics(
+def refresh_company_analytics(
     company_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function"),
+    history: Database = Depends(get_history_db)
 ):
     """Recalculate and update company analytics."""
     # Verify company exists
@@ -271,12 +275,12 @@ async def refresh_company_analytics(
             detail=f"Company {company_id} not found"
         )
     
-    update_company_analytics(db, company_id)
+    update_company_analytics(db, company_id, calculate_company_analytics(history, company_id))
     return {"message": "Analytics updated successfully"}
 
 
 @router.get("/{company_id}/notes", response_model=List[CompanyNoteResponse])
-async def get_company_notes(
+def get_company_notes(
     company_id: int,
     user_only: bool = Query(False, description="Only return notes from the current user"),
     user_id: Optional[int] = Depends(get_current_user),
@@ -297,11 +301,11 @@ async def get_company_notes(
 
 
 @router.post("/{company_id}/notes", response_model=CompanyNoteResponse, status_code=status.HTTP_201_CREATED)
-async def add_company_note(
+def add_company_note(
     company_id: int,
     note: CompanyNoteCreate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Add a note about a company."""
     # Verify company exists
@@ -333,12 +337,12 @@ async def add_company_note(
 
 
 @router.patch("/{company_id}/notes/{note_id}", response_model=CompanyNoteResponse)
-async def update_company_note(
+def update_company_note(
     company_id: int,
     note_id: int,
     note_update: CompanyNoteUpdate,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update a company note."""
     # Verify company exists
@@ -377,11 +381,11 @@ async def update_company_note(
 
 
 @router.delete("/{company_id}/notes/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_company_note(
+def delete_company_note(
     company_id: int,
     note_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete a company note."""
     deleted = db.delete_company_note(note_id, user_id)
@@ -394,7 +398,7 @@ async def delete_company_note(
 
 
 @router.get("/{company_id}/jobs", response_model=List[Dict[str, Any]])
-async def get_company_jobs(
+def get_company_jobs(
     company_id: int,
     active_only: bool = Query(True, description="Only return active jobs"),
     db: Database = Depends(get_db)
@@ -414,12 +418,12 @@ async def get_company_jobs(
     result = []
     for row in jobs:
         job_dict = dict(row)
-        # Parse extra JSON if present
-        if "extra" in job_dict and job_dict["extra"]:
-            try:
-                job_dict["extra"] = json.loads(job_dict["extra"])
-            except (json.JSONDecodeError, TypeError):
-                pass
+        for key in ("first_seen", "last_seen", "removed_at"):
+            job_dict[key] = from_epoch(job_dict[key])
+        job_dict["active"] = bool(job_dict["active"])
+        job_dict["is_new_grad"] = bool(job_dict["is_new_grad"])
+        # Parse extra, inlining blob-backed fields (e.g. the description)
+        job_dict["extra"] = hydrate_extra(db.conn, row["extra"]) if row["extra"] else None
         result.append(job_dict)
     
     return result
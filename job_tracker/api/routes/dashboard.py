@@ -6,16 +6,16 @@ Provides aggregated statistics and recent activity for the dashboard.
 
 from fastapi import APIRouter, Depends, Query
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from job_tracker.api.dependencies import get_db, get_current_user
-from job_tracker.db import Database
+from job_tracker.db import Database, to_epoch
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
 @router.get("/stats")
-async def get_dashboard_stats(
+def get_dashboard_stats(
     days: int = Query(
         30,
         ge=1,
@@ -46,14 +46,15 @@ async def get_dashboard_stats(
     try:
         # Get total jobs count (active jobs seen in the selected window)
         window_expr = f"-{int(days)} days"
+        window_start = to_epoch(datetime.now(timezone.utc) - timedelta(days=int(days)))
         jobs_result = db.execute_query(
             """
             SELECT COUNT(DISTINCT job_id) as total
             FROM jobs
-            WHERE active = 1 AND last_seen > datetime('now', ?)
+            WHERE active = 1 AND last_seen > ?
             """
             ,
-            (window_expr,),
+            (window_start,),
         )
         if jobs_result:
             stats["total_jobs"] = jobs_result[0][0] if jobs_result[0] else 0
@@ -88,12 +89,7 @@ async def get_dashboard_stats(
                 FROM applications a
                 LEFT JOIN jobs j ON a.job_id = j.job_id
                 LEFT JOIN companies c ON j.company_id = c.id
-                LEFT JOIN job_versions v ON j.job_id = v.job_id
-                LEFT JOIN (
-                    SELECT job_id, MAX(timestamp) as max_timestamp
-                    FROM job_versions
-                    GROUP BY job_id
-                ) latest ON v.job_id = latest.job_id AND v.timestamp = latest.max_timestamp
+                LEFT JOIN jobs_current v ON v.job_key = j.job_key
                 WHERE a.user_id = ?
                   AND COALESCE(a.updated_at, a.created_at) > datetime('now', ?)
                 ORDER BY COALESCE(a.updated_at, a.created_at) DESC
@@ -7,7 +7,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
-from job_tracker.api.dependencies import get_db, require_auth
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
@@ -73,7 +73,7 @@ class CoverLetterResponse(BaseModel):
 
 
 @router.get("/resumes", response_model=List[ResumeResponse])
-async def list_resumes(
+def list_resumes(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -101,10 +101,10 @@ async def list_resumes(
 
 
 @router.post("/resumes", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
-async def create_resume(
+def create_resume(
     resume: ResumeCreate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new resume."""
     cur = db.conn.cursor()
@@ -133,7 +133,7 @@ async def create_resume(
             now
         )
     )
-    db.conn.commit()
+    db.commit()
     
     resume_id = cur.lastrowid
     row = cur.execute("SELECT * FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone()
@@ -152,11 +152,11 @@ async def create_resume(
 
 
 @router.put("/resumes/{resume_id}", response_model=ResumeResponse)
-async def update_resume(
+def update_resume(
     resume_id: int,
     resume: ResumeUpdate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update a resume."""
     cur = db.conn.cursor()
@@ -206,7 +206,7 @@ async def update_resume(
             f"UPDATE resumes SET {', '.join(updates)} WHERE resume_id = ? AND user_id = ?",
             params
         )
-        db.conn.commit()
+        db.commit()
     
     row = cur.execute("SELECT * FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone()
     return ResumeResponse(
@@ -223,10 +223,10 @@ async def update_resume(
 
 
 @router.delete("/resumes/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_resume(
+def delete_resume(
     resume_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete a resume."""
     cur = db.conn.cursor()
@@ -240,12 +240,12 @@ async def delete_resume(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found")
     
     cur.execute("DELETE FROM resumes WHERE resume_id = ? AND user_id = ?", (resume_id, user_id))
-    db.conn.commit()
+    db.commit()
     return None
 
 
 @router.get("/cover-letters", response_model=List[CoverLetterResponse])
-async def list_cover_letters(
+def list_cover_letters(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -274,10 +274,10 @@ async def list_cover_letters(
 
 
 @router.post("/cover-letters", response_model=CoverLetterResponse, status_code=status.HTTP_201_CREATED)
-async def create_cover_letter(
+def create_cover_letter(
     cover_letter: CoverLetterCreate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new cover letter."""
     cur = db.conn.cursor()
@@ -306,7 +306,7 @@ async def create_cover_letter(
             now
         )
     )
-    db.conn.commit()
+    db.commit()
     
     cover_letter_id = cur.lastrowid
     row = cur.execute("SELECT * FROM cover_letters WHERE cover_letter_id = ?", (cover_letter_id,)).fetchone()
@@ -326,11 +326,11 @@ async def create_cover_letter(
 
 
 @router.put("/cover-letters/{cover_letter_id}", response_model=CoverLetterResponse)
-async def update_cover_letter(
+def update_cover_letter(
     cover_letter_id: int,
     cover_letter: CoverLetterUpdate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update a cover letter."""
     cur = db.conn.cursor()
@@ -380,7 +380,7 @@ async def update_cover_letter(
             f"UPDATE cover_letters SET {', '.join(updates)} WHERE cover_letter_id = ? AND user_id = ?",
             params
         )
-        db.conn.commit()
+        db.commit()
     
     row = cur.execute("SELECT * FROM cover_letters WHERE cover_letter_id = ?", (cover_letter_id,)).fetchone()
     return CoverLetterResponse(
@@ -398,10 +398,10 @@ async def update_cover_letter(
 
 
 @router.delete("/cover-letters/{cover_letter_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_cover_letter(
+def delete_cover_letter(
     cover_letter_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete a cover letter."""
     cur = db.conn.cursor()
@@ -415,5 +415,5 @@ async def delete_cover_letter(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cover letter not found")
     
     cur.execute("DELETE FROM cover_letters WHERE cover_letter_id = ? AND user_id = ?", (cover_letter_id, user_id))
-    db.conn.commit()
+    db.commit()
     return None
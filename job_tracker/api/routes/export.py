@@ -11,13 +11,13 @@ import io
 import json
 
 from job_tracker.api.dependencies import get_db, require_auth
-from job_tracker.db import Database
+from job_tracker.db import Database, format_timestamp
 
 router = APIRouter(prefix="/api/export", tags=["export"])
 
 
 @router.get("/applications/csv")
-async def export_applications_csv(
+def export_applications_csv(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -44,12 +44,7 @@ async def export_applications_csv(
         FROM applications a
         JOIN jobs j ON a.job_id = j.job_id
         JOIN companies c ON j.company_id = c.id
-        LEFT JOIN job_versions v ON v.job_id = j.job_id
-        LEFT JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        LEFT JOIN jobs_current v ON v.job_key = j.job_key
         WHERE a.user_id = ?
     """
     params = [user_id]
@@ -104,7 +99,7 @@ async def export_applications_csv(
 
 
 @router.get("/jobs/csv")
-async def export_jobs_csv(
+def export_jobs_csv(
     location: Optional[str] = Query(None),
     remote: Optional[bool] = Query(None),
     company: Optional[str] = Query(None),
@@ -132,12 +127,7 @@ async def export_jobs_csv(
             j.last_seen
         FROM jobs j
         JOIN companies c ON j.company_id = c.id
-        JOIN job_versions v ON v.job_id = j.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        JOIN jobs_current v ON v.job_key = j.job_key
         WHERE j.active = 1
     """
     
@@ -172,17 +162,12 @@ async def export_jobs_csv(
     
     if keywords:
         keyword_pattern = f"%{keywords}%"
-        conditions.append("(v.title LIKE ? OR v.extra LIKE ?)")
+        conditions.append("(v.title LIKE ? OR v.search_text LIKE ?)")
         params.extend([keyword_pattern, keyword_pattern])
     
     if new_grad is not None:
-        latest_snapshot = cur.execute(
-            "SELECT snapshot_id FROM snapshots ORDER BY timestamp DESC LIMIT 1"
-        ).fetchone()
-        if latest_snapshot:
-            snapshot_id = latest_snapshot["snapshot_id"]
-            conditions.append("EXISTS (SELECT 1 FROM snapshot_jobs sj WHERE sj.job_id = j.job_id AND sj.snapshot_id = ? AND sj.is_new_grad = ?)")
-            params.extend([snapshot_id, 1 if new_grad else 0])
+        conditions.append("v.is_new_grad = ?")
+        params.append(1 if new_grad else 0)
     
     if conditions:
         query += " AND " + " AND ".join(conditions)
@@ -211,8 +196,8 @@ async def export_jobs_csv(
             'Yes' if row['remote'] else 'No',
             row['sector'] or '',
             row['source'] or '',
-            row['posted_at'] or '',
-            row['last_seen'] or '',
+            format_timestamp(row['posted_at']),
+            format_timestamp(row['last_seen']),
             row['url'] or ''
         ])
     
@@ -10,7 +10,7 @@ import csv
 import io
 import json
 
-from job_tracker.api.dependencies import get_db, require_auth
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/import", tags=["import"])
@@ -29,11 +29,11 @@ class ImportRequest(BaseModel):
 
 
 @router.post("/applications/csv")
-async def import_applications_csv(
+def import_applications_csv(
     file: UploadFile = File(...),
     mappings: str = Body(...),  # JSON string of mappings
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """
     Import applications from CSV file.
@@ -46,7 +46,7 @@ async def import_applications_csv(
         column_map = {m['csv_column']: m['field'] for m in mapping_data.get('mappings', [])}
         
         # Read CSV file
-        contents = await file.read()
+        contents = file.file.read()
         csv_text = contents.decode('utf-8')
         csv_reader = csv.DictReader(io.StringIO(csv_text))
         
@@ -104,12 +104,7 @@ async def import_applications_csv(
                     SELECT j.job_id
                     FROM jobs j
                     JOIN companies c ON j.company_id = c.id
-                    JOIN job_versions v ON v.job_id = j.job_id
-                    JOIN (
-                        SELECT job_id, MAX(timestamp) AS max_ts
-                        FROM job_versions
-                        GROUP BY job_id
-                    ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+                    JOIN jobs_current v ON v.job_key = j.job_key
                     WHERE LOWER(c.name) = LOWER(?) AND LOWER(v.title) = LOWER(?)
                     LIMIT 1
                 """
@@ -188,7 +183,7 @@ async def import_applications_csv(
             except Exception as e:
                 errors.append(f"Row {row_num}: {str(e)}")
         
-        db.conn.commit()
+        db.commit()
         
         return {
             "imported": imported,
@@ -204,7 +199,7 @@ async def import_applications_csv(
 
 
 @router.post("/applications/preview")
-async def preview_csv_import(
+def preview_csv_import(
     file: UploadFile = File(...),
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -214,7 +209,7 @@ async def preview_csv_import(
     Helps users map columns before importing.
     """
     try:
-        contents = await file.read()
+        contents = file.file.read()
         csv_text = contents.decode('utf-8')
         csv_reader = csv.DictReader(io.StringIO(csv_text))
         
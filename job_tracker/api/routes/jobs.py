@@ -5,26 +5,27 @@ Provides endpoints for searching jobs, viewing job details, saving jobs,
 and managing job-related data.
 """
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status, Body
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status, Body
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
 
 from job_tracker.api.schemas import JobResponse, JobDetailResponse
-from job_tracker.api.dependencies import get_db, get_current_user, require_auth
-from job_tracker.db import Database
+from job_tracker.api.dependencies import get_db, get_write_db, get_current_user, history_connection, require_auth
+from job_tracker.blobs import hydrate_extra, strip_blob_refs
+from job_tracker.db import Database, decode_reasons, from_epoch
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
 @router.get("", response_model=Dict[str, Any])
-async def search_jobs(
+def search_jobs(
     location: Optional[str] = Query(None, description="Filter by location (partial match)"),
     remote: Optional[bool] = Query(None, description="Filter by remote work availability"),
     company: Optional[str] = Query(None, description="Comma-separated company IDs"),
     sector: Optional[str] = Query(None, description="Comma-separated sectors"),
-    keywords: Optional[str] = Query(None, description="Search keywords in title and description"),
+    keywords: Optional[str] = Query(None, description="Search keywords in title and job metadata"),
     new_grad: Optional[bool] = Query(None, description="Filter for new grad positions"),
     experience_level: Optional[str] = Query(
         None,
@@ -43,12 +44,12 @@ async def search_jobs(
     
     Returns paginated results with total count for proper pagination UI.
     """
-    # Build base query to get latest job versions
+    # Build base query over the current state of each job
     base_query = """
-        SELECT DISTINCT
+        SELECT
             j.job_id,
-            c.name AS company,
-            c.id AS company_id,
+            v.company_name AS company,
+            v.company_id,
             v.title,
             v.location,
             v.remote,
@@ -57,15 +58,10 @@ async def search_jobs(
             v.sector,
             j.first_seen AS posted_at,
             j.last_seen,
-            v.extra
+            v.extra,
+            v.is_new_grad
         FROM jobs j
-        JOIN companies c ON j.company_id = c.id
-        JOIN job_versions v ON v.job_id = j.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        JOIN jobs_current v ON v.job_key = j.job_key
         WHERE j.active = 1
     """
     
@@ -86,7 +82,7 @@ async def search_jobs(
             company_ids = [int(c.strip()) for c in company.split(",") if c.strip()]
             if company_ids:
                 placeholders = ",".join("?" * len(company_ids))
-                conditions.append(f"c.id IN ({placeholders})")
+                conditions.append(f"v.company_id IN ({placeholders})")
                 params.extend(company_ids)
         except ValueError:
             raise HTTPException(
@@ -103,53 +99,33 @@ async def search_jobs(
     
     if keywords:
         keyword_pattern = f"%{keywords}%"
-        conditions.append("(v.title LIKE ? OR v.extra LIKE ?)")
+        conditions.append("(v.title LIKE ? OR v.search_text LIKE ?)")
         params.extend([keyword_pattern, keyword_pattern])
 
-    # Optional filters sourced from job_versions.extra JSON blob where present.
-    # These perform best-effort matching based on conventional keys that
-    # collectors may populate (experience_level, job_type).
+    # Optional filters on conventional extra keys that collectors may
+    # populate, copied to columns at ingest (case-insensitive).
     if experience_level:
-        conditions.append("v.extra LIKE ?")
-        params.append(f'%\"experience_level\": \"{experience_level}\"%')
+        conditions.append("v.experience_level = ?")
+        params.append(experience_level)
 
     if job_type:
-        conditions.append("v.extra LIKE ?")
-        params.append(f'%\"job_type\": \"{job_type}\"%')
+        conditions.append("v.job_type = ?")
+        params.append(job_type)
+    
+    if new_grad is not None:
+        conditions.append("v.is_new_grad = ?")
+        params.append(1 if new_grad else 0)
     
     # Get cursor for queries
     cur = db.conn.cursor()
     
-    # Handle new_grad filter - need to join with latest snapshot
-    if new_grad is not None:
-        # Get the latest snapshot ID
-        latest_snapshot = cur.execute("""
-            SELECT snapshot_id FROM snapshots 
-            ORDER BY timestamp DESC LIMIT 1
-        """).fetchone()
-        
-        if latest_snapshot:
-            snapshot_id = latest_snapshot["snapshot_id"]
-            conditions.append("EXISTS (SELECT 1 FROM snapshot_jobs sj WHERE sj.job_id = j.job_id AND sj.snapshot_id = ? AND sj.is_new_grad = ?)")
-            params.extend([snapshot_id, 1 if new_grad else 0])
-        else:
-            # No snapshots yet, return empty result if filtering for new_grad
-            if new_grad:
-                return {
-                    "jobs": [],
-                    "total": 0,
-                    "page": page,
-                    "page_size": page_size,
-                    "total_pages": 0
-                }
-    
     # Add conditions to query
     if conditions:
         base_query += " AND " + " AND ".join(conditions)
     
     # Get total count for pagination
     # Alias the subquery so we can reference its columns
-    count_query = f"SELECT COUNT(DISTINCT sub.job_id) as total FROM ({base_query}) AS sub"
+    count_query = f"SELECT COUNT(*) as total FROM ({base_query}) AS sub"
     count_row = cur.execute(count_query, params).fetchone()
     total = count_row["total"] if count_row else 0
     
@@ -162,30 +138,17 @@ async def search_jobs(
     # Execute query
     rows = cur.execute(query, params).fetchall()
     
-    # Parse extra field (JSON)
+    # Parse extra field (JSON); large blob-backed fields such as the
+    # description are only loaded by the job detail endpoint.
     jobs = []
     for row in rows:
         extra_data = None
         if row["extra"]:
             try:
-                extra_data = json.loads(row["extra"])
-            except (json.JSONDecodeError, TypeError):
+                extra_data = strip_blob_refs(json.loads(row["extra"]))
+            except (json.JSONDecodeError, TypeError, AttributeError):
                 extra_data = {}
         
-        # Determine is_new_grad from latest snapshot if needed
-        is_new_grad = False
-        if new_grad is None:  # Only check if not already filtered
-            snapshot_check = cur.execute("""
-                SELECT sj.is_new_grad
-                FROM snapshot_jobs sj
-                JOIN snapshots s ON sj.snapshot_id = s.snapshot_id
-                WHERE sj.job_id = ?
-                ORDER BY s.timestamp DESC
-                LIMIT 1
-            """, (row["job_id"],)).fetchone()
-            if snapshot_check:
-                is_new_grad = bool(snapshot_check["is_new_grad"])
-        
         jobs.append(JobResponse(
             job_id=row["job_id"],
             company=row["company"],
@@ -196,8 +159,8 @@ async def search_jobs(
             url=row["url"],
             source=row["source"],
             sector=row["sector"],
-            posted_at=row["posted_at"],
-            is_new_grad=is_new_grad if new_grad is None else new_grad,
+            posted_at=from_epoch(row["posted_at"]),
+            is_new_grad=bool(row["is_new_grad"]),
             extra=extra_data
         ))
     
@@ -215,10 +178,10 @@ class BulkSaveJobsRequest(BaseModel):
 
 
 @router.post("/bulk/save")
-async def bulk_save_jobs(
+def bulk_save_jobs(
     payload: BulkSaveJobsRequest = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: Database = Depends(get_write_db, scope="function"),
 ):
     """
     Bulk save jobs for the authenticated user.
@@ -250,7 +213,7 @@ async def bulk_save_jobs(
             (user_id, jid, now),
         )
 
-    db.conn.commit()
+    db.commit()
     return {"saved": len(to_save)}
 
 
@@ -259,10 +222,10 @@ class BulkUnsaveJobsRequest(BaseModel):
 
 
 @router.delete("/bulk/save")
-async def bulk_unsave_jobs(
+def bulk_unsave_jobs(
     payload: BulkUnsaveJobsRequest = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: Database = Depends(get_write_db, scope="function"),
 ):
     """
     Bulk unsave jobs for the authenticated user.
@@ -277,29 +240,32 @@ async def bulk_unsave_jobs(
         f"DELETE FROM saved_jobs WHERE user_id = ? AND job_id IN ({placeholders})",
         params,
     )
-    db.conn.commit()
+    db.commit()
     return {"unsaved": result.rowcount or 0}
 
 
 @router.get("/{job_id}", response_model=JobDetailResponse)
-async def get_job(
+def get_job(
     job_id: str,
+    request: Request,
     db: Database = Depends(get_db)
 ):
     """
     Get detailed information about a specific job.
     
     Includes full job details, company information, and any additional
-    metadata stored in the job_versions extra field.
+    metadata stored in the job's extra field. Jobs retired from
+    ``jobs_current`` by the archiver (see ``job_tracker/archive.py``) are
+    served from their last snapshot interval, which may be archived.
     """
     cur = db.conn.cursor()
     
-    # Get latest job version with company info
+    # Get current job state with company info
     query = """
         SELECT
             j.job_id,
-            c.name AS company,
-            c.id AS company_id,
+            v.company_name AS company,
+            v.company_id,
             v.title,
             v.location,
             v.remote,
@@ -309,42 +275,63 @@ async def get_job(
             j.first_seen AS posted_at,
             j.last_seen,
             v.extra,
-            v.timestamp AS version_timestamp
+            v.is_new_grad,
+            r.reasons AS new_grad_reasons
         FROM jobs j
-        JOIN companies c ON j.company_id = c.id
-        JOIN job_versions v ON v.job_id = j.job_id
+        JOIN jobs_current v ON v.job_key = j.job_key
+        LEFT JOIN classification_reasons r ON r.reasons_id = v.reasons_id
         WHERE j.job_id = ?
-        ORDER BY v.timestamp DESC
-        LIMIT 1
     """
     
     row = cur.execute(query, (job_id,)).fetchone()
+    if row:
+        return _job_detail(db, row)
+
+    # No current row: the job may have been retired, so look up the
+    # version it was last seen with in the full history.
+    with history_connection(request.app) as hdb:
+        row = hdb.conn.execute(_RETIRED_JOB_QUERY, (job_id,)).fetchone()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job {job_id} not found"
+            )
+        return _job_detail(hdb, row)
+
+
+# Same columns as get_job's query, from the job's latest interval.
+_RETIRED_JOB_QUERY = """
+    SELECT
+        j.job_id,
+        c.name AS company,
+        j.company_id,
+        v.title,
+        v.location,
+        v.remote,
+        j.url,
+        j.source,
+        v.sector,
+        j.first_seen AS posted_at,
+        j.last_seen,
+        v.extra,
+        m.is_new_grad,
+        r.reasons AS new_grad_reasons
+    FROM jobs j
+    JOIN companies c ON c.id = j.company_id
+    JOIN snapshot_membership m ON m.job_key = j.job_key
+    JOIN job_versions v ON v.version_id = m.version_id
+    LEFT JOIN classification_reasons r ON r.reasons_id = m.reasons_id
+    WHERE j.job_id = ?
+    ORDER BY m.last_snapshot_id DESC
+    LIMIT 1
+"""
+
+
+def _job_detail(db: Database, row) -> JobDetailResponse:
+    # Parse extra field, inlining blob-backed fields (e.g. the description)
+    extra_data = hydrate_extra(db.conn, row["extra"]) if row["extra"] else None
     
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job {job_id} not found"
-        )
-    
-    # Parse extra field
-    extra_data = None
-    if row["extra"]:
-        try:
-            extra_data = json.loads(row["extra"])
-        except (json.JSONDecodeError, TypeError):
-            extra_data = {}
-    
-    # Check if new grad from latest snapshot
-    snapshot_check = cur.execute("""
-        SELECT sj.is_new_grad
-        FROM snapshot_jobs sj
-        JOIN snapshots s ON sj.snapshot_id = s.snapshot_id
-        WHERE sj.job_id = ?
-        ORDER BY s.timestamp DESC
-        LIMIT 1
-    """, (job_id,)).fetchone()
-    
-    is_new_grad = bool(snapshot_check["is_new_grad"]) if snapshot_check else False
+    is_new_grad = bool(row["is_new_grad"])
     
     # Extract description from extra if available
     description = None
@@ -361,15 +348,16 @@ async def get_job(
         url=row["url"],
         source=row["source"],
         sector=row["sector"],
-        posted_at=row["posted_at"],
+        posted_at=from_epoch(row["posted_at"]),
         is_new_grad=is_new_grad,
         extra=extra_data,
-        description=description
+        description=description,
+        new_grad_reasons=decode_reasons(row["new_grad_reasons"]),
     )
 
 
 @router.get("/filters/options", response_model=Dict[str, List[Dict[str, Any]]])
-async def get_filter_options(
+def get_filter_options(
     db: Database = Depends(get_db)
 ):
     """
@@ -396,15 +384,9 @@ async def get_filter_options(
     
     # Get distinct sectors with active jobs
     sectors_query = """
-        SELECT DISTINCT v.sector, COUNT(DISTINCT j.job_id) as job_count
-        FROM job_versions v
-        JOIN jobs j ON j.job_id = v.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
-        WHERE j.active = 1 AND v.sector IS NOT NULL AND v.sector != ''
+        SELECT v.sector, COUNT(*) as job_count
+        FROM jobs_current v
+        WHERE v.active = 1 AND v.sector IS NOT NULL AND v.sector != ''
         GROUP BY v.sector
         ORDER BY job_count DESC, v.sector ASC
     """
@@ -421,10 +403,10 @@ async def get_filter_options(
 
 
 @router.post("/{job_id}/save")
-async def save_job(
+def save_job(
     job_id: str,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """
     Save a job for the authenticated user.
@@ -455,16 +437,16 @@ async def save_job(
         "INSERT INTO saved_jobs (user_id, job_id, saved_at) VALUES (?, ?, ?)",
         (user_id, job_id, datetime.now())
     )
-    db.conn.commit()
+    db.commit()
     
     return {"message": "Job saved successfully", "saved_id": cur.lastrowid}
 
 
 @router.delete("/{job_id}/save")
-async def unsave_job(
+def unsave_job(
     job_id: str,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """
     Remove a saved job for the authenticated user.
@@ -475,7 +457,7 @@ async def unsave_job(
         "DELETE FROM saved_jobs WHERE user_id = ? AND job_id = ?",
         (user_id, job_id)
     )
-    db.conn.commit()
+    db.commit()
     
     if result.rowcount == 0:
         raise HTTPException(
@@ -487,7 +469,7 @@ async def unsave_job(
 
 
 @router.get("/saved/list", response_model=Dict[str, Any])
-async def get_saved_jobs(
+def get_saved_jobs(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     user_id: int = Depends(require_auth),
@@ -516,24 +498,19 @@ async def get_saved_jobs(
             sj.priority,
             sj.deadline,
             j.job_id,
-            c.name AS company,
-            c.id AS company_id,
+            v.company_name AS company,
+            v.company_id,
             v.title,
             v.location,
             v.remote,
             j.url,
             j.source,
             v.sector,
-            j.first_seen AS posted_at
+            j.first_seen AS posted_at,
+            v.is_new_grad
         FROM saved_jobs sj
         JOIN jobs j ON sj.job_id = j.job_id
-        JOIN companies c ON j.company_id = c.id
-        JOIN job_versions v ON v.job_id = j.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        JOIN jobs_current v ON v.job_key = j.job_key
         WHERE sj.user_id = ? AND j.active = 1
         ORDER BY sj.saved_at DESC
         LIMIT ? OFFSET ?
@@ -544,18 +521,6 @@ async def get_saved_jobs(
     
     jobs = []
     for row in rows:
-        # Check if new grad
-        snapshot_check = cur.execute("""
-            SELECT sj.is_new_grad
-            FROM snapshot_jobs sj
-            JOIN snapshots s ON sj.snapshot_id = s.snapshot_id
-            WHERE sj.job_id = ?
-            ORDER BY s.timestamp DESC
-            LIMIT 1
-        """, (row["job_id"],)).fetchone()
-        
-        is_new_grad = bool(snapshot_check["is_new_grad"]) if snapshot_check else False
-        
         jobs.append({
             "saved_id": row["saved_id"],
             "saved_at": row["saved_at"],
@@ -572,8 +537,8 @@ async def get_saved_jobs(
                 url=row["url"],
                 source=row["source"],
                 sector=row["sector"],
-                posted_at=row["posted_at"],
-                is_new_grad=is_new_grad
+                posted_at=from_epoch(row["posted_at"]),
+                is_new_grad=bool(row["is_new_grad"])
             ).model_dump()
         })
     
@@ -4,14 +4,14 @@ Notification API routes.
 
 from fastapi import APIRouter, Depends, Query
 from typing import Optional
-from job_tracker.api.dependencies import get_db, get_current_user
+from job_tracker.api.dependencies import get_db, get_write_db, get_current_user
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
 
 @router.get("")
-async def get_notifications(
+def get_notifications(
     unread_only: bool = Query(False),
     limit: int = Query(50, ge=1, le=100),
     user_id: int = Depends(get_current_user),
@@ -23,10 +23,10 @@ async def get_notifications(
 
 
 @router.put("/{notification_id}/read")
-async def mark_read(
+def mark_read(
     notification_id: int,
     user_id: int = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Mark notification as read"""
     db.mark_notification_read(notification_id, user_id)
@@ -34,9 +34,9 @@ async def mark_read(
 
 
 @router.put("/read-all")
-async def mark_all_read(
+def mark_all_read(
     user_id: int = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Mark all notifications as read"""
     db.mark_all_notifications_read(user_id)
@@ -44,7 +44,7 @@ async def mark_all_read(
 
 
 @router.get("/preferences")
-async def get_preferences(
+def get_preferences(
     user_id: int = Depends(get_current_user),
     db: Database = Depends(get_db)
 ):
@@ -54,7 +54,7 @@ async def get_preferences(
 
 
 @router.put("/preferences")
-async def update_preferences(
+def update_preferences(
     email_enabled: Optional[bool] = None,
     job_alerts: Optional[bool] = None,
     status_changes: Optional[bool] = None,
@@ -62,7 +62,7 @@ async def update_preferences(
     deadlines: Optional[bool] = None,
     weekly_digest: Optional[bool] = None,
     user_id: int = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update notification preferences"""
     db.update_notification_preferences(
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/api/search", tags=["search"])
 
 
 @router.get("")
-async def advanced_search(
+def advanced_search(
     q: str = Query(..., description="Search query"),
     types: Optional[str] = Query(None, description="Comma-separated types: jobs,companies,applications"),
     user_id: Optional[int] = Depends(require_auth),
@@ -52,12 +52,7 @@ async def advanced_search(
                 v.sector
             FROM jobs j
             JOIN companies c ON j.company_id = c.id
-            JOIN job_versions v ON v.job_id = j.job_id
-            JOIN (
-                SELECT job_id, MAX(timestamp) AS max_ts
-                FROM job_versions
-                GROUP BY job_id
-            ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+            JOIN jobs_current v ON v.job_key = j.job_key
             WHERE j.active = 1
               AND (
                   LOWER(v.title) LIKE ? OR
@@ -116,12 +111,7 @@ async def advanced_search(
             FROM applications a
             JOIN jobs j ON a.job_id = j.job_id
             JOIN companies c ON j.company_id = c.id
-            LEFT JOIN job_versions v ON v.job_id = j.job_id
-            LEFT JOIN (
-                SELECT job_id, MAX(timestamp) AS max_ts
-                FROM job_versions
-                GROUP BY job_id
-            ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+            LEFT JOIN jobs_current v ON v.job_key = j.job_key
             WHERE a.user_id = ? AND LOWER(a.notes) LIKE ?
             LIMIT 50
             """,
@@ -10,17 +10,17 @@ from datetime import datetime
 import json
 
 from job_tracker.api.schemas import SavedSearchCreate, SavedSearchResponse
-from job_tracker.api.dependencies import get_db, require_auth
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/searches", tags=["searches"])
 
 
 @router.post("", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED)
-async def create_saved_search(
+def create_saved_search(
     search: SavedSearchCreate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new saved search."""
     cur = db.conn.cursor()
@@ -47,7 +47,7 @@ async def create_saved_search(
         """,
         (user_id, search.name, filters_json, 1 if search.notification_enabled else 0, now)
     )
-    db.conn.commit()
+    db.commit()
     
     search_id = cur.lastrowid
     
@@ -69,7 +69,7 @@ async def create_saved_search(
 
 
 @router.get("", response_model=List[SavedSearchResponse])
-async def list_saved_searches(
+def list_saved_searches(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -96,7 +96,7 @@ async def list_saved_searches(
 
 
 @router.get("/{search_id}", response_model=SavedSearchResponse)
-async def get_saved_search(
+def get_saved_search(
     search_id: int,
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
@@ -126,11 +126,11 @@ async def get_saved_search(
 
 
 @router.put("/{search_id}", response_model=SavedSearchResponse)
-async def update_saved_search(
+def update_saved_search(
     search_id: int,
     search: SavedSearchCreate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update a saved search."""
     cur = db.conn.cursor()
@@ -157,7 +157,7 @@ async def update_saved_search(
         """,
         (search.name, filters_json, 1 if search.notification_enabled else 0, search_id, user_id)
     )
-    db.conn.commit()
+    db.commit()
     
     # Fetch updated search
     row = cur.execute(
@@ -177,10 +177,10 @@ async def update_saved_search(
 
 
 @router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_saved_search(
+def delete_saved_search(
     search_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete a saved search."""
     cur = db.conn.cursor()
@@ -201,6 +201,6 @@ async def delete_saved_search(
         "DELETE FROM saved_searches WHERE search_id = ? AND user_id = ?",
         (search_id, user_id)
     )
-    db.conn.commit()
+    db.commit()
     
     return None
@@ -5,7 +5,7 @@ Settings API routes for user preferences and configuration.
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional
-from job_tracker.api.dependencies import get_db, get_current_user
+from job_tracker.api.dependencies import get_db, get_write_db, get_current_user
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
@@ -22,7 +22,7 @@ class PreferencesUpdate(BaseModel):
 
 
 @router.get("/preferences")
-async def get_preferences(
+def get_preferences(
     user_id: int = Depends(get_current_user),
     db: Database = Depends(get_db)
 ):
@@ -32,10 +32,10 @@ async def get_preferences(
 
 
 @router.patch("/preferences")
-async def update_preferences(
+def update_preferences(
     preferences: PreferencesUpdate,
     user_id: int = Depends(get_current_user),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update user preferences."""
     current_prefs = db.get_user_preferences(user_id)
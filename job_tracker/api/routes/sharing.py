@@ -8,7 +8,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import secrets
 
-from job_tracker.api.dependencies import get_db, require_auth, get_current_user
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth, get_current_user
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/sharing", tags=["sharing"])
@@ -30,10 +30,10 @@ class ShareLinkResponse(BaseModel):
 
 
 @router.post("", response_model=ShareLinkResponse)
-async def create_share_link(
+def create_share_link(
     share: ShareLinkCreate = ...,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a shareable read-only link."""
     cur = db.conn.cursor()
@@ -54,7 +54,7 @@ async def create_share_link(
         """,
         (share_id, user_id, share.resource_type, share.resource_id, expires_at, datetime.now())
     )
-    db.conn.commit()
+    db.commit()
     
     # Generate share URL (would be full URL in production)
     share_url = f"/shared/{share_id}"
@@ -70,7 +70,7 @@ async def create_share_link(
 
 
 @router.get("/{share_id}")
-async def get_shared_resource(
+def get_shared_resource(
     share_id: str,
     db: Database = Depends(get_db)
 ):
@@ -145,7 +145,7 @@ async def get_shared_resource(
 
 
 @router.get("", response_model=List[ShareLinkResponse])
-async def list_share_links(
+def list_share_links(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -170,10 +170,10 @@ async def list_share_links(
 
 
 @router.delete("/{share_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_share_link(
+def delete_share_link(
     share_id: str,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete a share link."""
     cur = db.conn.cursor()
@@ -187,5 +187,5 @@ async def delete_share_link(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found")
     
     cur.execute("DELETE FROM share_links WHERE share_id = ? AND user_id = ?", (share_id, user_id))
-    db.conn.commit()
+    db.commit()
     return None
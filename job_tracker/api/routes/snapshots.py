@@ -0,0 +1,77 @@
+"""
+Snapshot API endpoints.
+
+Provides the diff between two catalog snapshots, streamed as NDJSON
+(one JSON object per changed job) so large diffs never build a full
+response in memory.
+"""
+
+from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
+from dataclasses import asdict
+from typing import Optional
+import json
+
+from job_tracker.api.dependencies import get_history_db
+from job_tracker.db import Database
+from job_tracker.snapshot_diff import diff_snapshots
+
+router = APIRouter(prefix="/api/snapshots", tags=["snapshots"])
+
+_LINES_PER_CHUNK = 500
+
+
+@router.get("/{old_snapshot_id}/diff/{new_snapshot_id}")
+def diff(
+    old_snapshot_id: int,
+    new_snapshot_id: int,
+    new_grad: Optional[bool] = Query(None, description="Compare only jobs with this new-grad flag"),
+    company: Optional[str] = Query(None, description="Comma-separated company IDs"),
+    db: Database = Depends(get_history_db)
+):
+    """
+    Stream the jobs that differ between two snapshots.
+
+    Each line is a JSON object with ``kind`` ("new", "updated" or
+    "removed"), the job and its company, and the old and new version IDs.
+    Filters restrict both snapshots before they are compared, so with
+    ``new_grad=true`` a job that became new-grad is "new". Archived
+    snapshots can be compared too.
+    """
+    company_ids = None
+    if company:
+        try:
+            company_ids = [int(c.strip()) for c in company.split(",") if c.strip()] or None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid company IDs format"
+            )
+
+    for snapshot_id in (old_snapshot_id, new_snapshot_id):
+        row = db.conn.execute(
+            "SELECT 1 FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Snapshot {snapshot_id} not found"
+            )
+
+    def lines():
+        # Dependencies with yield close after the response is sent, so the
+        # request's connection stays checked out while the body streams.
+        batch = []
+        for change in diff_snapshots(
+            db.conn, old_snapshot_id, new_snapshot_id, new_grad=new_grad, company_ids=company_ids
+        ):
+            batch.append(json.dumps(asdict(change)) + "\n")
+            # Starlette sends each chunk from the threadpool; batch lines
+            # so a large diff isn't one thread hop per job.
+            if len(batch) == _LINES_PER_CHUNK:
+                yield "".join(batch)
+                batch = []
+        if batch:
+            yield "".join(batch)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
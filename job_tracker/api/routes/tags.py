@@ -8,7 +8,7 @@ from typing import List, Optional
 from datetime import datetime
 import json
 
-from job_tracker.api.dependencies import get_db, require_auth
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/tags", tags=["tags"])
@@ -28,7 +28,7 @@ class TagResponse(BaseModel):
 
 
 @router.get("", response_model=List[TagResponse])
-async def list_tags(
+def list_tags(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -52,10 +52,10 @@ async def list_tags(
 
 
 @router.post("", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
-async def create_tag(
+def create_tag(
     tag: TagCreate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new tag."""
     cur = db.conn.cursor()
@@ -76,7 +76,7 @@ async def create_tag(
         "INSERT INTO tags (user_id, name, color, created_at) VALUES (?, ?, ?, ?)",
         (user_id, tag.name, tag.color, datetime.now())
     )
-    db.conn.commit()
+    db.commit()
     
     tag_id = cur.lastrowid
     row = cur.execute("SELECT * FROM tags WHERE tag_id = ?", (tag_id,)).fetchone()
@@ -91,10 +91,10 @@ async def create_tag(
 
 
 @router.delete("/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_tag(
+def delete_tag(
     tag_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete a tag."""
     cur = db.conn.cursor()
@@ -126,16 +126,16 @@ async def delete_tag(
                 pass
     
     cur.execute("DELETE FROM tags WHERE tag_id = ? AND user_id = ?", (tag_id, user_id))
-    db.conn.commit()
+    db.commit()
     return None
 
 
 @router.post("/jobs/{job_id}")
-async def tag_job(
+def tag_job(
     job_id: str,
     tag_id: int = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Add a tag to a job."""
     cur = db.conn.cursor()
@@ -150,21 +150,21 @@ async def tag_job(
         "INSERT OR IGNORE INTO job_tags (job_id, tag_id) VALUES (?, ?)",
         (job_id, tag_id)
     )
-    db.conn.commit()
+    db.commit()
     
     return {"message": "Tag added to job"}
 
 
 @router.delete("/jobs/{job_id}/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def untag_job(
+def untag_job(
     job_id: str,
     tag_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Remove a tag from a job."""
     cur = db.conn.cursor()
     
     cur.execute("DELETE FROM job_tags WHERE job_id = ? AND tag_id = ?", (job_id, tag_id))
-    db.conn.commit()
+    db.commit()
     return None
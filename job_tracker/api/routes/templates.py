@@ -7,7 +7,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
-from job_tracker.api.dependencies import get_db, require_auth
+from job_tracker.api.dependencies import get_db, get_write_db, require_auth
 from job_tracker.db import Database
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
@@ -48,7 +48,7 @@ class ApplicationTemplateResponse(BaseModel):
 
 
 @router.get("", response_model=List[ApplicationTemplateResponse])
-async def list_templates(
+def list_templates(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -78,10 +78,10 @@ async def list_templates(
 
 
 @router.post("", response_model=ApplicationTemplateResponse, status_code=status.HTTP_201_CREATED)
-async def create_template(
+def create_template(
     template: ApplicationTemplateCreate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Create a new application template."""
     cur = db.conn.cursor()
@@ -113,7 +113,7 @@ async def create_template(
             now
         )
     )
-    db.conn.commit()
+    db.commit()
     
     template_id = cur.lastrowid
     row = cur.execute("SELECT * FROM application_templates WHERE template_id = ?", (template_id,)).fetchone()
@@ -134,11 +134,11 @@ async def create_template(
 
 
 @router.put("/{template_id}", response_model=ApplicationTemplateResponse)
-async def update_template(
+def update_template(
     template_id: int,
     template: ApplicationTemplateUpdate = Body(...),
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Update an application template."""
     cur = db.conn.cursor()
@@ -191,7 +191,7 @@ async def update_template(
             f"UPDATE application_templates SET {', '.join(updates)} WHERE template_id = ? AND user_id = ?",
             params
         )
-        db.conn.commit()
+        db.commit()
     
     row = cur.execute("SELECT * FROM application_templates WHERE template_id = ?", (template_id,)).fetchone()
     return ApplicationTemplateResponse(
@@ -210,10 +210,10 @@ async def update_template(
 
 
 @router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_template(
+def delete_template(
     template_id: int,
     user_id: int = Depends(require_auth),
-    db: Database = Depends(get_db)
+    db: Database = Depends(get_write_db, scope="function")
 ):
     """Delete an application template."""
     cur = db.conn.cursor()
@@ -227,12 +227,12 @@ async def delete_template(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
     
     cur.execute("DELETE FROM application_templates WHERE template_id = ? AND user_id = ?", (template_id, user_id))
-    db.conn.commit()
+    db.commit()
     return None
 
 
 @router.get("/default", response_model=Optional[ApplicationTemplateResponse])
-async def get_default_template(
+def get_default_template(
     user_id: int = Depends(require_auth),
     db: Database = Depends(get_db)
 ):
@@ -106,6 +106,7 @@ class JobDetailResponse(JobResponse):
     """Extended job information with additional details."""
     extra: Optional[Dict[str, Any]] = None
     description: Optional[str] = None
+    new_grad_reasons: Optional[List[str]] = None  # Classifier reasons; None if not recorded
 
 
 # ============================================================================
@@ -0,0 +1,370 @@
+"""
+Tiered storage: move cold catalog history to an attached archive file.
+
+Most catalog rows are history the API never reads: membership intervals
+of old snapshots and versions that jobs have since replaced.
+``archive_cold_rows`` moves them to a second SQLite file (by default
+``live_jobs.archive.db`` next to ``live_jobs.db``) so the hot file holds
+current state plus a recent window and stays small enough to live in
+the page cache. A row is cold when:
+
+- it is a membership interval that ended before the window, i.e. before
+  the first snapshot younger than ``after_days`` (the two newest
+  snapshots always stay hot, so digests and reports never need the
+  archive);
+- it is a version older than the window that neither ``jobs_current``
+  nor any hot interval references, i.e. a superseded version;
+- it is the ``jobs_current`` row of a job removed more than
+  ``after_days`` ago that no user has saved, applied to, tagged or been
+  notified about. The row is derived, so it is dropped rather than
+  moved; the job's last version then becomes unreferenced and moves too.
+
+``jobs`` rows stay hot: they are small, per-user tables reference them,
+and a job that reappears keeps its ``job_key`` and history. Blobs used
+by moved versions are copied; the hot copies are pruned by maintenance
+once nothing hot uses them.
+
+Each batch commits its copy into the archive before deleting the rows
+from the hot file, so a run can stop at any point and the next one picks
+up where it left off. Run it after every collection run
+(``run_live.py --archive-after-days N``) or from the CLI
+(``job_tracker/cli/archive.py``).
+
+History readers call ``attach_archive``, which attaches the archive and
+shadows ``job_versions``, ``snapshot_membership``, ``blobs`` and
+``snapshot_jobs`` with TEMP views over both files, so existing queries
+see all history unchanged. Those views are read-only; only attach them
+on connections that don't write catalog tables. Maintenance (snapshot
+thinning, compaction) only rewrites the hot file; compaction attaches
+the archive's tables to keep versions that archived intervals use.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from .db import USER_SCHEMA_NAME, Database, immediate_transaction, to_epoch
+
+ARCHIVE_SCHEMA_NAME = "archive"
+
+# Tables moved to the archive: primary key and columns, in hot-table order.
+ARCHIVED_TABLES = {
+    "job_versions": (
+        "version_id",
+        ("version_id", "job_key", "timestamp", "title", "location", "remote", "extra", "sector"),
+    ),
+    "snapshot_membership": (
+        "membership_id",
+        (
+            "membership_id", "job_key", "version_id", "is_new_grad", "reasons_id",
+            "first_snapshot_id", "last_snapshot_id",
+        ),
+    ),
+    "blobs": ("hash", ("hash", "data")),
+}
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {schema}.job_versions (
+    version_id INTEGER PRIMARY KEY,
+    job_key INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT,
+    remote INTEGER,
+    extra TEXT,
+    sector TEXT
+);
+CREATE INDEX IF NOT EXISTS {schema}.idx_job_versions_job_ts ON job_versions(job_key, timestamp);
+
+CREATE TABLE IF NOT EXISTS {schema}.snapshot_membership (
+    membership_id INTEGER PRIMARY KEY,
+    job_key INTEGER NOT NULL,
+    version_id INTEGER NOT NULL,
+    is_new_grad INTEGER NOT NULL,
+    reasons_id INTEGER,
+    first_snapshot_id INTEGER NOT NULL,
+    last_snapshot_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {schema}.idx_snapshot_membership_job
+    ON snapshot_membership(job_key, last_snapshot_id);
+CREATE INDEX IF NOT EXISTS {schema}.idx_snapshot_membership_last
+    ON snapshot_membership(last_snapshot_id, first_snapshot_id);
+CREATE INDEX IF NOT EXISTS {schema}.idx_snapshot_membership_version
+    ON snapshot_membership(version_id);
+
+CREATE TABLE IF NOT EXISTS {schema}.blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+# (table, column) pairs of per-user rows that pin a job's current state hot.
+USER_JOB_REFERENCES = (
+    ("saved_jobs", "job_id"),
+    ("applications", "job_id"),
+    ("job_tags", "job_id"),
+    ("notifications", "related_job_id"),
+    ("job_recommendations", "job_id"),
+)
+
+
+@dataclass
+class ArchivePolicy:
+    """What counts as cold.
+
+    Attributes:
+        after_days: History older than this, and jobs removed longer ago
+            than this, move to the archive.
+        batch_size: Rows moved per transaction.
+    """
+
+    after_days: int = 90
+    batch_size: int = 2000
+
+
+@dataclass
+class ArchiveReport:
+    jobs_retired: int = 0
+    intervals_archived: int = 0
+    versions_archived: int = 0
+    blobs_copied: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"jobs_retired={self.jobs_retired} intervals_archived={self.intervals_archived} "
+            f"versions_archived={self.versions_archived} blobs_copied={self.blobs_copied}"
+        )
+
+
+def archive_path_for(db_path: Path) -> Path:
+    """Default archive file for ``db_path``: ``live_jobs.db`` -> ``live_jobs.archive.db``."""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.archive{db_path.suffix}")
+
+
+def is_archive_attached(db: Database) -> bool:
+    return any(row[1] == ARCHIVE_SCHEMA_NAME for row in db.conn.execute("PRAGMA database_list"))
+
+
+def attach_archive(db: Database, archive_path: Optional[Path] = None, history: bool = True) -> bool:
+    """Attach the archive file to ``db`` as ``archive``.
+
+    With ``history`` (for readers), the TEMP views that merge hot and
+    archived rows are created too, and nothing happens if the archive
+    file does not exist yet. Without it (for the archiver), the file and
+    its tables are created if needed. Safe to call again on a connection
+    that already has it attached. Must be called outside a transaction.
+
+    Returns:
+        True if the archive is attached.
+    """
+    conn = db.conn
+    if not is_archive_attached(db):
+        path = Path(archive_path) if archive_path is not None else archive_path_for(db.db_path)
+        if history and not path.exists():
+            return False
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA_NAME}", (os.fspath(path),))
+        conn.execute(f"PRAGMA {ARCHIVE_SCHEMA_NAME}.journal_mode=WAL")
+        conn.executescript(ARCHIVE_SCHEMA.format(schema=ARCHIVE_SCHEMA_NAME))
+        if not history:
+            _add_missing_columns(conn)
+    if history:
+        _create_history_views(conn)
+    return True
+
+
+def _archive_columns(conn, table: str) -> Set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA {ARCHIVE_SCHEMA_NAME}.table_info({table})")}
+
+
+def _add_missing_columns(conn) -> None:
+    """Add columns that archives created by older versions lack, typed as in the hot file."""
+    for table, (_, columns) in ARCHIVED_TABLES.items():
+        present = _archive_columns(conn, table)
+        types = {row[1]: row[2] for row in conn.execute(f"PRAGMA main.table_info({table})")}
+        for column in columns:
+            if column not in present:
+                conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA_NAME}.{table} ADD COLUMN {column} {types[column]}")
+
+
+def _create_history_views(conn) -> None:
+    # Rows can be in both files if a crash hit between the two files'
+    # commits (WAL commits are atomic per file); the hot copy wins. An
+    # archive the archiver hasn't upgraded yet reads as NULL for new columns.
+    for table, (key, columns) in ARCHIVED_TABLES.items():
+        cols = ", ".join(columns)
+        present = _archive_columns(conn, table)
+        archived = ", ".join(col if col in present else f"NULL AS {col}" for col in columns)
+        conn.execute(
+            f"""
+            CREATE TEMP VIEW IF NOT EXISTS {table} AS
+            SELECT {cols} FROM main.{table}
+            UNION ALL
+            SELECT {archived} FROM {ARCHIVE_SCHEMA_NAME}.{table} AS a
+            WHERE NOT EXISTS (SELECT 1 FROM main.{table} h WHERE h.{key} = a.{key})
+            """
+        )
+    conn.execute(
+        """
+        CREATE TEMP VIEW IF NOT EXISTS snapshot_jobs AS
+        SELECT s.snapshot_id, j.job_id, m.job_key, m.version_id, m.is_new_grad, m.reasons_id
+        FROM temp.snapshot_membership m
+        JOIN main.jobs j ON j.job_key = m.job_key
+        JOIN main.snapshots s
+          ON s.snapshot_id BETWEEN m.first_snapshot_id AND m.last_snapshot_id
+        """
+    )
+
+
+def archive_cold_rows(
+    db: Database,
+    policy: ArchivePolicy | None = None,
+    now: datetime | None = None,
+    archive_path: Optional[Path] = None,
+) -> ArchiveReport:
+    """Move cold rows from ``db`` to its archive and return what was moved."""
+    policy = policy or ArchivePolicy()
+    now = now or datetime.now(timezone.utc)
+    cutoff = to_epoch(now - timedelta(days=policy.after_days))
+    attach_archive(db, archive_path, history=False)
+
+    report = ArchiveReport()
+    report.jobs_retired = retire_removed_jobs(db, policy, cutoff)
+    report.intervals_archived = archive_intervals(db, policy, cutoff)
+    report.versions_archived, report.blobs_copied = archive_versions(db, policy, cutoff)
+    return report
+
+
+def _pinned_job_ids(db: Database) -> Set[str]:
+    """Ids of jobs referenced by per-user rows."""
+    selects = [f"SELECT {col} FROM {USER_SCHEMA_NAME}.{table}" for table, col in USER_JOB_REFERENCES]
+    return {row[0] for row in db.conn.execute(" UNION ".join(selects)) if row[0] is not None}
+
+
+def retire_removed_jobs(db: Database, policy: ArchivePolicy, cutoff: int) -> int:
+    """Drop ``jobs_current`` rows of jobs removed before ``cutoff``."""
+    pinned = _pinned_job_ids(db)
+    retired = 0
+    last_key = 0
+    while True:
+        with immediate_transaction(db.conn):
+            rows = db.conn.execute(
+                """
+                SELECT jc.job_key, j.job_id
+                FROM main.jobs_current jc JOIN main.jobs j ON j.job_key = jc.job_key
+                WHERE jc.active = 0 AND j.active = 0 AND j.removed_at < ? AND jc.job_key > ?
+                ORDER BY jc.job_key LIMIT ?
+                """,
+                (cutoff, last_key, policy.batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            keys = [key for key, job_id in rows if job_id not in pinned]
+            db.conn.executemany("DELETE FROM main.jobs_current WHERE job_key=?", [(k,) for k in keys])
+            retired += len(keys)
+            last_key = rows[-1][0]
+    return retired
+
+
+def _first_hot_snapshot(db: Database, cutoff: int) -> Optional[int]:
+    """Oldest snapshot whose intervals stay hot, or None if there are none."""
+    newest = [r[0] for r in db.conn.execute("SELECT snapshot_id FROM snapshots ORDER BY snapshot_id DESC LIMIT 2")]
+    if not newest:
+        return None
+    recent = db.conn.execute(
+        "SELECT MIN(snapshot_id) FROM snapshots WHERE timestamp >= ?", (cutoff,)
+    ).fetchone()[0]
+    return newest[-1] if recent is None else min(recent, newest[-1])
+
+
+def archive_intervals(db: Database, policy: ArchivePolicy, cutoff: int) -> int:
+    """Move membership intervals that ended before the hot window."""
+    first_hot = _first_hot_snapshot(db, cutoff)
+    if first_hot is None:
+        return 0
+    cols = ", ".join(ARCHIVED_TABLES["snapshot_membership"][1])
+    moved = 0
+    while True:
+        ids = [
+            r[0]
+            for r in db.conn.execute(
+                "SELECT membership_id FROM main.snapshot_membership WHERE last_snapshot_id < ? LIMIT ?",
+                (first_hot, policy.batch_size),
+            )
+        ]
+        if not ids:
+            break
+        _move_rows(db, "snapshot_membership", cols, "membership_id", ids)
+        moved += len(ids)
+    return moved
+
+
+def archive_versions(db: Database, policy: ArchivePolicy, cutoff: int) -> Tuple[int, int]:
+    """Move versions older than ``cutoff`` that no hot row references.
+
+    Returns:
+        ``(versions_moved, blobs_copied)``.
+    """
+    cols = ", ".join(ARCHIVED_TABLES["job_versions"][1])
+    moved = copied = 0
+    last_id = 0
+    while True:
+        ids = [
+            r[0]
+            for r in db.conn.execute(
+                """
+                SELECT v.version_id FROM main.job_versions v
+                WHERE v.version_id > ? AND v.timestamp < ?
+                  AND NOT EXISTS (SELECT 1 FROM main.jobs_current jc WHERE jc.version_id = v.version_id)
+                  AND NOT EXISTS (SELECT 1 FROM main.snapshot_membership m WHERE m.version_id = v.version_id)
+                ORDER BY v.version_id LIMIT ?
+                """,
+                (last_id, cutoff, policy.batch_size),
+            )
+        ]
+        if not ids:
+            break
+        placeholders = ",".join("?" for _ in ids)
+        with immediate_transaction(db.conn):
+            cur = db.conn.execute(
+                f"""
+                INSERT OR IGNORE INTO {ARCHIVE_SCHEMA_NAME}.blobs (hash, data)
+                SELECT b.hash, b.data FROM main.blobs b
+                WHERE b.hash IN (
+                    SELECT json_extract(e.value, '$."$blob"')
+                    FROM main.job_versions v, json_each(v.extra) e
+                    WHERE v.version_id IN ({placeholders}) AND json_valid(v.extra) AND e.type = 'object'
+                )
+                """,
+                ids,
+            )
+            copied += cur.rowcount
+        _move_rows(db, "job_versions", cols, "version_id", ids)
+        moved += len(ids)
+        last_id = ids[-1]
+    return moved, copied
+
+
+def _move_rows(db: Database, table: str, cols: str, key: str, ids: List[int]) -> None:
+    """Copy rows to the archive, then delete them from the hot file.
+
+    Two transactions, archive first: in WAL mode a transaction over
+    attached files is only atomic per file, and this order means a crash
+    can leave a row in both files (the history views and the next run
+    handle that) but never in neither.
+    """
+    placeholders = ",".join("?" for _ in ids)
+    with immediate_transaction(db.conn):
+        db.conn.execute(
+            f"INSERT OR REPLACE INTO {ARCHIVE_SCHEMA_NAME}.{table} ({cols}) "
+            f"SELECT {cols} FROM main.{table} WHERE {key} IN ({placeholders})",
+            ids,
+        )
+    with immediate_transaction(db.conn):
+        db.conn.execute(f"DELETE FROM main.{table} WHERE {key} IN ({placeholders})", ids)
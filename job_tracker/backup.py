@@ -0,0 +1,221 @@
+"""
+Online backups through the SQLite backup API.
+
+Copying ``live_jobs.db`` with ``cp`` can capture a torn file (a commit or
+checkpoint half-written, the WAL missing) and reads the whole database in
+one burst. ``backup_database`` copies one attached file with
+``sqlite3.Connection.backup`` instead:
+
+- The source connection holds a single read transaction for the whole
+  copy, so the backup is a consistent snapshot of one commit. In WAL mode
+  that does not block the collector or the API; writers keep appending to
+  the WAL, which is checkpointed once the backup ends. (Without the pinned
+  snapshot, every commit by another connection would restart the copy.)
+- Pages are copied ``pages_per_step`` at a time with a ``sleep`` between
+  steps, so a backup trickles through the page cache and disk rather
+  than competing with requests for them.
+- The copy is written to a ``.partial`` file, verified (``PRAGMA
+  quick_check`` or ``integrity_check``, plus page count and schema
+  version against the source snapshot) and only then renamed into place.
+- Each copy is named ``<stem>.<UTC timestamp>.db``; the newest ``keep``
+  copies are kept and older ones deleted. ``keep=1`` keeps a single
+  rotating copy.
+
+The catalog, the user database and (if attached) the archive each get
+their own ``BackupPolicy`` (see ``DEFAULT_POLICIES``): user rows cannot
+be recollected, so they are kept longer and fully checked; the archive
+only changes when cold rows move, so few copies are enough. Run it from
+the CLI (``job_tracker/cli/backup.py``) or from the scheduler
+(``run_live.py --backup-dir DIR``).
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .archive import ARCHIVE_SCHEMA_NAME
+from .db import USER_SCHEMA_NAME, Database
+
+VERIFY_MODES = ("none", "quick", "full")
+
+
+@dataclass
+class BackupPolicy:
+    """How one database file is backed up.
+
+    Attributes:
+        pages_per_step: Pages copied per backup step.
+        sleep: Seconds to pause between steps.
+        keep: Newest copies to keep; older ones are deleted.
+        verify: ``"quick"`` (``PRAGMA quick_check``), ``"full"``
+            (``PRAGMA integrity_check`` and ``foreign_key_check``) or
+            ``"none"``.
+    """
+
+    pages_per_step: int = 1000
+    sleep: float = 0.01
+    keep: int = 7
+    verify: str = "quick"
+
+
+DEFAULT_POLICIES: Dict[str, BackupPolicy] = {
+    "main": BackupPolicy(),
+    USER_SCHEMA_NAME: BackupPolicy(keep=30, verify="full"),
+    ARCHIVE_SCHEMA_NAME: BackupPolicy(keep=2),
+}
+
+
+@dataclass
+class BackupResult:
+    schema: str
+    path: Path
+    pages: int = 0
+    steps: int = 0
+    seconds: float = 0.0
+    verified: str = "none"
+    removed: List[Path] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.schema} -> {self.path} pages={self.pages} steps={self.steps} "
+            f"seconds={self.seconds:.2f} verified={self.verified} removed={len(self.removed)}"
+        )
+
+
+class BackupError(Exception):
+    """A backup copy failed verification."""
+
+
+def backup_all(
+    db: Database,
+    dest_dir: Path,
+    policies: Optional[Dict[str, BackupPolicy]] = None,
+    now: Optional[datetime] = None,
+) -> List[BackupResult]:
+    """Back up every attached file that has a policy, each with its own."""
+    policies = {**DEFAULT_POLICIES, **(policies or {})}
+    now = now or datetime.now(timezone.utc)
+    attached = [r[1] for r in db.conn.execute("PRAGMA database_list")]
+    return [
+        backup_database(db, dest_dir, schema, policies[schema], now)
+        for schema in attached
+        if schema in policies
+    ]
+
+
+def backup_database(
+    db: Database,
+    dest_dir: Path,
+    schema: str = "main",
+    policy: Optional[BackupPolicy] = None,
+    now: Optional[datetime] = None,
+) -> BackupResult:
+    """Copy the ``schema`` file of ``db`` into ``dest_dir`` and rotate old copies.
+
+    Raises:
+        BackupError: The copy failed verification. It is deleted and no
+            older copy is rotated out.
+    """
+    policy = policy or DEFAULT_POLICIES.get(schema, BackupPolicy())
+    if policy.verify not in VERIFY_MODES:
+        raise ValueError(f"Unknown verify mode: {policy.verify!r} (expected one of {VERIFY_MODES})")
+    if policy.keep < 1:
+        raise ValueError("keep must be at least 1")
+    now = now or datetime.now(timezone.utc)
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    stem = _source_stem(db, schema)
+    final = dest_dir / f"{stem}.{now.strftime('%Y%m%dT%H%M%SZ')}.db"
+    partial = final.with_name(final.name + ".partial")
+    partial.unlink(missing_ok=True)
+    result = BackupResult(schema=schema, path=final)
+
+    conn = db.conn
+    if conn.in_transaction:
+        conn.commit()
+    dest = sqlite3.connect(str(partial))
+    start = time.perf_counter()
+    try:
+        # Pin one snapshot of the source for the whole copy.
+        conn.execute("BEGIN")
+        conn.execute(f"SELECT 1 FROM {schema}.sqlite_master LIMIT 1").fetchall()
+        pages = conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0]
+        version = conn.execute(f"PRAGMA {schema}.user_version").fetchone()[0]
+
+        def progress(status: int, remaining: int, total: int) -> None:
+            result.steps += 1
+            if remaining and policy.sleep:
+                time.sleep(policy.sleep)
+
+        conn.backup(dest, pages=policy.pages_per_step, progress=progress, name=schema)
+        conn.rollback()
+        result.pages = pages
+        result.verified = _verify(dest, policy.verify, pages, version)
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        dest.close()
+        _remove_db_files(partial)
+        raise
+    dest.close()
+    partial.replace(final)
+    result.seconds = time.perf_counter() - start
+    result.removed = rotate_backups(dest_dir, stem, policy.keep)
+    return result
+
+
+def rotate_backups(dest_dir: Path, stem: str, keep: int) -> List[Path]:
+    """Delete all but the newest ``keep`` copies of ``stem``; return the deleted paths."""
+    copies = list_backups(dest_dir, stem)
+    doomed = copies[:-keep] if keep else copies
+    for path in doomed:
+        _remove_db_files(path)
+    return doomed
+
+
+def list_backups(dest_dir: Path, stem: str) -> List[Path]:
+    """Copies of ``stem`` in ``dest_dir``, oldest first."""
+    pattern = re.compile(rf"{re.escape(stem)}\.\d{{8}}T\d{{6}}Z\.db")
+    return sorted(p for p in Path(dest_dir).iterdir() if pattern.fullmatch(p.name))
+
+
+def _source_stem(db: Database, schema: str) -> str:
+    for _, name, filename in db.conn.execute("PRAGMA database_list"):
+        if name == schema:
+            if not filename:
+                raise ValueError(f"{schema} is not backed by a file")
+            return Path(filename).stem
+    raise ValueError(f"{schema} is not attached")
+
+
+def _verify(dest: sqlite3.Connection, mode: str, pages: int, version: int) -> str:
+    """Check the copy against the source snapshot; return the mode used."""
+    if mode == "none":
+        return mode
+    copied = dest.execute("PRAGMA page_count").fetchone()[0]
+    if copied != pages:
+        raise BackupError(f"copy has {copied} pages, source has {pages}")
+    copied_version = dest.execute("PRAGMA user_version").fetchone()[0]
+    if copied_version != version:
+        raise BackupError(f"copy has user_version {copied_version}, source has {version}")
+    check = "integrity_check" if mode == "full" else "quick_check"
+    problems = [r[0] for r in dest.execute(f"PRAGMA {check}")]
+    if problems != ["ok"]:
+        raise BackupError(f"{check} failed: {'; '.join(problems[:5])}")
+    if mode == "full":
+        violations = dest.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise BackupError(f"foreign_key_check found {len(violations)} violations")
+    return mode
+
+
+def _remove_db_files(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark API responsiveness under a mix of slow and fast requests.
+
+Some clients keep issuing a slow request (a keyword search that counts
+over every active job) while others issue fast ones (health check and
+job detail lookups). Two server modes are compared:
+
+- ``threaded``: the app as shipped. Route handlers are plain ``def``
+  functions that FastAPI runs on its threadpool.
+- ``blocking``: the same handlers wrapped as ``async def``, so their
+  sqlite3 calls run on the event loop, as they did before.
+
+In blocking mode every slow query stalls the whole worker. Fast-request
+latency tracks the slow query time and throughput collapses.
+
+Usage:
+  python -m job_tracker.benchmarks.api_concurrency
+  python -m job_tracker.benchmarks.api_concurrency --jobs 50000 --slow-clients 4 --fast-clients 16 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import inspect
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import requests
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from job_tracker.benchmarks.api_load import build_db, free_port
+
+MODES = ("threaded", "blocking")
+SLOW_PATH = "/api/jobs?keywords=no-such-keyword&page_size=20"
+
+
+def blocking_app(app: FastAPI) -> FastAPI:
+    """Clone ``app`` with every sync handler wrapped in ``async def``."""
+
+    def as_async(fn):
+        @functools.wraps(fn)
+        async def endpoint(*args, **kwargs):
+            return fn(*args, **kwargs)
+
+        return endpoint
+
+    def flatten(routes):
+        # Newer FastAPI keeps included routers as wrappers around the original.
+        for route in routes:
+            included = getattr(route, "original_router", None)
+            if included is not None:
+                yield from flatten(included.routes)
+            else:
+                yield route
+
+    clone = FastAPI(lifespan=app.router.lifespan_context)
+    for route in flatten(app.routes):
+        if isinstance(route, APIRoute) and not inspect.iscoroutinefunction(route.endpoint):
+            clone.router.add_api_route(
+                route.path,
+                as_async(route.endpoint),
+                methods=list(route.methods),
+                response_model=route.response_model,
+                status_code=route.status_code,
+                dependencies=route.dependencies,
+            )
+        else:
+            clone.router.routes.append(route)
+    clone.dependency_overrides = app.dependency_overrides
+    return clone
+
+
+def create_app() -> FastAPI:
+    """uvicorn factory: the shipped app, or its blocking clone."""
+    from job_tracker.api.main import app
+
+    return blocking_app(app) if os.getenv("BENCH_MODE") == "blocking" else app
+
+
+@contextmanager
+def serve_subprocess(mode: str, db_path: Path) -> Iterator[str]:
+    """Run the app in a separate uvicorn process so clients don't share its GIL."""
+    port = free_port()
+    env = {**os.environ, "DB_PATH": str(db_path), "BENCH_MODE": mode}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", "job_tracker.benchmarks.api_concurrency:create_app",
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            try:
+                requests.get(f"{base}/api/health", timeout=1)
+                break
+            except requests.ConnectionError:
+                if proc.poll() is not None:
+                    raise RuntimeError("API server failed to start")
+                time.sleep(0.1)
+        yield base
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * q) - 1)] if values else float("nan")
+
+
+def run_mode(mode: str, db_path: Path, slow_clients: int, fast_clients: int, seconds: float) -> Dict[str, float]:
+    with serve_subprocess(mode, db_path) as base:
+        job_ids = [j["job_id"] for j in requests.get(f"{base}/api/jobs?page_size=50").json()["jobs"]]
+        fast_paths = ["/api/health"] + [f"/api/jobs/{j}" for j in job_ids]
+        deadline = time.perf_counter() + seconds
+        slow: List[float] = []
+        fast: List[float] = []
+        lock = threading.Lock()
+
+        def client(paths: List[str], sink: List[float]) -> None:
+            session = requests.Session()
+            i = 0
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                session.get(base + paths[i % len(paths)]).raise_for_status()
+                with lock:
+                    sink.append(time.perf_counter() - start)
+                i += 1
+
+        with ThreadPoolExecutor(max_workers=slow_clients + fast_clients) as pool:
+            for _ in range(slow_clients):
+                pool.submit(client, [SLOW_PATH], slow)
+            for _ in range(fast_clients):
+                pool.submit(client, fast_paths, fast)
+
+    return {
+        "fast_rps": len(fast) / seconds,
+        "fast_p50_ms": statistics.median(fast) * 1000 if fast else float("nan"),
+        "fast_p99_ms": percentile(fast, 0.99) * 1000,
+        "slow_rps": len(slow) / seconds,
+        "slow_p50_ms": statistics.median(slow) * 1000 if slow else float("nan"),
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark API latency under mixed slow/fast requests")
+    p.add_argument("--db", help="Existing database to serve (default: a synthetic one)")
+    p.add_argument("--jobs", type=int, default=50_000, help="Jobs in the synthetic database")
+    p.add_argument("--slow-clients", type=int, default=4)
+    p.add_argument("--fast-clients", type=int, default=16)
+    p.add_argument("--seconds", type=float, default=10.0)
+    p.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / "concurrency.db"
+        if not args.db:
+            build_db(db_path, args.jobs)
+        print(f"{'mode':<10}  {'fast req/s':>10}  {'fast p50':>9}  {'fast p99':>9}  {'slow req/s':>10}  {'slow p50':>9}")
+        for mode in args.modes:
+            r = run_mode(mode, db_path, args.slow_clients, args.fast_clients, args.seconds)
+            print(
+                f"{mode:<10}  {r['fast_rps']:>10.1f}  {r['fast_p50_ms']:>7.1f}ms  {r['fast_p99_ms']:>7.1f}ms  "
+                f"{r['slow_rps']:>10.1f}  {r['slow_p50_ms']:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Load-test the API's database dependency.
+
+Starts the app in-process under uvicorn against a synthetic database and
+drives it with concurrent HTTP clients, once with the pooled ``get_db``
+and once with the old per-request connection (a new ``Database`` per
+request, never closed). Reports request latency percentiles and the
+server process's open file descriptor count before and after the run
+(Linux only), so leaked connections show up as FD growth.
+
+Usage:
+  python -m job_tracker.benchmarks.api_load
+  python -m job_tracker.benchmarks.api_load --requests 5000 --concurrency 32 --pool-size 8
+  python -m job_tracker.benchmarks.api_load --db live_jobs.db --modes pooled
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import requests
+import uvicorn
+
+from job_tracker.benchmarks.ingest import make_workload
+from job_tracker.db import Database
+from job_tracker.persistence import persist_snapshot
+
+MODES = ("pooled", "per-request")
+
+
+def open_fds() -> int | None:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def build_db(path: Path, n_jobs: int) -> None:
+    companies, jobs, _ = make_workload(n_jobs, 50, 0.0, seed=11)
+    with Database(path, profile="ingest") as db:
+        persist_snapshot(db, datetime(2026, 1, 1, tzinfo=timezone.utc), jobs, companies)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(app) -> Iterator[str]:
+    """Run ``app`` under uvicorn in a background thread; yield its base URL."""
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def run_mode(mode: str, db_path: Path, n_requests: int, concurrency: int, pool_size: int) -> Dict[str, float]:
+    os.environ["DB_PATH"] = str(db_path)
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    from job_tracker.api.dependencies import get_db
+    from job_tracker.api.main import app
+
+    app.dependency_overrides.clear()
+    if mode == "per-request":
+        app.dependency_overrides[get_db] = lambda: Database(db_path, profile="api-read")
+
+    with serve(app) as base:
+        job_ids = [j["job_id"] for j in requests.get(f"{base}/api/jobs?page_size=100").json()["jobs"]]
+        paths = ["/api/jobs?page_size=20", "/api/jobs/filters/options"] + [f"/api/jobs/{j}" for j in job_ids[:20]]
+
+        gc.collect()
+        fds_before = open_fds()
+        local = threading.local()
+
+        def one(i: int) -> float:
+            session = getattr(local, "session", None)
+            if session is None:
+                session = local.session = requests.Session()
+            start = time.perf_counter()
+            resp = session.get(base + paths[i % len(paths)])
+            resp.raise_for_status()
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies: List[float] = list(pool.map(one, range(n_requests)))
+        elapsed = time.perf_counter() - start
+        fds_after = open_fds()
+    app.dependency_overrides.clear()
+
+    latencies.sort()
+    return {
+        "rps": n_requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "fds_before": fds_before if fds_before is not None else float("nan"),
+        "fds_after": fds_after if fds_after is not None else float("nan"),
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Load-test pooled vs per-request database connections")
+    p.add_argument("--db", help="Existing database to serve (default: a synthetic one)")
+    p.add_argument("--jobs", type=int, default=5000, help="Jobs in the synthetic database")
+    p.add_argument("--requests", type=int, default=3000)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--pool-size", type=int, default=8)
+    p.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / "load.db"
+        if not args.db:
+            build_db(db_path, args.jobs)
+        print(f"{'mode':<12}  {'req/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}  {'fds before':>10}  {'fds after':>10}")
+        for mode in args.modes:
+            r = run_mode(mode, db_path, args.requests, args.concurrency, args.pool_size)
+            print(
+                f"{mode:<12}  {r['rps']:>8.0f}  {r['p50_ms']:>8.1f}  {r['p99_ms']:>8.1f}  "
+                f"{r['fds_before']:>10.0f}  {r['fds_after']:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
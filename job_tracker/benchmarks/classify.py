@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Benchmark the new-grad classifier on a synthetic corpus.
+
+Generates jobs with realistic titles (seniority, level and early-career
+words, plus words like "Israel" or "International" that only contain a
+keyword) and multi-paragraph descriptions with experience requirements
+scattered through them. Runs the compiled single-pass classifier and the
+previous loop of substring tests and per-pattern ``re.search`` calls
+over the joined reprs of ``extra`` (both kept here as a reference) over
+the same corpus, and reports throughput, how much text each scans and
+how many verdicts differ, by title keyword only matching inside another
+word. ``classify_many`` is timed on the same corpus in-process and, with
+``--processes N``, over a process pool; ``--duplicates`` makes a share
+of the postings repeat earlier ones (the same role posted in several
+locations), which it classifies once.
+
+Usage:
+  python -m job_tracker.benchmarks.classify
+  python -m job_tracker.benchmarks.classify --jobs 50000 --paragraphs 12 --repeat 5
+  python -m job_tracker.benchmarks.classify --jobs 100000 --processes 4 --duplicates 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import time
+from dataclasses import replace
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from job_tracker import diff_engine
+from job_tracker.diff_engine import _text_fields, classify_many, classify_new_grad
+from job_tracker.models import Job
+
+_LEVELS = ["", "", "Senior ", "Sr. ", "Staff ", "Principal ", "Junior ", "Associate ", "Lead ", "New Grad "]
+_ROLES = [
+    "Software Engineer",
+    "Backend Engineer",
+    "Data Analyst",
+    "Product Manager",
+    "Research Scientist",
+    "Machine Learning Engineer",
+    "Site Reliability Engineer",
+    "Solutions Consultant",
+]
+_SUFFIXES = ["", "", "", " I", " II", " 1", ", University Graduate", " - Early Career", " (Internship)", " - Israel",
+             " - International Payments", " - Templates", " - Leadership Tools", " - Contracts Platform"]
+_FILLER = [
+    "You will design, build and operate services used by millions of people.",
+    "Our team values ownership, clear communication and thoughtful code review.",
+    "We offer competitive compensation, equity and comprehensive benefits.",
+    "You will collaborate closely with product, design and data science partners.",
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Experience with Python, Go or Java and relational databases is a plus.",
+]
+_REQUIREMENTS = [
+    "",
+    "",
+    "0-2 years of professional software development.",
+    "1-2 yrs experience with distributed systems.",
+    "5+ years of experience building backend services.",
+    "Minimum 3 years in a similar role.",
+    "PhD in Computer Science or a related field.",
+    "Recent graduate with a degree in a technical field.",
+    "No prior experience required; we will teach you.",
+]
+
+
+def make_corpus(n_jobs: int, paragraphs: int, seed: int, duplicates: float = 0.0) -> List[Job]:
+    rng = random.Random(seed)
+    jobs: List[Job] = []
+    for i in range(n_jobs):
+        if jobs and rng.random() < duplicates:
+            jobs.append(replace(rng.choice(jobs), job_id=f"bench-{i}", url=f"https://example.com/jobs/{i}"))
+            continue
+        title = f"{rng.choice(_LEVELS)}{rng.choice(_ROLES)}{rng.choice(_SUFFIXES)}"
+        body = [rng.choice(_FILLER) for _ in range(paragraphs)]
+        body.insert(rng.randrange(len(body) + 1), rng.choice(_REQUIREMENTS))
+        jobs.append(
+            Job(
+                job_id=f"bench-{i}",
+                company="Bench Co",
+                title=title,
+                location="Remote",
+                url=f"https://example.com/jobs/{i}",
+                source="greenhouse",
+                extra={
+                    "description": "\n\n".join(body),
+                    "departments": [{"name": "Engineering"}],
+                    "experienceLevel": rng.choice([None, None, "Entry Level", "Mid-Senior level"]),
+                    "categories": {"team": "Engineering", "commitment": "Full-time", "location": "Remote"},
+                    "applyUrl": f"https://example.com/jobs/{i}/apply",
+                    "listedAt": 1760000000000 + i,
+                },
+            )
+        )
+    return jobs
+
+
+def collect_text_blobs(job: Job) -> List[str]:
+    """The text extraction before ``_text_fields``: reprs of nested values, descriptions twice."""
+    blobs: List[str] = []
+    if not job.extra:
+        return blobs
+    for key in diff_engine._DESCRIPTION_KEYS:
+        val = job.extra.get(key)
+        if val:
+            blobs.append(str(val))
+    for v in job.extra.values():
+        if isinstance(v, list):
+            blobs.extend(str(item) for item in v if item is not None)
+        elif isinstance(v, dict):
+            blobs.extend(str(val) for val in v.values() if val is not None)
+        elif v is not None:
+            blobs.append(str(v))
+    return blobs
+
+
+def classify_substring(job: Job) -> Tuple[bool, List[str]]:
+    """The classifier before the compiled matcher: substring tests and one ``re.search`` per pattern."""
+    title = (job.title or "").lower()
+    for bad in diff_engine._NEGATIVE_TITLE_KEYWORDS:
+        if bad in title:
+            return False, [f'title contains "{bad}" (seniority)']
+    is_research_role = any(bad in title for bad in diff_engine._RESEARCH_TITLE_KEYWORDS)
+    full_text = "\n".join([title] + [b.lower() for b in collect_text_blobs(job)])
+    for pat in diff_engine._NEGATIVE_TEXT_PATTERNS:
+        if re.search(pat, full_text):
+            return False, [f"matched negative requirement pattern: {pat}"]
+    positive_hits: List[str] = []
+    for good in diff_engine._POSITIVE_TITLE_KEYWORDS:
+        if good in title:
+            positive_hits.append(f'title contains "{good}"')
+            break
+    for pat in diff_engine._POSITIVE_TEXT_PATTERNS:
+        if re.search(pat, full_text):
+            positive_hits.append(f"matched positive requirement pattern: {pat}")
+            break
+    if job.extra:
+        for key in ["experienceLevel", "experience_level", "seniority", "level", "typeOfEmployment", "employmentType"]:
+            val = job.extra.get(key)
+            lab = (val.get("label") or val.get("name") or "").lower() if isinstance(val, dict) else (
+                str(val).lower() if val is not None else ""
+            )
+            if not lab:
+                continue
+            if any(t in lab for t in ["senior", "staff", "principal", "lead", "manager", "director"]):
+                return False, [f'extra.{key}="{val}" (seniority)']
+            if any(t in lab for t in ["entry", "junior", "intern", "graduate", "early", "new grad"]):
+                positive_hits.append(f'extra.{key}="{val}"')
+                break
+    if is_research_role and not positive_hits:
+        return False, ["research role with no explicit new-grad signals"]
+    if not positive_hits:
+        return False, ["no positive new-grad signals found"]
+    return True, positive_hits
+
+
+CLASSIFIERS: Dict[str, Callable[[Job], Tuple[bool, List[str]]]] = {
+    "substring": classify_substring,
+    "compiled": classify_new_grad,
+}
+
+
+def time_classifier(fn: Callable[[Job], Tuple[bool, List[str]]], jobs: List[Job], repeat: int) -> float:
+    """Median seconds to classify every job."""
+    return time_batch(lambda batch: [fn(job) for job in batch], jobs, repeat)
+
+
+def time_batch(fn: Callable[[List[Job]], List[Tuple[bool, List[str]]]], jobs: List[Job], repeat: int) -> float:
+    """Median seconds for one call classifying every job."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(jobs)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the new-grad classifier")
+    p.add_argument("--jobs", type=int, default=20_000)
+    p.add_argument("--paragraphs", type=int, default=8, help="Filler sentences per description")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--duplicates", type=float, default=0.0, help="Share of postings repeating an earlier one")
+    p.add_argument("--processes", type=int, default=0, help="Also time classify_many over N processes")
+    args = p.parse_args()
+
+    jobs = make_corpus(args.jobs, args.paragraphs, args.seed, args.duplicates)
+    megabytes = sum(len(job.title) + len(job.extra["description"]) for job in jobs) / 1e6
+    print(f"{args.jobs} jobs, {megabytes:.1f} MB of title and description text")
+    print(f"{'classifier':<10}  {'seconds':>8}  {'jobs/s':>9}  {'MB/s':>6}")
+    seconds = {}
+    for name, fn in CLASSIFIERS.items():
+        seconds[name] = time_classifier(fn, jobs, args.repeat)
+        print(f"{name:<10}  {seconds[name]:>8.3f}  {args.jobs / seconds[name]:>9.0f}  {megabytes / seconds[name]:>6.1f}")
+    batches = {"many": classify_many}
+    if args.processes > 1:
+        batches[f"many-p{args.processes}"] = partial(classify_many, processes=args.processes)
+    for name, fn in batches.items():
+        seconds[name] = time_batch(fn, jobs, args.repeat)
+        print(f"{name:<10}  {seconds[name]:>8.3f}  {args.jobs / seconds[name]:>9.0f}  {megabytes / seconds[name]:>6.1f}")
+    print(f"speedup     {seconds['substring'] / min(seconds.values()):.2f}x")
+    if classify_many(jobs) != [classify_new_grad(job) for job in jobs]:
+        print("classify_many results differ from classify_new_grad!")
+
+    old_chars = sum(sum(len(b) for b in collect_text_blobs(job)) for job in jobs) / len(jobs)
+    new_chars = sum(sum(len(t) for t in _text_fields(job)) for job in jobs) / len(jobs)
+    print(f"\nextra text scanned per job: {old_chars:.0f} chars before, {new_chars:.0f} now")
+
+    differ: Dict[str, int] = {}
+    for job in jobs:
+        old, new = classify_substring(job), classify_new_grad(job)
+        if old != new:
+            differ[job.title] = differ.get(job.title, 0) + 1
+    print(f"{sum(differ.values())} verdicts or reasons differ (substring keyword hits inside words)")
+    for title, count in sorted(differ.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  {count:>6}  {title}")
+
+
+if __name__ == "__main__":
+    main()
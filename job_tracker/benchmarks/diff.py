@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark ``compute_diff`` on two large, mostly unchanged snapshots.
+
+Builds an old snapshot of synthetic jobs with multi-paragraph
+descriptions, then a new one where a share of the jobs changed (title,
+location or description), some were removed and some added. Unchanged
+jobs are fresh ``Job`` objects with equal but not identical ``extra``
+dicts, as a new collection run produces. Times the previous diff, which
+compared title, location, remote and the whole ``extra`` dict field by
+field for every job in both snapshots (kept here as a reference),
+against ``compute_diff``, which settles equal jobs with one
+``Job.same_content`` tuple comparison, and checks both agree.
+
+Usage:
+  python -m job_tracker.benchmarks.diff
+  python -m job_tracker.benchmarks.diff --jobs 100000 --changed 0.01 --paragraphs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import random
+import statistics
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Tuple
+
+from job_tracker.benchmarks.classify import make_corpus
+from job_tracker.diff_engine import JobDiff, compute_diff
+from job_tracker.models import Job, JobSnapshot
+
+
+def compute_diff_fields(old_snapshot: JobSnapshot, new_snapshot: JobSnapshot) -> Dict[str, List]:
+    """The diff before ``same_content``: every field of every job in both snapshots compared."""
+    old_index = old_snapshot.index_by_id()
+    new_index = new_snapshot.index_by_id()
+    new_jobs: List[Job] = []
+    removed_jobs: List[Job] = []
+    changed_jobs: List[JobDiff] = []
+    for job_id, new_job in new_index.items():
+        if job_id not in old_index:
+            new_jobs.append(new_job)
+        else:
+            old_job = old_index[job_id]
+            changes: Dict[str, Tuple] = {}
+            for field in ["title", "location", "remote", "extra"]:
+                old_val = getattr(old_job, field)
+                new_val = getattr(new_job, field)
+                if old_val != new_val:
+                    changes[field] = (old_val, new_val)
+            if changes:
+                changed_jobs.append(JobDiff(job_id, old_job, new_job, changes))
+    for job_id, old_job in old_index.items():
+        if job_id not in new_index:
+            removed_jobs.append(old_job)
+    return {"new": new_jobs, "removed": removed_jobs, "changed": changed_jobs}
+
+
+def make_snapshots(n_jobs: int, paragraphs: int, changed: float, seed: int) -> Tuple[List[Job], List[Job]]:
+    rng = random.Random(seed)
+    old = make_corpus(n_jobs, paragraphs, seed)
+    new: List[Job] = []
+    for job in old:
+        roll = rng.random()
+        if roll < changed / 4:
+            continue  # removed
+        if roll < changed:
+            which = rng.choice(["title", "location", "extra"])
+            if which == "extra":
+                extra = copy.deepcopy(job.extra)
+                extra["description"] += "\n\nUpdated: relocation assistance available."
+                new.append(replace(job, extra=extra))
+            else:
+                new.append(replace(job, **{which: getattr(job, which) + " (updated)"}))
+            continue
+        new.append(replace(job, extra=copy.deepcopy(job.extra)))
+    added = make_corpus(int(n_jobs * changed / 4), paragraphs, seed + 1)
+    new.extend(replace(job, job_id=f"added-{i}") for i, job in enumerate(added))
+    return old, new
+
+
+def summarize(diff: Dict[str, List]) -> Tuple:
+    return (
+        sorted(job.job_id for job in diff["new"]),
+        sorted(job.job_id for job in diff["removed"]),
+        sorted((d.job_id, tuple(sorted(d.changes))) for d in diff["changed"]),
+    )
+
+
+def time_diff(fn: Callable, old: List[Job], new: List[Job], repeat: int) -> float:
+    """Median seconds per diff."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(JobSnapshot(timestamp=None, jobs=old), JobSnapshot(timestamp=None, jobs=new))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark compute_diff")
+    p.add_argument("--jobs", type=int, default=50_000)
+    p.add_argument("--paragraphs", type=int, default=8, help="Filler sentences per description")
+    p.add_argument("--changed", type=float, default=0.02, help="Share of jobs changed, removed or added")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    old, new = make_snapshots(args.jobs, args.paragraphs, args.changed, args.seed)
+    print(f"{len(old)} old jobs, {len(new)} new jobs")
+
+    print(f"{'diff':<12}  {'seconds':>8}  {'jobs/s':>10}")
+    seconds = {
+        "fields": time_diff(compute_diff_fields, old, new, args.repeat),
+        "compute_diff": time_diff(compute_diff, old, new, args.repeat),
+    }
+    for name, secs in seconds.items():
+        print(f"{name:<12}  {secs:>8.3f}  {len(new) / secs:>10.0f}")
+    print(f"speedup {seconds['fields'] / seconds['compute_diff']:.2f}x")
+
+    reference = compute_diff_fields(JobSnapshot(None, old), JobSnapshot(None, new))
+    result = compute_diff(JobSnapshot(None, old), JobSnapshot(None, new))
+    counts = {key: len(value) for key, value in result.items()}
+    print(f"diff: {counts}")
+    if summarize(result) != summarize(reference):
+        print("compute_diff differs from the field diff!")
+
+
+if __name__ == "__main__":
+    main()
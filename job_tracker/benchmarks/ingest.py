@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark the snapshot ingest engines on synthetic jobs.
+
+Each engine ingests the same workload into a fresh database: an initial
+snapshot followed by a steady-state snapshot where a small fraction of
+jobs churns (some removed, some added). Wall time for each snapshot is
+reported so the set-based "staged" engine can be compared with the
+row-at-a-time "rows" engine.
+
+Usage:
+  python -m job_tracker.benchmarks.ingest
+  python -m job_tracker.benchmarks.ingest --jobs 10000 100000 --engines staged rows
+  python -m job_tracker.benchmarks.ingest --jobs 10000 --companies 200 --churn 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Tuple
+
+from job_tracker.collector import CompanyConfig
+from job_tracker.db import Database
+from job_tracker.models import Job, stable_job_id
+from job_tracker.persistence import INGEST_ENGINES, persist_snapshot
+
+_TITLES = [
+    "Software Engineer",
+    "Senior Software Engineer",
+    "New Grad Software Engineer",
+    "Data Analyst",
+    "Product Manager",
+    "Software Engineer I",
+    "Staff Engineer",
+    "Research Scientist",
+]
+_LOCATIONS = ["New York, NY", "San Francisco, CA", "Remote", "Austin, TX", "Seattle, WA"]
+
+
+def make_companies(n: int) -> List[CompanyConfig]:
+    return [CompanyConfig(slug=f"bench-co-{i}", name=f"Bench Co {i}", ats="greenhouse") for i in range(n)]
+
+
+def make_job(company: CompanyConfig, n: int, rng: random.Random) -> Job:
+    url = f"https://boards.greenhouse.io/{company.slug}/jobs/{n}"
+    return Job(
+        job_id=stable_job_id(company.slug, url),
+        company=company.name,
+        title=rng.choice(_TITLES),
+        location=rng.choice(_LOCATIONS),
+        url=url,
+        source="greenhouse",
+        remote=rng.random() < 0.3,
+        extra={
+            "description": "We are looking for engineers to build reliable systems. " * 20,
+            "departments": [{"name": "Engineering"}],
+        },
+    )
+
+
+def make_workload(
+    n_jobs: int, n_companies: int, churn: float, seed: int
+) -> Tuple[List[CompanyConfig], List[Job], List[Job]]:
+    """Return (companies, first_snapshot_jobs, second_snapshot_jobs)."""
+    rng = random.Random(seed)
+    companies = make_companies(n_companies)
+    first = [make_job(companies[i % n_companies], i, rng) for i in range(n_jobs)]
+    n_churn = int(n_jobs * churn)
+    kept = first[n_churn:]
+    added = [make_job(companies[i % n_companies], n_jobs + i, rng) for i in range(n_churn)]
+    return companies, first, kept + added
+
+
+def run_engine(engine: str, companies: List[CompanyConfig], first: List[Job], second: List[Job]) -> Tuple[float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db", profile="ingest")
+        try:
+            t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            start = time.perf_counter()
+            persist_snapshot(db, t0, first, companies, engine=engine)
+            initial = time.perf_counter() - start
+
+            start = time.perf_counter()
+            persist_snapshot(db, t0 + timedelta(hours=6), second, companies, engine=engine)
+            steady = time.perf_counter() - start
+        finally:
+            db.close()
+    return initial, steady
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark snapshot ingest engines")
+    p.add_argument("--jobs", type=int, nargs="+", default=[10_000, 100_000], help="Snapshot sizes to benchmark")
+    p.add_argument("--companies", type=int, default=500, help="Number of synthetic companies")
+    p.add_argument("--churn", type=float, default=0.02, help="Fraction of jobs replaced in the second snapshot")
+    p.add_argument("--engines", nargs="+", choices=INGEST_ENGINES, default=list(INGEST_ENGINES))
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    print(f"{'jobs':>8}  {'engine':<8}  {'initial s':>10}  {'steady s':>10}  {'jobs/s':>10}")
+    for n_jobs in args.jobs:
+        companies, first, second = make_workload(n_jobs, args.companies, args.churn, args.seed)
+        for engine in args.engines:
+            initial, steady = run_engine(engine, companies, first, second)
+            rate = n_jobs / steady if steady > 0 else float("inf")
+            print(f"{n_jobs:>8}  {engine:<8}  {initial:>10.2f}  {steady:>10.2f}  {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark user writes while a bulk ingest runs.
+
+One thread ingests a synthetic snapshot into the catalog while another
+keeps committing small user writes (notifications), one ``BEGIN
+IMMEDIATE`` transaction each, the way the API's write service does. Two
+modes are compared:
+
+- ``shared``: the user-write connection opens the catalog writable, so
+  ``BEGIN IMMEDIATE`` also takes the catalog's write lock and queues
+  behind the ingest, as it did when both lived in one file.
+- ``split``: the connection opens the catalog read-only (as the write
+  service does), so it only locks the user database.
+
+Reports the ingest time and user write latency percentiles, the worst
+stall and the number of writes that failed (e.g. "database is locked").
+
+Usage:
+  python -m job_tracker.benchmarks.ingest_contention
+  python -m job_tracker.benchmarks.ingest_contention --jobs 50000 --busy-timeout 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from job_tracker.benchmarks.ingest import make_workload
+from job_tracker.db import CONNECTION_PRAGMAS, Database
+from job_tracker.persistence import persist_snapshot
+
+MODES = ("shared", "split")
+
+
+def run_mode(mode: str, db_path: Path, n_jobs: int, n_companies: int) -> Dict[str, float]:
+    companies, first, second = make_workload(n_jobs, n_companies, churn=0.1, seed=11)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with Database(db_path, profile="ingest") as db:
+        persist_snapshot(db, start, first, companies)
+        user_id = db.create_user(f"bench-{mode}", "x")
+
+    writer = Database(db_path, catalog_read_only=(mode == "split"))
+    latencies: List[float] = []
+    errors = 0
+    ingest_done = threading.Event()
+    ingest_time = 0.0
+
+    def ingest() -> None:
+        nonlocal ingest_time
+        with Database(db_path, profile="ingest") as db:
+            t0 = time.perf_counter()
+            persist_snapshot(db, start + timedelta(days=1), second, companies)
+            ingest_time = time.perf_counter() - t0
+        ingest_done.set()
+
+    thread = threading.Thread(target=ingest)
+    thread.start()
+    i = 0
+    while not ingest_done.is_set():
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            writer.conn.execute("BEGIN IMMEDIATE")
+            with writer.deferred_commits():
+                writer.create_notification(user_id, "benchmark", f"Write {i}", "ingest contention benchmark")
+            writer.conn.commit()
+        except sqlite3.OperationalError:
+            if writer.conn.in_transaction:
+                writer.conn.rollback()
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+    thread.join()
+    writer.close()
+
+    latencies.sort()
+    return {
+        "ingest_s": ingest_time,
+        "writes": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else float("nan"),
+        "max_ms": latencies[-1] * 1000 if latencies else float("nan"),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark user writes during a bulk catalog ingest")
+    p.add_argument("--jobs", type=int, default=10_000)
+    p.add_argument("--companies", type=int, default=200)
+    p.add_argument("--busy-timeout", type=int, default=None, help="Override PRAGMA busy_timeout (ms)")
+    p.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = p.parse_args()
+
+    if args.busy_timeout is not None:
+        CONNECTION_PRAGMAS["busy_timeout"] = args.busy_timeout
+
+    print(f"{'mode':<8}  {'ingest s':>8}  {'writes':>7}  {'p50 ms':>8}  {'p99 ms':>8}  {'max ms':>8}  {'errors':>6}")
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            r = run_mode(mode, Path(tmp) / "catalog.db", args.jobs, args.companies)
+        print(
+            f"{mode:<8}  {r['ingest_s']:>8.2f}  {r['writes']:>7.0f}  {r['p50_ms']:>8.2f}  "
+            f"{r['p99_ms']:>8.2f}  {r['max_ms']:>8.1f}  {r['errors']:>6.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
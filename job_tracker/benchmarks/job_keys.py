@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Benchmark integer ``job_key`` joins against the old text ``job_id`` keys.
+
+Builds a synthetic catalog (two snapshots with some churn), then a copy
+with the catalog tables rebuilt the way they were before migration 8:
+``jobs`` keyed by its 24-character ``job_id`` and ``job_versions``,
+``snapshot_membership`` and ``jobs_current`` referencing it. Reports the
+on-disk size of each table and index (from ``dbstat``) and the median time
+of the catalog joins used by the API, analytics and reports on both.
+
+Usage:
+  python -m job_tracker.benchmarks.job_keys
+  python -m job_tracker.benchmarks.job_keys --jobs 200000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from job_tracker.benchmarks.ingest import make_workload
+from job_tracker.db import Database
+from job_tracker.persistence import persist_snapshot
+
+CATALOG_TABLES = ("jobs", "job_versions", "snapshot_membership", "jobs_current")
+
+# ``{key}`` is the join column: job_key, or job_id in the text-keyed copy.
+JOIN_QUERIES: List[Tuple[str, str]] = [
+    (
+        "search page",
+        """
+        SELECT j.job_id, v.company_name, v.title, v.location, v.extra
+        FROM jobs j JOIN jobs_current v ON v.{key} = j.{key}
+        WHERE j.active = 1 ORDER BY j.last_seen DESC LIMIT 50
+        """,
+    ),
+    (
+        "active by sector",
+        """
+        SELECT v.sector, COUNT(*) FROM jobs j JOIN jobs_current v ON v.{key} = j.{key}
+        WHERE j.active = 1 GROUP BY v.sector
+        """,
+    ),
+    (
+        "company versions",
+        """
+        SELECT j.company_id, COUNT(*) FROM job_versions v JOIN jobs j ON j.{key} = v.{key}
+        GROUP BY j.company_id
+        """,
+    ),
+    (
+        "snapshot members",
+        """
+        SELECT c.name, COUNT(*) FROM snapshot_jobs sj
+        JOIN jobs j ON j.{key} = sj.{key}
+        JOIN companies c ON c.id = j.company_id
+        WHERE sj.snapshot_id = (SELECT MAX(snapshot_id) FROM snapshots)
+        GROUP BY c.name
+        """,
+    ),
+    (
+        "new-grad share",
+        """
+        SELECT j.company_id,
+               COUNT(DISTINCT CASE WHEN sj.is_new_grad = 1 THEN j.{key} END),
+               COUNT(DISTINCT j.{key})
+        FROM jobs j JOIN snapshot_jobs sj ON sj.{key} = j.{key}
+        GROUP BY j.company_id
+        """,
+    ),
+]
+
+_TEXT_KEYED_TABLES = """
+CREATE TABLE jobs_old (
+    job_id TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    removed_at INTEGER,
+    active INTEGER NOT NULL DEFAULT 1
+);
+INSERT INTO jobs_old
+SELECT job_id, company_id, url, source, first_seen, last_seen, removed_at, active
+FROM jobs ORDER BY job_key;
+
+CREATE TABLE job_versions_old (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT,
+    remote INTEGER,
+    extra TEXT,
+    sector TEXT
+);
+INSERT INTO job_versions_old
+SELECT v.version_id, j.job_id, v.timestamp, v.title, v.location, v.remote, v.extra, v.sector
+FROM job_versions v JOIN jobs j ON j.job_key = v.job_key ORDER BY v.version_id;
+
+CREATE TABLE snapshot_membership_old (
+    membership_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    version_id INTEGER NOT NULL,
+    is_new_grad INTEGER NOT NULL,
+    first_snapshot_id INTEGER NOT NULL,
+    last_snapshot_id INTEGER NOT NULL
+);
+INSERT INTO snapshot_membership_old
+SELECT m.membership_id, j.job_id, m.version_id, m.is_new_grad, m.first_snapshot_id, m.last_snapshot_id
+FROM snapshot_membership m JOIN jobs j ON j.job_key = m.job_key ORDER BY m.membership_id;
+
+CREATE TABLE jobs_current_old (
+    job_id TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    company_name TEXT NOT NULL,
+    version_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT,
+    remote INTEGER,
+    sector TEXT,
+    extra TEXT,
+    is_new_grad INTEGER NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 1,
+    content_hash TEXT
+);
+INSERT INTO jobs_current_old
+SELECT j.job_id, v.company_id, v.company_name, v.version_id, v.title, v.location, v.remote,
+       v.sector, v.extra, v.is_new_grad, v.active, v.content_hash
+FROM jobs_current v JOIN jobs j ON j.job_key = v.job_key ORDER BY j.job_id;
+
+DROP VIEW snapshot_jobs;
+DROP TABLE jobs_current;
+DROP TABLE snapshot_membership;
+DROP TABLE job_versions;
+DROP TABLE jobs;
+ALTER TABLE jobs_old RENAME TO jobs;
+ALTER TABLE job_versions_old RENAME TO job_versions;
+ALTER TABLE snapshot_membership_old RENAME TO snapshot_membership;
+ALTER TABLE jobs_current_old RENAME TO jobs_current;
+
+CREATE INDEX idx_jobs_active_last_seen ON jobs(active, last_seen);
+CREATE INDEX idx_jobs_company_active ON jobs(company_id, active);
+CREATE INDEX idx_job_versions_job_ts ON job_versions(job_id, timestamp);
+CREATE INDEX idx_jobs_current_company ON jobs_current(company_id, active);
+CREATE INDEX idx_jobs_current_active_sector ON jobs_current(active, sector);
+CREATE INDEX idx_snapshot_membership_job ON snapshot_membership(job_id, last_snapshot_id);
+CREATE INDEX idx_snapshot_membership_last ON snapshot_membership(last_snapshot_id, first_snapshot_id);
+CREATE INDEX idx_snapshot_membership_version ON snapshot_membership(version_id);
+CREATE INDEX idx_jobs_current_version ON jobs_current(version_id);
+
+CREATE VIEW snapshot_jobs AS
+SELECT s.snapshot_id, m.job_id, m.version_id, m.is_new_grad
+FROM snapshot_membership m
+JOIN snapshots s ON s.snapshot_id BETWEEN m.first_snapshot_id AND m.last_snapshot_id;
+"""
+
+
+def build_db(path: Path, n_jobs: int, n_companies: int, churn: float) -> None:
+    companies, first, second = make_workload(n_jobs, n_companies, churn, seed=7)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with Database(path, profile="ingest") as db:
+        persist_snapshot(db, start, first, companies)
+        persist_snapshot(db, start + timedelta(days=1), second, companies)
+
+
+def build_text_keyed(src: Path, dst: Path) -> None:
+    """Copy ``src`` with the catalog keyed by ``job_id`` as before migration 8."""
+    conn = sqlite3.connect(src)
+    conn.execute("VACUUM INTO ?", (str(dst),))
+    conn.close()
+    conn = sqlite3.connect(dst)
+    conn.execute("PRAGMA foreign_keys=OFF")
+    conn.executescript(_TEXT_KEYED_TABLES)
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def object_sizes(path: Path) -> Dict[str, int]:
+    """Bytes per catalog table and index, from ``dbstat``."""
+    conn = sqlite3.connect(path)
+    placeholders = ",".join("?" for _ in CATALOG_TABLES)
+    rows = conn.execute(
+        f"""
+        SELECT m.name, SUM(d.pgsize)
+        FROM sqlite_master m JOIN dbstat d ON d.name = m.name
+        WHERE m.tbl_name IN ({placeholders}) AND m.type IN ('table', 'index')
+        GROUP BY m.name
+        """,
+        CATALOG_TABLES,
+    ).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def time_queries(path: Path, key: str, repeat: int) -> Dict[str, float]:
+    """Median seconds per join query, after one warm-up run."""
+    conn = sqlite3.connect(path)
+    results = {}
+    for name, sql in JOIN_QUERIES:
+        sql = sql.format(key=key)
+        conn.execute(sql).fetchall()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            times.append(time.perf_counter() - start)
+        results[name] = statistics.median(times)
+    conn.close()
+    return results
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compare integer job_key joins with text job_id joins")
+    p.add_argument("--jobs", type=int, default=50_000)
+    p.add_argument("--companies", type=int, default=200)
+    p.add_argument("--churn", type=float, default=0.1)
+    p.add_argument("--repeat", type=int, default=10)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        keyed = Path(tmp) / "job_key.db"
+        text = Path(tmp) / "job_id.db"
+        build_db(keyed, args.jobs, args.companies, args.churn)
+        conn = sqlite3.connect(keyed)
+        conn.execute("VACUUM")
+        conn.close()
+        build_text_keyed(keyed, text)
+
+        before, after = object_sizes(text), object_sizes(keyed)
+        print(f"{'table/index':<34}  {'job_id KB':>10}  {'job_key KB':>10}")
+        for name in sorted(set(before) | set(after)):
+            print(f"{name:<34}  {before.get(name, 0) / 1024:>10.0f}  {after.get(name, 0) / 1024:>10.0f}")
+        print(f"{'catalog total':<34}  {sum(before.values()) / 1024:>10.0f}  {sum(after.values()) / 1024:>10.0f}")
+        print(f"{'file':<34}  {text.stat().st_size / 1024:>10.0f}  {keyed.stat().st_size / 1024:>10.0f}")
+        print()
+
+        slow, fast = time_queries(text, "job_id", args.repeat), time_queries(keyed, "job_key", args.repeat)
+        print(f"{'join':<20}  {'job_id ms':>10}  {'job_key ms':>10}  {'speedup':>8}")
+        for name, _ in JOIN_QUERIES:
+            print(f"{name:<20}  {slow[name] * 1000:>10.2f}  {fast[name] * 1000:>10.2f}  {slow[name] / fast[name]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent small write transactions.
+
+Many threads each create notifications, one transaction per write, the
+way API mutations do. Two modes are compared:
+
+- ``direct``: every thread has its own connection and commits on its own,
+  so the threads contend for SQLite's write lock.
+- ``writer``: every write goes through one ``WriteService``, which
+  serializes them on a single connection and commits them in groups.
+
+Reports transactions per second, commit latency percentiles and the
+number of writes that failed (e.g. "database is locked").
+
+Usage:
+  python -m job_tracker.benchmarks.write_contention
+  python -m job_tracker.benchmarks.write_contention --threads 32 --writes 200 --synchronous NORMAL
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from job_tracker.db import CONNECTION_PRAGMAS, USER_DB_PRAGMAS, Database
+from job_tracker.writer import WriteService
+
+MODES = ("direct", "writer")
+
+
+def _write(db: Database, user_id: int, i: int) -> int:
+    return db.create_notification(user_id, "benchmark", f"Write {i}", "group commit benchmark")
+
+
+def run_mode(mode: str, db_path: Path, threads: int, writes: int) -> Dict[str, float]:
+    with Database(db_path) as db:
+        user_id = db.create_user(f"bench-{mode}-{time.time_ns()}", "x")
+
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    writer = WriteService(db_path) if mode == "writer" else None
+    local = threading.local()
+
+    def submit(i: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            if writer is not None:
+                writer.run(_write, user_id, i)
+            else:
+                db = getattr(local, "db", None)
+                if db is None:
+                    db = local.db = Database(db_path)
+                _write(db, user_id, i)
+        except sqlite3.Error:
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(submit, range(threads * writes)))
+    elapsed = time.perf_counter() - start
+    commits = writer.commits if writer is not None else len(latencies)
+    if writer is not None:
+        writer.close()
+
+    latencies.sort()
+    return {
+        "tps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else float("nan"),
+        "commits": commits,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark direct commits vs the group-commit write service")
+    p.add_argument("--threads", type=int, default=16)
+    p.add_argument("--writes", type=int, default=200, help="Writes per thread")
+    p.add_argument("--synchronous", default=None, help="Override the user database's PRAGMA synchronous (e.g. NORMAL)")
+    p.add_argument("--busy-timeout", type=int, default=None, help="Override PRAGMA busy_timeout (ms)")
+    p.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = p.parse_args()
+
+    if args.synchronous:
+        USER_DB_PRAGMAS["synchronous"] = args.synchronous
+    if args.busy_timeout is not None:
+        CONNECTION_PRAGMAS["busy_timeout"] = args.busy_timeout
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "writes.db"
+        print(f"{'mode':<8}  {'tx/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}  {'commits':>8}  {'errors':>7}")
+        for mode in args.modes:
+            r = run_mode(mode, db_path, args.threads, args.writes)
+            print(
+                f"{mode:<8}  {r['tps']:>8.0f}  {r['p50_ms']:>8.2f}  {r['p99_ms']:>8.2f}  "
+                f"{r['commits']:>8.0f}  {r['errors']:>7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Content-addressed, compressed storage for large ``extra`` fields.
+
+Postings carry multi-kilobyte description fields (``content``,
+``description``, ``descriptionPlain``, ...) that rarely change between
+versions. Instead of storing them inline in every ``job_versions`` and
+``jobs_current`` row, ``pack_extra`` moves each large top-level value into
+the ``blobs`` table, zlib-compressed and keyed by a hash of its content,
+and leaves a ``{"$blob": "<key>"}`` reference in the stored JSON. Identical
+text is stored once however many versions share it.
+
+Readers that only need the small metadata fields (listings) use the
+stored JSON as is, dropping references with ``strip_blob_refs``; views
+that need the full text call ``hydrate_extra``, which fetches and
+decompresses only the referenced blobs. Search never reads the stored
+JSON: ``search_columns`` derives ``jobs_current``'s keyword text and
+filter columns from the unpacked ``extra`` at ingest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Top-level extra values whose JSON encoding is at least this long are
+# moved to the blob store.
+BLOB_MIN_CHARS = 512
+
+BLOB_REF = "$blob"
+
+# Extra keys the job search filters on, copied to ``jobs_current``
+# columns of the same name.
+SEARCH_FILTER_KEYS = ("experience_level", "job_type")
+
+
+def blob_key(payload: str) -> str:
+    """Return the content key for a serialized value (32 hex characters)."""
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_REF in value
+
+
+def pack_extra(extra: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, bytes]]:
+    """Serialize ``extra`` with large values replaced by blob references.
+
+    Returns:
+        ``(extra_json, blobs)`` where ``blobs`` maps each referenced key to
+        its compressed payload, ready for ``Database.put_blobs``.
+    """
+    if not extra:
+        return "{}", {}
+    packed: Dict[str, Any] = {}
+    blobs: Dict[str, bytes] = {}
+    for name, value in extra.items():
+        if isinstance(value, (str, list, dict)) and not is_blob_ref(value):
+            payload = json.dumps(value, ensure_ascii=False)
+            if len(payload) >= BLOB_MIN_CHARS:
+                key = blob_key(payload)
+                blobs[key] = zlib.compress(payload.encode("utf-8"))
+                value = {BLOB_REF: key}
+        packed[name] = value
+    return json.dumps(packed, ensure_ascii=False), blobs
+
+
+def search_columns(extra: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str], Optional[str]]:
+    """Return ``jobs_current``'s ``(search_text, experience_level, job_type)``.
+
+    ``search_text`` is ``extra`` serialized with every field inline, so
+    keyword search matches descriptions that the stored JSON only
+    references. Filter values are kept only when they are strings.
+    """
+    extra = extra or {}
+    text = json.dumps(extra, ensure_ascii=False) if extra else ""
+    level, job_type = (
+        extra.get(key) if isinstance(extra.get(key), str) else None for key in SEARCH_FILTER_KEYS
+    )
+    return text, level, job_type
+
+
+def blob_refs(extra: Dict[str, Any]) -> Dict[str, str]:
+    """Return ``{field: key}`` for the blob references in ``extra``."""
+    return {name: value[BLOB_REF] for name, value in extra.items() if is_blob_ref(value)}
+
+
+def strip_blob_refs(extra: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``extra`` without its blob-backed fields."""
+    return {name: value for name, value in extra.items() if not is_blob_ref(value)}
+
+
+def load_blobs(conn: sqlite3.Connection, keys: Iterable[str]) -> Dict[str, Any]:
+    """Fetch and decode blobs by key; missing keys are omitted."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    placeholders = ",".join("?" for _ in keys)
+    rows = conn.execute(f"SELECT hash, data FROM blobs WHERE hash IN ({placeholders})", keys).fetchall()
+    return {row[0]: json.loads(zlib.decompress(row[1]).decode("utf-8")) for row in rows}
+
+
+def hydrate_extra(conn: sqlite3.Connection, extra_json: Optional[str]) -> Dict[str, Any]:
+    """Parse stored ``extra`` JSON and inline any blob-backed fields.
+
+    Unparseable JSON yields an empty dict, matching how the API routes
+    treat it. A reference whose blob is missing is dropped.
+    """
+    if not extra_json:
+        return {}
+    try:
+        extra = json.loads(extra_json)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(extra, dict):
+        return {}
+    refs = blob_refs(extra)
+    if not refs:
+        return extra
+    values = load_blobs(conn, refs.values())
+    hydrated = strip_blob_refs(extra)
+    for name, key in refs.items():
+        if key in values:
+            hydrated[name] = values[key]
+    return {name: hydrated[name] for name in extra if name in hydrated}
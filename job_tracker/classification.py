@@ -0,0 +1,83 @@
+"""
+Cached new-grad classification for ingest.
+
+Every run sees almost the same postings as the last one, so classifying
+each job from scratch (``diff_engine.classify_new_grad``) repeats work
+whose answer is already known. ``classify_jobs`` looks each job up in
+the ``classification_cache`` table by ``classifier_input_hash`` (a digest
+of the title, scanned text and metadata the classifier reads) and the
+current ``CLASSIFIER_VERSION``, and only classifies the misses. The cost
+of a run is then proportional to new or changed postings.
+
+When the rules change, bumping ``CLASSIFIER_VERSION`` turns every cached
+row into a miss: jobs are reclassified lazily as they are next ingested
+and their rows overwritten. Rows record when they were last used (at
+most once a day, so hits don't rewrite the table every run); maintenance
+deletes rows of older versions and rows unused for a while.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from .db import Database, to_epoch
+from .diff_engine import CLASSIFIER_VERSION, classifier_input_hash, classify_many
+from .models import Job
+
+# Hits whose last_used is older than this are touched again.
+TOUCH_AFTER_SECONDS = 24 * 3600
+
+
+CacheRow = Tuple[str, int, bool, List[str], int]
+
+
+def classify_jobs(
+    db: Database, jobs: Iterable[Job], now: datetime, processes: int = 0
+) -> Dict[str, Tuple[bool, List[str]]]:
+    """Return ``job_id -> (is_new_grad, reasons)``, reusing cached results.
+
+    Like ``lookup_classifications``, but writes the cache rows at once.
+    They are not committed: the next commit on ``db`` does that, so they
+    are only atomic with the caller's writes if nothing commits between.
+    """
+    results, cache_rows = lookup_classifications(db, jobs, now, processes)
+    db.put_classifications(cache_rows)
+    return results
+
+
+def lookup_classifications(
+    db: Database, jobs: Iterable[Job], now: datetime, processes: int = 0
+) -> Tuple[Dict[str, Tuple[bool, List[str]]], List[CacheRow]]:
+    """Classify ``jobs`` through the cache without writing to it.
+
+    Misses are classified together by ``classify_many`` (over
+    ``processes`` worker processes if > 1).
+
+    Returns:
+        ``(results, cache_rows)``: ``job_id -> (is_new_grad, reasons)``,
+        and the new results and touched hits to store with
+        ``Database.put_classifications``. The staged ingest passes them
+        to ``merge_staged_snapshot``, which writes them in its
+        transaction.
+    """
+    keyed = [(job, classifier_input_hash(job)) for job in jobs]
+    cached = db.get_classifications({key for _, key in keyed}, CLASSIFIER_VERSION)
+    epoch = to_epoch(now)
+
+    writes: Dict[str, CacheRow] = {}
+    misses: Dict[str, Job] = {}
+    for job, key in keyed:
+        hit = cached.get(key)
+        if hit is None:
+            misses.setdefault(key, job)
+        elif hit[2] < epoch - TOUCH_AFTER_SECONDS and key not in writes:
+            flag, reasons, _ = hit
+            writes[key] = (key, CLASSIFIER_VERSION, flag, reasons, epoch)
+
+    fresh = classify_many(misses.values(), processes=processes, dedupe=False)
+    for key, (flag, reasons) in zip(misses, fresh):
+        cached[key] = (flag, reasons, epoch)
+        writes[key] = (key, CLASSIFIER_VERSION, flag, reasons, epoch)
+
+    return {job.job_id: cached[key][:2] for job, key in keyed}, list(writes.values())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Move cold catalog history to the archive file.
+
+Membership intervals and superseded versions older than ``--after-days``
+move to ``<db>.archive.db`` (or ``--archive``), and the current state of
+jobs removed before then is dropped unless a user references the job.
+Batches are transactional, so the command can be interrupted and rerun.
+See ``job_tracker.archive`` for details.
+
+Usage::
+
+    python -m job_tracker.cli.archive --db live_jobs.db
+    python -m job_tracker.cli.archive --after-days 30 --archive /data/live_jobs.archive.db
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from job_tracker.archive import ArchivePolicy, archive_cold_rows
+from job_tracker.db import Database
+
+
+def main() -> None:
+    defaults = ArchivePolicy()
+    p = argparse.ArgumentParser(description="Move cold catalog history to the archive file")
+    p.add_argument("--db", default="live_jobs.db", help="SQLite DB path")
+    p.add_argument("--users-db", default=None, help="User database path (default: <db>.users.db)")
+    p.add_argument("--archive", default=None, help="Archive DB path (default: <db>.archive.db)")
+    p.add_argument("--after-days", type=int, default=defaults.after_days,
+                   help="Archive history older than this")
+    p.add_argument("--batch-size", type=int, default=defaults.batch_size, help="Rows per transaction")
+    args = p.parse_args()
+
+    policy = ArchivePolicy(after_days=args.after_days, batch_size=args.batch_size)
+    with Database(Path(args.db), users_path=Path(args.users_db) if args.users_db else None) as db:
+        report = archive_cold_rows(db, policy, archive_path=Path(args.archive) if args.archive else None)
+    print(f"[archive] {report.summary()}")
+
+
+if __name__ == "__main__":
+    main()
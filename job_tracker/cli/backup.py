@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Back up the job tracker databases while they are in use.
+
+Copies the catalog, the user database and (if it exists) the archive
+with the SQLite backup API: a consistent snapshot of each file, copied a
+few pages at a time so the collector and API keep running. Each copy is
+verified before it replaces the oldest one. See ``job_tracker.backup``
+for details.
+
+Usage::
+
+    python -m job_tracker.cli.backup --db live_jobs.db --dest backups/
+    python -m job_tracker.cli.backup --keep 14 --users-keep 60 --verify full
+    python -m job_tracker.cli.backup --pages-per-step 200 --sleep 0.05   # gentler on a busy disk
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import replace
+from pathlib import Path
+
+from job_tracker.archive import ARCHIVE_SCHEMA_NAME, attach_archive
+from job_tracker.backup import DEFAULT_POLICIES, VERIFY_MODES, BackupError, backup_all
+from job_tracker.db import USER_SCHEMA_NAME, Database
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Back up the job tracker databases with the SQLite backup API")
+    p.add_argument("--db", default="live_jobs.db", help="SQLite DB path")
+    p.add_argument("--users-db", default=None, help="User database path (default: <db>.users.db)")
+    p.add_argument("--archive", default=None, help="Archive DB path (default: <db>.archive.db)")
+    p.add_argument("--no-archive", action="store_true", help="Skip the archive file")
+    p.add_argument("--dest", default="backups", help="Directory for the copies")
+    p.add_argument("--pages-per-step", type=int, default=None, help="Pages copied per step")
+    p.add_argument("--sleep", type=float, default=None, help="Seconds to pause between steps")
+    p.add_argument("--keep", type=int, default=DEFAULT_POLICIES["main"].keep,
+                   help="Catalog copies to keep")
+    p.add_argument("--users-keep", type=int, default=DEFAULT_POLICIES[USER_SCHEMA_NAME].keep,
+                   help="User database copies to keep")
+    p.add_argument("--archive-keep", type=int, default=DEFAULT_POLICIES[ARCHIVE_SCHEMA_NAME].keep,
+                   help="Archive copies to keep")
+    p.add_argument("--verify", choices=VERIFY_MODES, default=None,
+                   help="Verification for every file (default: quick, full for the user database)")
+    args = p.parse_args()
+
+    keep = {"main": args.keep, USER_SCHEMA_NAME: args.users_keep, ARCHIVE_SCHEMA_NAME: args.archive_keep}
+    policies = {}
+    for schema, policy in DEFAULT_POLICIES.items():
+        policy = replace(policy, keep=keep[schema])
+        if args.pages_per_step is not None:
+            policy = replace(policy, pages_per_step=args.pages_per_step)
+        if args.sleep is not None:
+            policy = replace(policy, sleep=args.sleep)
+        if args.verify is not None:
+            policy = replace(policy, verify=args.verify)
+        policies[schema] = policy
+
+    users_path = Path(args.users_db) if args.users_db else None
+    with Database(Path(args.db), profile="api-read", users_path=users_path) as db:
+        if not args.no_archive:
+            attach_archive(db, Path(args.archive) if args.archive else None)
+        try:
+            results = backup_all(db, Path(args.dest), policies)
+        except BackupError as exc:
+            raise SystemExit(f"[backup] verification failed: {exc}")
+    for result in results:
+        print(f"[backup] {result.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Check that hot queries are served by indexes.
+
+Runs ``EXPLAIN QUERY PLAN`` for each query in
+``job_tracker.query_plans.HOT_QUERIES`` and reports any plan step that
+falls back to a full table scan. Exits non-zero if one does. The test
+suite runs the same check on a fresh database
+(``tests/test_query_plans.py``); this command is for checking a live
+one.
+
+Usage::
+
+    python -m job_tracker.cli.check_query_plans              # fresh temp DB
+    python -m job_tracker.cli.check_query_plans --db live_jobs.db
+    python -m job_tracker.cli.check_query_plans --verbose    # print every plan
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from job_tracker.db import Database
+from job_tracker.query_plans import HOT_QUERIES, full_scans
+
+
+def check(db_path: Path, verbose: bool = False) -> int:
+    """Check every hot query against ``db_path``; return the failure count."""
+    with Database(db_path) as db:
+        failures = 0
+        for query in HOT_QUERIES:
+            plan, offending = full_scans(db.conn, query)
+            status = "FAIL" if offending else "ok"
+            print(f"[{status:>4}] {query.name}")
+            if offending or verbose:
+                for detail in plan:
+                    print(f"         {detail}")
+            failures += bool(offending)
+    return failures
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Fail if a hot query plans a full table scan")
+    p.add_argument("--db", help="Database to check (default: a fresh temporary database)")
+    p.add_argument("--verbose", action="store_true", help="Print the plan for every query")
+    args = p.parse_args()
+
+    if args.db:
+        failures = check(Path(args.db), verbose=args.verbose)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            failures = check(Path(tmp) / "plans.db", verbose=args.verbose)
+
+    if failures:
+        print(f"\n{failures} query plan(s) regressed to a full table scan.")
+        sys.exit(1)
+    print(f"\nAll {len(HOT_QUERIES)} hot queries use indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,9 @@
 """
 Send an email digest of new-grad job changes.
 
-Works with current schema:
-- snapshots(snapshot_id, timestamp)
-- snapshot_jobs(snapshot_id, job_id, version_id, is_new_grad)
-- job_versions(version_id, job_id, timestamp, title, location, remote, extra)
-- jobs(job_id, company_id, url, source, ...)
-- companies(id, slug, name, source)
+Changes come from ``job_tracker.snapshot_diff``: the new-grad jobs of the
+two snapshots are compared, so a job that became new-grad is listed as
+NEW and one that stopped being new-grad as REMOVED.
 
 Adds a tiny digests table to checkpoint the last snapshot emailed.
 """
@@ -20,7 +17,12 @@ import smtplib
 import sqlite3
 from datetime import datetime, timezone
 from email.message import EmailMessage
-from typing import List, Tuple
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from job_tracker.archive import attach_archive
+from job_tracker.db import Database, format_timestamp
+from job_tracker.snapshot_diff import CHANGE_KINDS, JobChange, diff_snapshots
 
 
 def ensure_digest_table(conn: sqlite3.Connection) -> None:
@@ -50,7 +52,7 @@ def get_latest_snapshot(conn: sqlite3.Connection) -> Tuple[int, str]:
     ).fetchone()
     if not row:
         raise SystemExit("No snapshots found. Run collection at least once.")
-    return int(row[0]), str(row[1])
+    return int(row[0]), format_timestamp(row[1])
 
 
 def get_previous_snapshot(conn: sqlite3.Connection, snapshot_id: int) -> int | None:
@@ -61,70 +63,21 @@ def get_previous_snapshot(conn: sqlite3.Connection, snapshot_id: int) -> int | N
     return int(row[0]) if row else None
 
 
-def diff_snapshot_job_ids(conn: sqlite3.Connection, prev_id: int, cur_id: int):
-    prev = {r[0]: r[1] for r in conn.execute(
-        "SELECT job_id, version_id FROM snapshot_jobs WHERE snapshot_id=?",
-        (prev_id,),
-    ).fetchall()}
-    cur = {r[0]: r[1] for r in conn.execute(
-        "SELECT job_id, version_id FROM snapshot_jobs WHERE snapshot_id=?",
-        (cur_id,),
-    ).fetchall()}
-
-    new_ids = sorted([jid for jid in cur.keys() if jid not in prev])
-    removed_ids = sorted([jid for jid in prev.keys() if jid not in cur])
-    updated_ids = sorted([jid for jid in cur.keys() if jid in prev and cur[jid] != prev[jid]])
-
-    return new_ids, updated_ids, removed_ids
-
-
-def fetch_new_grad_rows(conn: sqlite3.Connection, snapshot_id: int, job_ids: List[str]):
-    if not job_ids:
-        return []
-
-    placeholders = ",".join(["?"] * len(job_ids))
-    query = f"""
-    SELECT
-        c.name as company,
-        v.title as title,
-        v.location as location,
-        v.remote as remote,
-        j.url as url,
-        v.timestamp as version_ts
-    FROM snapshot_jobs sj
-    JOIN job_versions v ON v.version_id = sj.version_id
-    JOIN jobs j ON j.job_id = sj.job_id
-    JOIN companies c ON c.id = j.company_id
-    WHERE sj.snapshot_id = ?
-      AND sj.is_new_grad = 1
-      AND sj.job_id IN ({placeholders})
-    ORDER BY c.name, v.title
-    """
-    return conn.execute(query, (snapshot_id, *job_ids)).fetchall()
-
-
-def format_digest(new_rows, updated_rows, removed_rows, prev_id, cur_id, cur_ts: str) -> str:
+def format_digest(changes: List[JobChange], prev_id, cur_id, cur_ts: str) -> str:
+    by_kind: Dict[str, List[JobChange]] = {kind: [] for kind in CHANGE_KINDS}
+    for change in changes:
+        by_kind[change.kind].append(change)
+
     lines = []
     lines.append(f"Job Tracker Digest")
     lines.append(f"Snapshots: {prev_id} -> {cur_id}   (latest at {cur_ts})")
-    lines.append("")
-    lines.append(f"NEW (new-grad): {len(new_rows)}")
-    for company, title, location, remote, url, _ in new_rows:
-        rflag = " [remote]" if remote else ""
-        lines.append(f"  + {company} — {title} — {location}{rflag}")
-        lines.append(f"    {url}")
-    lines.append("")
-    lines.append(f"UPDATED (new-grad): {len(updated_rows)}")
-    for company, title, location, remote, url, _ in updated_rows:
-        rflag = " [remote]" if remote else ""
-        lines.append(f"  ~ {company} — {title} — {location}{rflag}")
-        lines.append(f"    {url}")
-    lines.append("")
-    lines.append(f"REMOVED (new-grad): {len(removed_rows)}")
-    for company, title, location, remote, url, _ in removed_rows:
-        rflag = " [remote]" if remote else ""
-        lines.append(f"  - {company} — {title} — {location}{rflag}")
-        lines.append(f"    {url}")
+    for kind, marker in (("new", "+"), ("updated", "~"), ("removed", "-")):
+        lines.append("")
+        lines.append(f"{kind.upper()} (new-grad): {len(by_kind[kind])}")
+        for c in by_kind[kind]:
+            rflag = " [remote]" if c.remote else ""
+            lines.append(f"  {marker} {c.company} — {c.title} — {c.location}{rflag}")
+            lines.append(f"    {c.url}")
 
     return "\n".join(lines).strip() + "\n"
 
@@ -157,7 +110,9 @@ def main() -> None:
     p.add_argument("--dry-run", action="store_true", help="Print digest instead of sending email")
     args = p.parse_args()
 
-    conn = sqlite3.connect(args.db)
+    db = Database(Path(args.db))
+    attach_archive(db)
+    conn = db.conn
     ensure_digest_table(conn)
 
     latest_id, latest_ts = get_latest_snapshot(conn)
@@ -171,14 +126,14 @@ def main() -> None:
         # Compare last_end -> latest
         prev_id = last_end
 
-    new_ids, updated_ids, removed_ids = diff_snapshot_job_ids(conn, prev_id, latest_id)
+    changes = list(diff_snapshots(conn, prev_id, latest_id, new_grad=True, ordered=True))
+    counts = {kind: sum(1 for c in changes if c.kind == kind) for kind in CHANGE_KINDS}
 
-    new_rows = fetch_new_grad_rows(conn, latest_id, new_ids)
-    updated_rows = fetch_new_grad_rows(conn, latest_id, updated_ids)
-    removed_rows = fetch_new_grad_rows(conn, prev_id, removed_ids)
-
-    body = format_digest(new_rows, updated_rows, removed_rows, prev_id, latest_id, latest_ts)
-    subject = f"Job Tracker Digest: {len(new_rows)} new-grad new / {len(updated_rows)} updated / {len(removed_rows)} removed"
+    body = format_digest(changes, prev_id, latest_id, latest_ts)
+    subject = (
+        f"Job Tracker Digest: {counts['new']} new-grad new / {counts['updated']} updated / "
+        f"{counts['removed']} removed"
+    )
 
     if args.dry_run:
         print(body)
@@ -191,7 +146,7 @@ def main() -> None:
         (datetime.now(timezone.utc).isoformat(), prev_id, latest_id),
     )
     conn.commit()
-    conn.close()
+    db.close()
 
 
 if __name__ == "__main__":
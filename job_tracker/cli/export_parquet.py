@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Export job history to partitioned Parquet files for offline analytics.
+
+Each run appends the snapshots, membership, versions and blobs added since
+the previous export and rewrites the small companies/jobs tables,
+including history moved to the archive file if there is one. See
+``job_tracker.parquet_export`` for the layout. Requires pyarrow.
+
+Usage::
+
+    python -m job_tracker.cli.export_parquet --db live_jobs.db --out exports/parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from job_tracker.archive import attach_archive
+from job_tracker.db import Database
+from job_tracker.parquet_export import export_parquet
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Export job history to partitioned Parquet files")
+    p.add_argument("--db", default="live_jobs.db", help="SQLite DB path")
+    p.add_argument("--out", default="exports/parquet", help="Export directory")
+    args = p.parse_args()
+
+    with Database(Path(args.db), profile="api-read") as db:
+        attach_archive(db)
+        try:
+            report = export_parquet(db, Path(args.out))
+        except RuntimeError as exc:
+            print(f"Error: {exc}")
+            sys.exit(1)
+    print(f"[export] {report.summary()}")
+
+
+if __name__ == "__main__":
+    main()
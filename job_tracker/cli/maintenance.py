@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Apply retention and compaction to the job tracker database.
+
+Thins old snapshots down to daily and weekly anchors, compacts membership
+intervals and versions, prunes expired sessions, spent reset tokens, old
+read notifications and stale cached classifications, then returns free
+pages with incremental vacuum. See ``job_tracker.maintenance`` for details.
+
+Usage::
+
+    python -m job_tracker.cli.maintenance --db live_jobs.db
+    python -m job_tracker.cli.maintenance --keep-all-days 7 --keep-daily-days 60 --keep-weekly-days 730
+    python -m job_tracker.cli.maintenance --dry-run
+    python -m job_tracker.cli.maintenance --enable-incremental-vacuum   # one-off, rewrites the file
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from job_tracker.db import Database
+from job_tracker.maintenance import (
+    RetentionPolicy,
+    enable_incremental_vacuum,
+    plan_snapshot_thinning,
+    run_maintenance,
+)
+
+
+def main() -> None:
+    defaults = RetentionPolicy()
+    p = argparse.ArgumentParser(description="Apply retention and compaction to the job tracker database")
+    p.add_argument("--db", default="live_jobs.db", help="SQLite DB path")
+    p.add_argument("--users-db", default=None, help="User database path (default: <db>.users.db)")
+    p.add_argument("--archive", default=None, help="Archive DB path (default: <db>.archive.db)")
+    p.add_argument("--keep-all-days", type=int, default=defaults.keep_all_days,
+                   help="Keep every snapshot younger than this")
+    p.add_argument("--keep-daily-days", type=int, default=defaults.keep_daily_days,
+                   help="Keep one snapshot per day younger than this")
+    p.add_argument("--keep-weekly-days", type=int, default=defaults.keep_weekly_days,
+                   help="Keep one snapshot per week younger than this (default: forever)")
+    p.add_argument("--read-notification-days", type=int, default=defaults.read_notification_days,
+                   help="Delete read notifications older than this")
+    p.add_argument("--classification-cache-days", type=int, default=defaults.classification_cache_days,
+                   help="Delete cached classifications unused for this long")
+    p.add_argument("--batch-size", type=int, default=defaults.batch_size, help="Rows per transaction")
+    p.add_argument("--no-vacuum", action="store_true", help="Skip incremental vacuum")
+    p.add_argument("--dry-run", action="store_true", help="Only report which snapshots would be thinned")
+    p.add_argument("--enable-incremental-vacuum", action="store_true",
+                   help="Convert the database to auto_vacuum=INCREMENTAL (runs a full VACUUM)")
+    args = p.parse_args()
+
+    policy = RetentionPolicy(
+        keep_all_days=args.keep_all_days,
+        keep_daily_days=args.keep_daily_days,
+        keep_weekly_days=args.keep_weekly_days,
+        read_notification_days=args.read_notification_days,
+        classification_cache_days=args.classification_cache_days,
+        batch_size=args.batch_size,
+    )
+
+    with Database(Path(args.db), users_path=Path(args.users_db) if args.users_db else None) as db:
+        if args.dry_run:
+            doomed = plan_snapshot_thinning(db, policy, datetime.now(timezone.utc))
+            total = db.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            print(f"[maintenance] {len(doomed)} of {total} snapshots would be deleted")
+            return
+
+        if args.enable_incremental_vacuum:
+            converted = enable_incremental_vacuum(db)
+            print("[maintenance] auto_vacuum=INCREMENTAL " + ("enabled" if converted else "already enabled"))
+
+        report = run_maintenance(
+            db, policy, vacuum=not args.no_vacuum, archive_path=Path(args.archive) if args.archive else None
+        )
+
+    print(f"[maintenance] {report.summary()}")
+    for note in report.notes:
+        print(f"[maintenance] note: {note}")
+
+
+if __name__ == "__main__":
+    main()
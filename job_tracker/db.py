@@ -15,18 +15,26 @@ from __future__ import annotations
 
 import sqlite3
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, date
-from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, date, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
+from .blobs import hydrate_extra, pack_extra, search_columns
+from .models import content_hash
 
-SCHEMA = """
-PRAGMA foreign_keys = ON;
 
+# Catalog timestamps (runs, jobs, versions, snapshots) are stored as integer
+# Unix epoch seconds in UTC; convert with ``to_epoch``/``from_epoch``. User
+# tables keep the sqlite3 module's ISO-8601 text.
+#
+# This is the base layout the migrations start from. Its per-user tables
+# move to the user database (``USER_SCHEMA``) in ``_migrate_split_user_data``.
+SCHEMA = """
 CREATE TABLE IF NOT EXISTS runs (
     run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    started_at TIMESTAMP NOT NULL,
-    finished_at TIMESTAMP,
+    started_at INTEGER NOT NULL,
+    finished_at INTEGER,
     status TEXT NOT NULL, -- 'running' | 'ok' | 'error'
     companies_total INTEGER NOT NULL DEFAULT 0,
     companies_succeeded INTEGER NOT NULL DEFAULT 0,
@@ -38,7 +46,7 @@ CREATE TABLE IF NOT EXISTS runs (
 CREATE TABLE IF NOT EXISTS run_errors (
     error_id INTEGER PRIMARY KEY AUTOINCREMENT,
     run_id INTEGER NOT NULL,
-    created_at TIMESTAMP NOT NULL,
+    created_at INTEGER NOT NULL,
     company_slug TEXT,
     company_name TEXT,
     ats TEXT,
@@ -53,14 +61,17 @@ CREATE TABLE IF NOT EXISTS companies (
     source TEXT NOT NULL
 );
 
+-- Base shapes of the catalog tables. Migration 8 (``_migrate_job_keys``)
+-- rebuilds jobs, job_versions, snapshot_membership and jobs_current
+-- around an INTEGER ``job_key``; ``job_id`` stays the external identifier.
 CREATE TABLE IF NOT EXISTS jobs (
     job_id TEXT PRIMARY KEY,
     company_id INTEGER NOT NULL,
     url TEXT NOT NULL,
     source TEXT NOT NULL,
-    first_seen TIMESTAMP NOT NULL,
-    last_seen TIMESTAMP NOT NULL,
-    removed_at TIMESTAMP,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    removed_at INTEGER,
     active INTEGER NOT NULL DEFAULT 1,
     FOREIGN KEY(company_id) REFERENCES companies(id)
 );
@@ -68,7 +79,7 @@ CREATE TABLE IF NOT EXISTS jobs (
 CREATE TABLE IF NOT EXISTS job_versions (
     version_id INTEGER PRIMARY KEY AUTOINCREMENT,
     job_id TEXT NOT NULL,
-    timestamp TIMESTAMP NOT NULL,
+    timestamp INTEGER NOT NULL,
     title TEXT NOT NULL,
     location TEXT,
     remote INTEGER,
@@ -76,9 +87,16 @@ CREATE TABLE IF NOT EXISTS job_versions (
     FOREIGN KEY(job_id) REFERENCES jobs(job_id)
 );
 
+-- Large extra fields, zlib-compressed and keyed by content hash; versions
+-- reference them as {"$blob": hash} (see blobs.py).
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS snapshots (
     snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp TIMESTAMP NOT NULL,
+    timestamp INTEGER NOT NULL,
     run_id INTEGER,
     FOREIGN KEY(run_id) REFERENCES runs(run_id)
 );
@@ -94,6 +112,26 @@ CREATE TABLE IF NOT EXISTS snapshot_jobs (
     FOREIGN KEY(version_id) REFERENCES job_versions(version_id)
 );
 
+-- Current state of each job (latest version + latest classification),
+-- maintained at ingest so read paths don't scan job_versions.
+CREATE TABLE IF NOT EXISTS jobs_current (
+    job_id TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    company_name TEXT NOT NULL,
+    version_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT,
+    remote INTEGER,
+    sector TEXT,
+    extra TEXT,
+    is_new_grad INTEGER NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 1,
+    content_hash TEXT,
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id),
+    FOREIGN KEY(company_id) REFERENCES companies(id),
+    FOREIGN KEY(version_id) REFERENCES job_versions(version_id)
+);
+
 -- Users
 CREATE TABLE IF NOT EXISTS users (
     user_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -370,19 +408,616 @@ CREATE TABLE IF NOT EXISTS password_reset_tokens (
 """
 
 
+# The user database: everything the API writes (accounts, sessions,
+# per-user collections, company notes and analytics). It is a separate
+# file attached to every connection as ``userdata`` (see ``Database``), so
+# its writes never wait on the collector's catalog write lock. Unqualified
+# table names resolve across both files. SQLite cannot enforce foreign
+# keys across files, so ``job_id`` and ``company_id`` columns here
+# reference the catalog by convention only.
+USER_SCHEMA_NAME = "userdata"
+
+USER_SCHEMA = """
+-- Users
+CREATE TABLE IF NOT EXISTS {schema}.users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE,
+    password_hash TEXT,
+    created_at TIMESTAMP NOT NULL,
+    last_login TIMESTAMP,
+    preferences TEXT
+);
+
+-- User profiles
+CREATE TABLE IF NOT EXISTS {schema}.user_profiles (
+    profile_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    full_name TEXT,
+    degree_type TEXT,
+    graduation_year INTEGER,
+    skills TEXT,
+    location_preference TEXT,
+    remote_preference INTEGER,
+    target_sectors TEXT,
+    resume_url TEXT,
+    notes TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- User sessions
+CREATE TABLE IF NOT EXISTS {schema}.user_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Saved jobs
+CREATE TABLE IF NOT EXISTS {schema}.saved_jobs (
+    saved_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    saved_at TIMESTAMP NOT NULL,
+    notes TEXT,
+    tags TEXT,
+    priority INTEGER DEFAULT 0,
+    deadline DATE,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    UNIQUE(user_id, job_id)
+);
+
+-- Applications
+CREATE TABLE IF NOT EXISTS {schema}.applications (
+    application_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    applied_at TIMESTAMP,
+    application_method TEXT,
+    application_url TEXT,
+    notes TEXT,
+    tags TEXT,
+    priority INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    resume_id INTEGER REFERENCES resumes(resume_id),
+    cover_letter_id INTEGER REFERENCES cover_letters(cover_letter_id),
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Application events
+CREATE TABLE IF NOT EXISTS {schema}.application_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    event_data TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(application_id) REFERENCES applications(application_id)
+);
+
+-- Interviews
+CREATE TABLE IF NOT EXISTS {schema}.interviews (
+    interview_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    interview_type TEXT NOT NULL,
+    scheduled_at TIMESTAMP,
+    duration_minutes INTEGER,
+    interviewer_name TEXT,
+    interviewer_email TEXT,
+    location TEXT,
+    notes TEXT,
+    preparation_notes TEXT,
+    follow_up_required INTEGER DEFAULT 0,
+    follow_up_date DATE,
+    status TEXT DEFAULT 'scheduled',
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(application_id) REFERENCES applications(application_id)
+);
+
+-- Offers
+CREATE TABLE IF NOT EXISTS {schema}.offers (
+    offer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL UNIQUE,
+    offer_date DATE NOT NULL,
+    salary_amount REAL,
+    salary_currency TEXT DEFAULT 'USD',
+    salary_period TEXT,
+    equity TEXT,
+    benefits TEXT,
+    start_date DATE,
+    decision_deadline DATE,
+    status TEXT DEFAULT 'pending',
+    notes TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(application_id) REFERENCES applications(application_id)
+);
+
+-- Tags
+CREATE TABLE IF NOT EXISTS {schema}.tags (
+    tag_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    color TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    UNIQUE(user_id, name)
+);
+
+-- Job tags
+CREATE TABLE IF NOT EXISTS {schema}.job_tags (
+    job_id TEXT NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY(job_id, tag_id),
+    FOREIGN KEY(tag_id) REFERENCES tags(tag_id)
+);
+
+-- Saved searches
+CREATE TABLE IF NOT EXISTS {schema}.saved_searches (
+    search_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    filters TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    last_run_at TIMESTAMP,
+    notification_enabled INTEGER DEFAULT 1,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Job recommendations
+CREATE TABLE IF NOT EXISTS {schema}.job_recommendations (
+    recommendation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    reason TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Company profiles
+CREATE TABLE IF NOT EXISTS {schema}.company_profiles (
+    company_id INTEGER PRIMARY KEY,
+    website TEXT,
+    description TEXT,
+    industry TEXT,
+    size TEXT,
+    headquarters TEXT,
+    founded_year INTEGER,
+    employee_count INTEGER,
+    linkedin_url TEXT,
+    glassdoor_url TEXT,
+    notes TEXT
+);
+
+-- Company notes
+CREATE TABLE IF NOT EXISTS {schema}.company_notes (
+    note_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    company_id INTEGER NOT NULL,
+    note_text TEXT NOT NULL,
+    rating INTEGER,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Company analytics
+CREATE TABLE IF NOT EXISTS {schema}.company_analytics (
+    analytics_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company_id INTEGER NOT NULL,
+    snapshot_date DATE NOT NULL,
+    total_jobs_posted INTEGER DEFAULT 0,
+    total_jobs_removed INTEGER DEFAULT 0,
+    avg_posting_duration_days REAL,
+    ghost_posting_rate REAL,
+    posting_frequency_per_month REAL,
+    removal_frequency_per_month REAL,
+    job_churn_rate REAL,
+    reliability_score REAL,
+    new_grad_friendly_score REAL,
+    metrics_json TEXT,
+    UNIQUE(company_id, snapshot_date)
+);
+
+-- User analytics
+CREATE TABLE IF NOT EXISTS {schema}.user_analytics (
+    analytics_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    computed_at TIMESTAMP NOT NULL,
+    total_applications INTEGER DEFAULT 0,
+    total_saved_jobs INTEGER DEFAULT 0,
+    applications_by_status TEXT,
+    success_rate REAL,
+    avg_response_time_days REAL,
+    top_companies TEXT,
+    top_sectors TEXT,
+    insights_json TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Market analytics
+CREATE TABLE IF NOT EXISTS {schema}.market_analytics (
+    analytics_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_date DATE NOT NULL,
+    sector_trends TEXT,
+    degree_compatibility TEXT,
+    company_reliability TEXT,
+    hiring_velocity TEXT,
+    insights_json TEXT
+);
+
+-- Notifications
+CREATE TABLE IF NOT EXISTS {schema}.notifications (
+    notification_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    related_job_id TEXT,
+    related_application_id INTEGER,
+    read INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(related_application_id) REFERENCES applications(application_id)
+);
+
+-- Notification preferences
+CREATE TABLE IF NOT EXISTS {schema}.notification_preferences (
+    user_id INTEGER PRIMARY KEY,
+    email_enabled INTEGER DEFAULT 1,
+    job_alerts INTEGER DEFAULT 1,
+    status_changes INTEGER DEFAULT 1,
+    reminders INTEGER DEFAULT 1,
+    deadlines INTEGER DEFAULT 1,
+    weekly_digest INTEGER DEFAULT 1,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Password reset tokens
+CREATE TABLE IF NOT EXISTS {schema}.password_reset_tokens (
+    token_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    token TEXT NOT NULL UNIQUE,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    used_at TIMESTAMP,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Resumes
+CREATE TABLE IF NOT EXISTS {schema}.resumes (
+    resume_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    file_url TEXT,
+    file_path TEXT,
+    version TEXT,
+    notes TEXT,
+    is_default INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Cover letters
+CREATE TABLE IF NOT EXISTS {schema}.cover_letters (
+    cover_letter_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    content TEXT,
+    file_url TEXT,
+    file_path TEXT,
+    version TEXT,
+    notes TEXT,
+    is_default INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+-- Application templates
+CREATE TABLE IF NOT EXISTS {schema}.application_templates (
+    template_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    application_method TEXT,
+    default_notes TEXT,
+    url_pattern TEXT,
+    resume_id INTEGER,
+    cover_letter_id INTEGER,
+    is_default INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(resume_id) REFERENCES resumes(resume_id),
+    FOREIGN KEY(cover_letter_id) REFERENCES cover_letters(cover_letter_id)
+);
+
+-- Share links
+CREATE TABLE IF NOT EXISTS {schema}.share_links (
+    share_id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    resource_type TEXT NOT NULL,
+    resource_id TEXT,
+    expires_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+"""
+
+# Tables in the user database.
+USER_TABLES: Tuple[str, ...] = (
+    "users",
+    "user_profiles",
+    "user_sessions",
+    "saved_jobs",
+    "applications",
+    "application_events",
+    "interviews",
+    "offers",
+    "tags",
+    "job_tags",
+    "saved_searches",
+    "job_recommendations",
+    "company_profiles",
+    "company_notes",
+    "company_analytics",
+    "user_analytics",
+    "market_analytics",
+    "notifications",
+    "notification_preferences",
+    "password_reset_tokens",
+    "resumes",
+    "cover_letters",
+    "application_templates",
+    "share_links",
+)
+
+
+# Secondary indexes, created by a schema migration so existing databases
+# pick them up too. Each one backs a query on a hot read
+# path; ``tests/test_query_plans.py`` verifies they are used (see
+# ``query_plans.py``).
+INDEXES: List[Tuple[str, str]] = [
+    # Catalog
+    ("idx_jobs_active_last_seen", "jobs(active, last_seen)"),
+    ("idx_jobs_company_active", "jobs(company_id, active)"),
+    ("idx_job_versions_job_ts", "job_versions(job_key, timestamp)"),
+    ("idx_jobs_current_company", "jobs_current(company_id, active)"),
+    ("idx_jobs_current_active_sector", "jobs_current(active, sector)"),
+    ("idx_snapshots_timestamp", "snapshots(timestamp)"),
+    ("idx_snapshot_membership_job", "snapshot_membership(job_key, last_snapshot_id)"),
+    ("idx_snapshot_membership_last", "snapshot_membership(last_snapshot_id, first_snapshot_id)"),
+    ("idx_snapshot_membership_version", "snapshot_membership(version_id)"),
+    ("idx_jobs_current_version", "jobs_current(version_id)"),
+    ("idx_run_errors_run", "run_errors(run_id)"),
+    # Users and sessions
+    ("idx_user_sessions_user", "user_sessions(user_id)"),
+    ("idx_user_sessions_expires", "user_sessions(expires_at)"),
+    ("idx_password_reset_tokens_user", "password_reset_tokens(user_id)"),
+    # Applications pipeline
+    ("idx_applications_user_updated", "applications(user_id, updated_at)"),
+    ("idx_applications_job", "applications(job_id)"),
+    ("idx_application_events_app", "application_events(application_id, created_at)"),
+    ("idx_interviews_app_scheduled", "interviews(application_id, scheduled_at)"),
+    ("idx_offers_app", "offers(application_id, offer_date)"),
+    # Per-user collections
+    ("idx_saved_jobs_user_saved", "saved_jobs(user_id, saved_at)"),
+    ("idx_saved_searches_user", "saved_searches(user_id, created_at)"),
+    ("idx_saved_searches_notify", "saved_searches(notification_enabled)"),
+    ("idx_notifications_user_read_created", "notifications(user_id, read, created_at)"),
+    ("idx_job_tags_tag", "job_tags(tag_id)"),
+    ("idx_job_recommendations_user", "job_recommendations(user_id, score)"),
+    ("idx_company_notes_company", "company_notes(company_id, created_at)"),
+    ("idx_resumes_user", "resumes(user_id, created_at)"),
+    ("idx_cover_letters_user", "cover_letters(user_id, created_at)"),
+    ("idx_application_templates_user", "application_templates(user_id)"),
+    ("idx_share_links_user", "share_links(user_id, created_at)"),
+]
+
+
+# Catalog columns holding epoch seconds (see ``to_epoch``).
+EPOCH_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("runs", "started_at"),
+    ("runs", "finished_at"),
+    ("run_errors", "created_at"),
+    ("jobs", "first_seen"),
+    ("jobs", "last_seen"),
+    ("jobs", "removed_at"),
+    ("job_versions", "timestamp"),
+    ("snapshots", "timestamp"),
+)
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """Convert a datetime, date, ISO-8601 string or number to epoch seconds.
+
+    Naive values are taken as UTC, which is also how SQLite's date
+    functions read them.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_epoch(value: Any) -> Optional[datetime]:
+    """Convert a stored catalog timestamp to an aware UTC datetime.
+
+    ISO-8601 text (databases not yet migrated) is accepted too.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def format_timestamp(value: Any) -> str:
+    """Format a stored catalog timestamp as ``YYYY-MM-DD HH:MM:SS`` (UTC).
+
+    This is the text layout timestamps were stored in before epoch
+    seconds; CSV exports and printed reports keep it. None gives ''.
+    """
+    ts = from_epoch(value)
+    return ts.strftime("%Y-%m-%d %H:%M:%S") if ts is not None else ""
+
+
+def encode_reasons(reasons: List[str]) -> str:
+    """Encode a classifier reasons list for ``classification_reasons``."""
+    return json.dumps(reasons, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_reasons(text: Optional[str]) -> Optional[List[str]]:
+    """Decode a stored reasons list; None stays None."""
+    return json.loads(text) if text is not None else None
+
+
+# Applied to every connection. WAL lets API readers proceed while the
+# collector writes; the busy timeout makes competing writers wait instead
+# of failing with "database is locked". auto_vacuum only takes effect on a
+# new, empty database (and must precede the switch to WAL); existing
+# databases are converted by ``maintenance.enable_incremental_vacuum``.
+CONNECTION_PRAGMAS: Dict[str, Any] = {
+    "auto_vacuum": "INCREMENTAL",
+    "foreign_keys": "ON",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 15_000,
+    "journal_size_limit": 64 * 1024 * 1024,
+}
+
+# Per-workload tuning layered on top of CONNECTION_PRAGMAS. Negative
+# cache_size values are in KiB.
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    # Collector/scheduler: large page cache for the merge, staging tables in RAM.
+    "ingest": {
+        "cache_size": -128 * 1024,
+        "temp_store": "MEMORY",
+        "mmap_size": 256 * 1024 * 1024,
+    },
+    # API request handlers: modest cache per connection, mmap for read-heavy scans.
+    "api-read": {
+        "cache_size": -16 * 1024,
+        "temp_store": "MEMORY",
+        "mmap_size": 256 * 1024 * 1024,
+    },
+}
+
+
+# File-level settings of the user database, applied to the attached file
+# (CONNECTION_PRAGMAS and the profiles only reach the catalog). User rows
+# cannot be recollected, so their commits are fully durable; the write
+# service groups them, so FULL costs one sync per group.
+USER_DB_PRAGMAS: Dict[str, Any] = {
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "FULL",
+    "journal_size_limit": 16 * 1024 * 1024,
+    "cache_size": -8 * 1024,
+}
+
+
+def users_path_for(db_path: Path) -> Path:
+    """Default user database for ``db_path``: ``live_jobs.db`` -> ``live_jobs.users.db``."""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.users{db_path.suffix}")
+
+
+@contextmanager
+def immediate_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a block in a ``BEGIN IMMEDIATE`` transaction and commit it.
+
+    A transaction already open on ``conn`` is committed first; an
+    exception in the block rolls the new one back.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
 class Database:
     """Wrapper around sqlite3 connection.
 
     Provides helper methods for common operations and ensures the
-    connection uses row_factory for named access.
+    connection uses row_factory for named access. ``profile`` selects a
+    set of ``PRAGMA_PROFILES`` tuning applied when the connection opens.
+
+    ``db_path`` is the catalog database; the user database (``users_path``,
+    by default ``users_path_for(db_path)``) is attached as ``userdata``.
+    Writes take the write lock of only the file they touch, so ingest
+    into the catalog and user writes proceed side by side. With
+    ``catalog_read_only`` the catalog is opened read-only, so that even
+    ``BEGIN IMMEDIATE`` locks only the user database (the API's write
+    service uses this).
     """
 
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        profile: str = "default",
+        users_path: Optional[Path] = None,
+        catalog_read_only: bool = False,
+    ):
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown PRAGMA profile: {profile!r} (expected one of {list(PRAGMA_PROFILES)})")
         self.db_path = db_path
-        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.users_path = Path(users_path) if users_path is not None else users_path_for(db_path)
+        self.profile = profile
+        self.catalog_read_only = catalog_read_only
+        self._defer_commits = False
+        if catalog_read_only:
+            # Create or migrate both files through a writable connection first.
+            Database(db_path, users_path=self.users_path).close()
+            uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self._configure_connection()
+        self._attach_user_db()
         self._ensure_schema()
 
+    def _configure_connection(self) -> None:
+        """Apply CONNECTION_PRAGMAS and the selected profile."""
+        pragmas = {**CONNECTION_PRAGMAS, **PRAGMA_PROFILES[self.profile]}
+        for name, value in self._file_pragmas("main", pragmas).items():
+            self.conn.execute(f"PRAGMA {name}={value}")
+
+    def _attach_user_db(self) -> None:
+        """Attach the user database and apply USER_DB_PRAGMAS to it."""
+        self.conn.execute(f"ATTACH DATABASE ? AS {USER_SCHEMA_NAME}", (str(self.users_path),))
+        for name, value in self._file_pragmas(USER_SCHEMA_NAME, USER_DB_PRAGMAS).items():
+            self.conn.execute(f"PRAGMA {USER_SCHEMA_NAME}.{name}={value}")
+
+    def _file_pragmas(self, schema: str, pragmas: Dict[str, Any]) -> Dict[str, Any]:
+        """``pragmas`` minus ``auto_vacuum`` unless ``schema`` is a new, empty file.
+
+        It has no effect on an existing file, and setting it takes the
+        file's write lock, which would make opening a connection wait for
+        (or fail behind) a running ingest.
+        """
+        if "auto_vacuum" in pragmas and self.conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0]:
+            return {name: value for name, value in pragmas.items() if name != "auto_vacuum"}
+        return pragmas
+
     def __enter__(self) -> "Database":
         return self
 
@@ -390,13 +1025,52 @@ class Database:
         self.close()
         return False
 
+    # Ordered schema migrations. ``PRAGMA user_version`` records how many
+    # have been applied, so each runs once per database; opening an
+    # up-to-date database costs a single pragma read. Append new steps to
+    # the end and never reorder. Steps are idempotent, so a legacy database
+    # (user_version 0) or two processes racing on first open are both safe.
+    _MIGRATIONS = (
+        "_migrate_base_schema",
+        "_migrate_backfill_jobs_current",
+        "_migrate_indexes",
+        "_migrate_snapshot_membership",
+        "_migrate_indexes",  # version-reference indexes used by maintenance
+        "_migrate_blob_store",
+        "_migrate_epoch_timestamps",
+        "_migrate_job_keys",
+        "_migrate_split_user_data",
+        "_migrate_classification_cache",
+        "_migrate_classification_reasons",
+        "_migrate_search_columns",
+    )
+
+    # Migrations of the user database, tracked by its own user_version.
+    _USER_MIGRATIONS = ("_migrate_user_schema",)
+
     def _ensure_schema(self) -> None:
-        """Initialize the database schema and apply lightweight migrations."""
-        self.conn.executescript(SCHEMA)
+        """Initialize both schemas and apply pending migrations.
+
+        The user database goes first: moving per-user tables out of an
+        older catalog needs their new home to exist.
+        """
+        self._apply_migrations(USER_SCHEMA_NAME, self._USER_MIGRATIONS)
+        self._apply_migrations("main", self._MIGRATIONS)
 
-        # Lightweight migrations for existing DBs.
+    def _apply_migrations(self, schema: str, migrations: Tuple[str, ...]) -> None:
+        version = self.conn.execute(f"PRAGMA {schema}.user_version").fetchone()[0]
+        if version >= len(migrations):
+            return
         cur = self.conn.cursor()
-        
+        for number, name in enumerate(migrations[version:], start=version + 1):
+            getattr(self, name)(cur)
+            cur.execute(f"PRAGMA {schema}.user_version = {number}")
+            self.conn.commit()
+
+    def _migrate_base_schema(self, cur: sqlite3.Cursor) -> None:
+        """Create the base schema and bring pre-versioning databases up to it."""
+        self.conn.executescript(SCHEMA)
+
         # 1) Add snapshots.run_id if missing.
         cur.execute("PRAGMA table_info(snapshots)")
         cols = {row[1] for row in cur.fetchall()}  # type: ignore[index]
@@ -470,35 +1144,558 @@ class Database:
                 FOREIGN KEY(resume_id) REFERENCES resumes(resume_id),
                 FOREIGN KEY(cover_letter_id) REFERENCES cover_letters(cover_letter_id)
             )
-        """)
-        
-        # 7) Create share_links table for collaboration features
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS share_links (
-                share_id TEXT PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                resource_type TEXT NOT NULL,
-                resource_id TEXT,
-                expires_at TIMESTAMP,
-                created_at TIMESTAMP NOT NULL,
-                FOREIGN KEY(user_id) REFERENCES users(user_id)
+        """)
+        
+        # 7) Create share_links table for collaboration features
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS share_links (
+                share_id TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                resource_type TEXT NOT NULL,
+                resource_id TEXT,
+                expires_at TIMESTAMP,
+                created_at TIMESTAMP NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            )
+        """)
+
+    def _migrate_backfill_jobs_current(self, cur: sqlite3.Cursor) -> None:
+        """Backfill jobs_current for databases created before it existed."""
+        has_current = cur.execute("SELECT 1 FROM jobs_current LIMIT 1").fetchone()
+        has_jobs = cur.execute("SELECT 1 FROM jobs LIMIT 1").fetchone()
+        if has_jobs and not has_current:
+            # Written against the pre-job_key tables this migration runs on.
+            cur.execute(
+                """
+                INSERT INTO jobs_current (
+                    job_id, company_id, company_name, version_id, title, location,
+                    remote, sector, extra, is_new_grad, active
+                )
+                SELECT v.job_id, j.company_id, c.name, v.version_id, v.title, v.location,
+                       v.remote, v.sector, v.extra, m.is_new_grad, j.active
+                FROM (
+                    SELECT v.job_id,
+                           MAX(v.version_id) AS version_id,
+                           COALESCE((
+                               SELECT sj.is_new_grad FROM snapshot_jobs sj
+                               WHERE sj.job_id = v.job_id
+                               ORDER BY sj.snapshot_id DESC LIMIT 1
+                           ), 0) AS is_new_grad
+                    FROM job_versions v
+                    GROUP BY v.job_id
+                ) AS m
+                JOIN job_versions v ON v.version_id = m.version_id
+                JOIN jobs j ON j.job_id = v.job_id
+                JOIN companies c ON c.id = j.company_id
+                """
+            )
+
+    def _migrate_indexes(self, cur: sqlite3.Cursor, schema: str = "main") -> None:
+        """Create the secondary indexes whose tables exist in ``schema``.
+
+        Migrations that add tables call this again to pick up their indexes.
+        """
+        tables = {
+            row[0] for row in cur.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type='table'")
+        }
+        for name, target in INDEXES:
+            table, columns = target.rstrip(")").split("(", 1)
+            if table not in tables:
+                continue
+            # Skip indexes on columns a later migration adds.
+            existing = {row[1] for row in cur.execute(f"PRAGMA {schema}.table_info({table})")}
+            if all(c.strip() in existing for c in columns.split(",")):
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {schema}.{name} ON {target}")
+
+    def _migrate_snapshot_membership(self, cur: sqlite3.Cursor) -> None:
+        """Replace per-run snapshot_jobs rows with presence intervals.
+
+        A job's membership is stored as one row per run of consecutive
+        snapshots in which it was present with the same version and
+        classification. ``snapshot_jobs`` becomes a view that expands the
+        intervals, so "jobs in snapshot X" queries keep working.
+        """
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshot_membership (
+                membership_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                version_id INTEGER NOT NULL,
+                is_new_grad INTEGER NOT NULL,
+                first_snapshot_id INTEGER NOT NULL,
+                last_snapshot_id INTEGER NOT NULL,
+                FOREIGN KEY(job_id) REFERENCES jobs(job_id),
+                FOREIGN KEY(version_id) REFERENCES job_versions(version_id)
+            )
+            """
+        )
+
+        cols = {row[1] for row in cur.execute("PRAGMA table_info(jobs_current)")}
+        if "content_hash" not in cols:
+            cur.execute("ALTER TABLE jobs_current ADD COLUMN content_hash TEXT")
+        rows = cur.execute(
+            "SELECT job_id, title, location, remote, extra FROM jobs_current WHERE content_hash IS NULL"
+        ).fetchall()
+        cur.executemany(
+            "UPDATE jobs_current SET content_hash=? WHERE job_id=?",
+            [(content_hash(r[1], r[2], r[3], r[4]), r[0]) for r in rows],
+        )
+
+        kind = cur.execute("SELECT type FROM sqlite_master WHERE name='snapshot_jobs'").fetchone()
+        if kind and kind[0] == "table":
+            # Gaps and islands: rows of a job in consecutive snapshots (by
+            # snapshot order) with the same version/flag collapse into one.
+            cur.execute(
+                """
+                INSERT INTO snapshot_membership
+                    (job_id, version_id, is_new_grad, first_snapshot_id, last_snapshot_id)
+                SELECT job_id, version_id, is_new_grad, MIN(snapshot_id), MAX(snapshot_id)
+                FROM (
+                    SELECT sj.job_id, sj.version_id, sj.is_new_grad, sj.snapshot_id,
+                           r.rn - ROW_NUMBER() OVER (
+                               PARTITION BY sj.job_id, sj.version_id, sj.is_new_grad
+                               ORDER BY r.rn
+                           ) AS island
+                    FROM snapshot_jobs sj
+                    JOIN (
+                        SELECT snapshot_id, ROW_NUMBER() OVER (ORDER BY snapshot_id) AS rn
+                        FROM snapshots
+                    ) r ON r.snapshot_id = sj.snapshot_id
+                )
+                GROUP BY job_id, version_id, is_new_grad, island
+                """
+            )
+            cur.execute("DROP TABLE snapshot_jobs")
+
+        cur.execute(
+            """
+            CREATE VIEW IF NOT EXISTS snapshot_jobs AS
+            SELECT s.snapshot_id, m.job_id, m.version_id, m.is_new_grad
+            FROM snapshot_membership m
+            JOIN snapshots s
+              ON s.snapshot_id BETWEEN m.first_snapshot_id AND m.last_snapshot_id
+            """
+        )
+        self._migrate_indexes(cur)
+
+    def _migrate_blob_store(self, cur: sqlite3.Cursor) -> None:
+        """Move large extra fields of existing rows into ``blobs``.
+
+        Rewrites ``job_versions.extra`` and ``jobs_current.extra`` in packed
+        form and recomputes ``jobs_current.content_hash`` over it, so the
+        next ingest still recognizes unchanged jobs. Freed pages are
+        returned by the maintenance command's incremental vacuum.
+        """
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, data BLOB NOT NULL)"
+        )
+        last_id = 0
+        while True:
+            rows = cur.execute(
+                "SELECT version_id, extra FROM job_versions WHERE version_id > ? ORDER BY version_id LIMIT 1000",
+                (last_id,),
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updates = []
+            for version_id, extra_json in rows:
+                packed = self._pack_stored_extra(extra_json)
+                if packed is not None:
+                    updates.append((packed, version_id))
+            cur.executemany("UPDATE job_versions SET extra=? WHERE version_id=?", updates)
+
+        # jobs_current mirrors its version row, so copy rather than repack.
+        cur.execute(
+            """
+            UPDATE jobs_current SET extra = v.extra
+            FROM job_versions v
+            WHERE v.version_id = jobs_current.version_id
+            """
+        )
+        rows = cur.execute("SELECT job_id, title, location, remote, extra FROM jobs_current").fetchall()
+        cur.executemany(
+            "UPDATE jobs_current SET content_hash=? WHERE job_id=?",
+            [(content_hash(r[1], r[2], r[3], r[4]), r[0]) for r in rows],
+        )
+
+    def _migrate_epoch_timestamps(self, cur: sqlite3.Cursor) -> None:
+        """Rewrite catalog timestamps from ISO-8601 text to epoch seconds.
+
+        The text was written by the sqlite3 module, naive or with a UTC
+        offset; ``strftime('%s')`` handles both (naive as UTC). Values it
+        cannot parse are left unchanged. Indexes on these columns are
+        updated with the rows.
+        """
+        tables = {
+            row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        for table, column in EPOCH_COLUMNS:
+            if table in tables:
+                cur.execute(
+                    f"""
+                    UPDATE {table}
+                    SET {column} = COALESCE(CAST(strftime('%s', {column}) AS INTEGER), {column})
+                    WHERE typeof({column}) = 'text'
+                    """
+                )
+
+    def _migrate_job_keys(self, cur: sqlite3.Cursor) -> None:
+        """Key the catalog tables by an INTEGER ``job_key`` instead of ``job_id``.
+
+        ``jobs`` gets ``job_key INTEGER PRIMARY KEY`` (its old rowid) and
+        keeps ``job_id`` as a unique external identifier. ``job_versions``,
+        ``snapshot_membership`` and ``jobs_current`` are rebuilt to store
+        and join on ``job_key``, so each row and index entry carries an
+        integer rather than the 24-character id. Per-user tables keep
+        their ``job_id`` references, which now point at the unique column.
+        Version and membership ids, and their AUTOINCREMENT counters, are
+        preserved. Rows whose job has no ``jobs`` row (only possible if
+        foreign keys were never enforced) are dropped.
+        """
+        # Tables are rebuilt and renamed, which needs foreign key
+        # enforcement off; the pragma is a no-op inside a transaction.
+        self.conn.commit()
+        cur.execute("PRAGMA foreign_keys=OFF")
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cols = {row[1] for row in cur.execute("PRAGMA table_info(jobs)")}
+            if "job_key" not in cols:
+                self._rebuild_with_job_keys(cur)
+            self._migrate_indexes(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.execute(f"PRAGMA foreign_keys={CONNECTION_PRAGMAS['foreign_keys']}")
+
+    def _rebuild_with_job_keys(self, cur: sqlite3.Cursor) -> None:
+        sequences = {
+            name: seq
+            for name, seq in cur.execute(
+                "SELECT name, seq FROM sqlite_sequence "
+                "WHERE name IN ('job_versions', 'snapshot_membership')"
+            )
+        }
+        # Views must not reference a missing table while tables are renamed.
+        cur.execute("DROP VIEW IF EXISTS snapshot_jobs")
+
+        cur.execute(
+            """
+            CREATE TABLE jobs_new (
+                job_key INTEGER PRIMARY KEY,
+                job_id TEXT NOT NULL UNIQUE,
+                company_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                first_seen INTEGER NOT NULL,
+                last_seen INTEGER NOT NULL,
+                removed_at INTEGER,
+                active INTEGER NOT NULL DEFAULT 1,
+                FOREIGN KEY(company_id) REFERENCES companies(id)
+            )
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO jobs_new
+                (job_key, job_id, company_id, url, source, first_seen, last_seen, removed_at, active)
+            SELECT rowid, job_id, company_id, url, source, first_seen, last_seen, removed_at, active
+            FROM jobs ORDER BY rowid
+            """
+        )
+
+        cur.execute(
+            """
+            CREATE TABLE job_versions_new (
+                version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_key INTEGER NOT NULL,
+                timestamp INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                location TEXT,
+                remote INTEGER,
+                extra TEXT,
+                sector TEXT,
+                FOREIGN KEY(job_key) REFERENCES jobs(job_key)
+            )
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO job_versions_new
+                (version_id, job_key, timestamp, title, location, remote, extra, sector)
+            SELECT v.version_id, j.job_key, v.timestamp, v.title, v.location, v.remote, v.extra, v.sector
+            FROM job_versions v JOIN jobs_new j ON j.job_id = v.job_id
+            ORDER BY v.version_id
+            """
+        )
+
+        cur.execute(
+            """
+            CREATE TABLE snapshot_membership_new (
+                membership_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_key INTEGER NOT NULL,
+                version_id INTEGER NOT NULL,
+                is_new_grad INTEGER NOT NULL,
+                first_snapshot_id INTEGER NOT NULL,
+                last_snapshot_id INTEGER NOT NULL,
+                FOREIGN KEY(job_key) REFERENCES jobs(job_key),
+                FOREIGN KEY(version_id) REFERENCES job_versions(version_id)
+            )
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO snapshot_membership_new
+                (membership_id, job_key, version_id, is_new_grad, first_snapshot_id, last_snapshot_id)
+            SELECT m.membership_id, j.job_key, m.version_id, m.is_new_grad,
+                   m.first_snapshot_id, m.last_snapshot_id
+            FROM snapshot_membership m JOIN jobs_new j ON j.job_id = m.job_id
+            ORDER BY m.membership_id
+            """
+        )
+
+        cur.execute(
+            """
+            CREATE TABLE jobs_current_new (
+                job_key INTEGER PRIMARY KEY,
+                company_id INTEGER NOT NULL,
+                company_name TEXT NOT NULL,
+                version_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                location TEXT,
+                remote INTEGER,
+                sector TEXT,
+                extra TEXT,
+                is_new_grad INTEGER NOT NULL DEFAULT 0,
+                active INTEGER NOT NULL DEFAULT 1,
+                content_hash TEXT,
+                FOREIGN KEY(job_key) REFERENCES jobs(job_key),
+                FOREIGN KEY(company_id) REFERENCES companies(id),
+                FOREIGN KEY(version_id) REFERENCES job_versions(version_id)
             )
-        """)
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO jobs_current_new (
+                job_key, company_id, company_name, version_id, title, location,
+                remote, sector, extra, is_new_grad, active, content_hash
+            )
+            SELECT j.job_key, jc.company_id, jc.company_name, jc.version_id, jc.title, jc.location,
+                   jc.remote, jc.sector, jc.extra, jc.is_new_grad, jc.active, jc.content_hash
+            FROM jobs_current jc JOIN jobs_new j ON j.job_id = jc.job_id
+            ORDER BY j.job_key
+            """
+        )
+
+        for table in ("jobs_current", "snapshot_membership", "job_versions", "jobs"):
+            cur.execute(f"DROP TABLE {table}")
+            cur.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        for name, seq in sequences.items():
+            cur.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, name))
+            if cur.rowcount == 0:
+                cur.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, seq))
+
+        cur.execute(
+            """
+            CREATE VIEW snapshot_jobs AS
+            SELECT s.snapshot_id, j.job_id, m.job_key, m.version_id, m.is_new_grad
+            FROM snapshot_membership m
+            JOIN jobs j ON j.job_key = m.job_key
+            JOIN snapshots s
+              ON s.snapshot_id BETWEEN m.first_snapshot_id AND m.last_snapshot_id
+            """
+        )
+
+    def _migrate_split_user_data(self, cur: sqlite3.Cursor) -> None:
+        """Move the per-user tables from the catalog into the user database.
 
+        Rows keep their ids, AUTOINCREMENT counters are carried over, and
+        columns the user schema lacks are added rather than dropped. The
+        two files commit separately, so the copy commits before the
+        catalog tables are dropped: a crash in between leaves both copies,
+        and the next open repeats the (idempotent) move.
+        """
         self.conn.commit()
+        cur.execute("PRAGMA foreign_keys=OFF")
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            moving = self._catalog_user_tables(cur)
+            for table in moving:
+                self._copy_user_table(cur, table)
+            placeholders = ",".join("?" for _ in moving)
+            sequences = cur.execute(
+                f"SELECT name, seq FROM main.sqlite_sequence WHERE name IN ({placeholders})", moving
+            ).fetchall()
+            for name, seq in sequences:
+                cur.execute(
+                    f"UPDATE {USER_SCHEMA_NAME}.sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                    (seq, name),
+                )
+                if cur.rowcount == 0:
+                    cur.execute(
+                        f"INSERT INTO {USER_SCHEMA_NAME}.sqlite_sequence (name, seq) VALUES (?, ?)",
+                        (name, seq),
+                    )
+            self.conn.commit()
+
+            cur.execute("BEGIN IMMEDIATE")
+            for table in reversed(self._catalog_user_tables(cur)):
+                cur.execute(f"DROP TABLE main.{table}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.execute(f"PRAGMA foreign_keys={CONNECTION_PRAGMAS['foreign_keys']}")
+
+    def _migrate_classification_cache(self, cur: sqlite3.Cursor) -> None:
+        """Create the new-grad classification cache (see ``classification.py``).
+
+        Keyed by ``classifier_input_hash``; rows of an older
+        ``CLASSIFIER_VERSION`` count as misses and are overwritten.
+        ``reasons`` is a JSON list.
+        """
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classification_cache (
+                input_hash TEXT PRIMARY KEY,
+                classifier_version INTEGER NOT NULL,
+                is_new_grad INTEGER NOT NULL,
+                reasons TEXT NOT NULL,
+                last_used INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+
+    def _migrate_classification_reasons(self, cur: sqlite3.Cursor) -> None:
+        """Record why each job was classified as it was.
+
+        Each distinct reasons list is stored once in
+        ``classification_reasons`` (compact JSON); membership intervals
+        and ``jobs_current`` refer to it by ``reasons_id``, which is NULL
+        for rows written before this migration.
+        """
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classification_reasons (
+                reasons_id INTEGER PRIMARY KEY,
+                reasons TEXT NOT NULL UNIQUE
+            )
+            """
+        )
+        for table in ("snapshot_membership", "jobs_current"):
+            cols = {row[1] for row in cur.execute(f"PRAGMA main.table_info({table})")}
+            if "reasons_id" not in cols:
+                cur.execute(
+                    f"ALTER TABLE {table} ADD COLUMN reasons_id INTEGER "
+                    "REFERENCES classification_reasons(reasons_id)"
+                )
+        cur.execute("DROP VIEW IF EXISTS snapshot_jobs")
+        cur.execute(
+            """
+            CREATE VIEW snapshot_jobs AS
+            SELECT s.snapshot_id, j.job_id, m.job_key, m.version_id, m.is_new_grad, m.reasons_id
+            FROM snapshot_membership m
+            JOIN jobs j ON j.job_key = m.job_key
+            JOIN snapshots s
+              ON s.snapshot_id BETWEEN m.first_snapshot_id AND m.last_snapshot_id
+            """
+        )
+
+    def _migrate_search_columns(self, cur: sqlite3.Cursor) -> None:
+        """Give ``jobs_current`` columns for keyword search and extra filters.
+
+        Large ``extra`` fields are stored as blob references, so matching
+        the stored JSON misses descriptions. ``search_text`` (``extra``
+        with every field inline) and the ``experience_level`` and
+        ``job_type`` values are filled at ingest (see
+        ``blobs.search_columns``); existing rows are backfilled here.
+        """
+        cols = {row[1] for row in cur.execute("PRAGMA main.table_info(jobs_current)")}
+        for column, decl in (
+            ("search_text", "TEXT"),
+            ("experience_level", "TEXT COLLATE NOCASE"),
+            ("job_type", "TEXT COLLATE NOCASE"),
+        ):
+            if column not in cols:
+                cur.execute(f"ALTER TABLE jobs_current ADD COLUMN {column} {decl}")
+        rows = cur.execute("SELECT job_key, extra FROM jobs_current").fetchall()
+        cur.executemany(
+            "UPDATE jobs_current SET search_text=?, experience_level=?, job_type=? WHERE job_key=?",
+            [(*search_columns(hydrate_extra(self.conn, extra)), job_key) for job_key, extra in rows],
+        )
+
+    def _catalog_user_tables(self, cur: sqlite3.Cursor) -> List[str]:
+        """User tables still present in the catalog file."""
+        present = {row[0] for row in cur.execute("SELECT name FROM main.sqlite_master WHERE type='table'")}
+        return [table for table in USER_TABLES if table in present]
+
+    def _copy_user_table(self, cur: sqlite3.Cursor, table: str) -> None:
+        source = [(row[1], row[2]) for row in cur.execute(f"PRAGMA main.table_info({table})")]
+        target = {row[1] for row in cur.execute(f"PRAGMA {USER_SCHEMA_NAME}.table_info({table})")}
+        for column, decl in source:
+            if column not in target:
+                cur.execute(f"ALTER TABLE {USER_SCHEMA_NAME}.{table} ADD COLUMN {column} {decl}")
+        cols = ", ".join(column for column, _ in source)
+        cur.execute(
+            f"INSERT OR REPLACE INTO {USER_SCHEMA_NAME}.{table} ({cols}) SELECT {cols} FROM main.{table}"
+        )
+
+    def _migrate_user_schema(self, cur: sqlite3.Cursor) -> None:
+        """Create the user database tables and their indexes."""
+        self.conn.executescript(USER_SCHEMA.format(schema=USER_SCHEMA_NAME))
+        self._migrate_indexes(cur, USER_SCHEMA_NAME)
+
+    def _pack_stored_extra(self, extra_json: Optional[str]) -> Optional[str]:
+        """Return the packed form of stored extra JSON, or None to leave it."""
+        if not extra_json:
+            return None
+        try:
+            extra = json.loads(extra_json)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        if not isinstance(extra, dict):
+            return None
+        packed, blobs = pack_extra(extra)
+        if not blobs:
+            return None
+        self.put_blobs(blobs)
+        return packed
 
     def close(self) -> None:
         self.conn.close()
 
+    def commit(self) -> None:
+        """Commit the current transaction.
+
+        The helpers below call this rather than ``conn.commit()`` so that a
+        ``WriteService`` (see ``job_tracker/writer.py``) can run them inside
+        its group transaction, where it is a no-op.
+        """
+        if not self._defer_commits:
+            self.conn.commit()
+
+    @contextmanager
+    def deferred_commits(self) -> Iterator[None]:
+        """Make ``commit()`` a no-op; the caller commits the transaction."""
+        self._defer_commits = True
+        try:
+            yield
+        finally:
+            self._defer_commits = False
+
     # --- run operations ---
     def insert_run(self, started_at: datetime, companies_total: int) -> int:
         cur = self.conn.cursor()
         cur.execute(
             "INSERT INTO runs (started_at, status, companies_total) VALUES (?, 'running', ?)",
-            (started_at, companies_total),
+            (to_epoch(started_at), companies_total),
         )
         run_id = cur.lastrowid
-        self.conn.commit()
+        self.commit()
         return int(run_id)
 
     def finish_run(
@@ -518,9 +1715,9 @@ class Database:
             SET finished_at=?, status=?, companies_succeeded=?, companies_failed=?, jobs_collected=?, notes=?
             WHERE run_id=?
             """,
-            (finished_at, status, companies_succeeded, companies_failed, jobs_collected, notes, run_id),
+            (to_epoch(finished_at), status, companies_succeeded, companies_failed, jobs_collected, notes, run_id),
         )
-        self.conn.commit()
+        self.commit()
 
     def insert_run_error(
         self,
@@ -537,9 +1734,9 @@ class Database:
             INSERT INTO run_errors (run_id, created_at, company_slug, company_name, ats, error)
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (run_id, created_at, company_slug, company_name, ats, error),
+            (run_id, to_epoch(created_at), company_slug, company_name, ats, error),
         )
-        self.conn.commit()
+        self.commit()
 
     # --- company operations ---
     def upsert_company(self, slug: str, name: str, source: str) -> int:
@@ -554,7 +1751,7 @@ class Database:
             "UPDATE companies SET name=?, source=? WHERE slug=?",
             (name, source, slug),
         )
-        self.conn.commit()
+        self.commit()
         cur.execute("SELECT id FROM companies WHERE slug=?", (slug,))
         return int(cur.fetchone()["id"])
 
@@ -577,17 +1774,17 @@ class Database:
         cur.execute(
             "INSERT INTO jobs (job_id, company_id, url, source, first_seen, last_seen, active) "
             "VALUES (?, ?, ?, ?, ?, ?, 1)",
-            (job_id, company_id, url, source, first_seen, last_seen),
+            (job_id, company_id, url, source, to_epoch(first_seen), to_epoch(last_seen)),
         )
-        self.conn.commit()
+        self.commit()
 
     def update_job_seen(self, job_id: str, last_seen: datetime) -> None:
         cur = self.conn.cursor()
         cur.execute(
             "UPDATE jobs SET last_seen=?, active=1, removed_at=NULL WHERE job_id=?",
-            (last_seen, job_id),
+            (to_epoch(last_seen), job_id),
         )
-        self.conn.commit()
+        self.commit()
 
     def mark_jobs_removed(self, job_ids: List[str], removed_at: datetime) -> None:
         if not job_ids:
@@ -596,8 +1793,72 @@ class Database:
         # Use placeholders for variable length
         placeholders = ",".join("?" for _ in job_ids)
         sql = f"UPDATE jobs SET active=0, removed_at=? WHERE job_id IN ({placeholders})"
-        cur.execute(sql, (removed_at, *job_ids))
-        self.conn.commit()
+        cur.execute(sql, (to_epoch(removed_at), *job_ids))
+        cur.execute(
+            f"UPDATE jobs_current SET active=0 "
+            f"WHERE job_key IN (SELECT job_key FROM jobs WHERE job_id IN ({placeholders}))",
+            job_ids,
+        )
+        self.commit()
+
+    def mark_missing_jobs_removed(
+        self,
+        company_slugs: Iterable[str],
+        seen_job_ids: Iterable[str],
+        removed_at: datetime,
+    ) -> int:
+        """Mark active jobs of the given companies removed unless seen this run.
+
+        Only companies listed in ``company_slugs`` (those fetched successfully)
+        are considered, so a transient fetch failure never deactivates a
+        company's jobs. The seen ids and slugs are staged in temp tables and
+        removal is a single ``UPDATE``.
+
+        Returns:
+            Number of jobs marked removed.
+        """
+        cur = self.conn.cursor()
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS stage_seen_jobs (job_id TEXT PRIMARY KEY)")
+        cur.execute("DELETE FROM temp.stage_seen_jobs")
+        cur.executemany(
+            "INSERT OR IGNORE INTO temp.stage_seen_jobs (job_id) VALUES (?)",
+            ((job_id,) for job_id in seen_job_ids),
+        )
+        removed = self._remove_unseen_jobs(cur, "temp.stage_seen_jobs", company_slugs, removed_at)
+        cur.execute("DELETE FROM temp.stage_seen_jobs")
+        self.commit()
+        return removed
+
+    def _remove_unseen_jobs(
+        self,
+        cur: sqlite3.Cursor,
+        seen_table: str,
+        company_slugs: Iterable[str],
+        removed_at: datetime,
+    ) -> int:
+        """Deactivate jobs of fetched companies whose id is not in ``seen_table``.
+
+        Does not commit; callers own the transaction.
+        """
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS stage_fetched_companies (slug TEXT PRIMARY KEY)")
+        cur.execute("DELETE FROM temp.stage_fetched_companies")
+        cur.executemany(
+            "INSERT OR IGNORE INTO temp.stage_fetched_companies (slug) VALUES (?)",
+            ((slug,) for slug in company_slugs),
+        )
+        unseen = f"""
+            WHERE active=1
+              AND company_id IN (
+                  SELECT c.id FROM companies c
+                  JOIN temp.stage_fetched_companies f ON f.slug = c.slug
+              )
+              AND job_id NOT IN (SELECT job_id FROM {seen_table})
+        """
+        cur.execute("UPDATE jobs_current SET active=0 WHERE job_key IN (SELECT job_key FROM jobs" + unseen + ")")
+        cur.execute("UPDATE jobs SET active=0, removed_at=?" + unseen, (to_epoch(removed_at),))
+        removed = cur.rowcount
+        cur.execute("DELETE FROM temp.stage_fetched_companies")
+        return removed
 
     # --- version operations ---
     def insert_job_version(
@@ -611,25 +1872,119 @@ class Database:
     ) -> int:
         cur = self.conn.cursor()
         cur.execute(
-            "INSERT INTO job_versions (job_id, timestamp, title, location, remote, extra) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
+            "INSERT INTO job_versions (job_key, timestamp, title, location, remote, extra) "
+            "SELECT job_key, ?, ?, ?, ?, ? FROM jobs WHERE job_id=?",
             (
-                job_id,
-                timestamp,
+                to_epoch(timestamp),
                 title,
                 location,
                 1 if remote is True else 0 if remote is False else None,
                 extra_json,
+                job_id,
             ),
         )
+        if cur.rowcount == 0:
+            raise ValueError(f"Unknown job_id: {job_id}")
         version_id = cur.lastrowid
-        self.conn.commit()
+        self.commit()
         return version_id
 
+    def put_blobs(self, blobs: Dict[str, bytes]) -> None:
+        """Store compressed blobs from ``pack_extra``; existing keys are kept.
+
+        Not committed here: blobs are written in the same transaction as
+        the versions that reference them.
+        """
+        if blobs:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO blobs (hash, data) VALUES (?, ?)", blobs.items()
+            )
+
+    def get_classifications(
+        self, input_hashes: Iterable[str], version: int
+    ) -> Dict[str, Tuple[bool, List[str], int]]:
+        """Return cached ``(is_new_grad, reasons, last_used)`` by input hash.
+
+        Rows of other classifier versions are left out.
+        """
+        keys = list(input_hashes)
+        found: Dict[str, Tuple[bool, List[str], int]] = {}
+        for i in range(0, len(keys), 500):
+            batch = keys[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            rows = self.conn.execute(
+                f"""
+                SELECT input_hash, is_new_grad, reasons, last_used FROM classification_cache
+                WHERE input_hash IN ({placeholders}) AND classifier_version = ?
+                """,
+                (*batch, version),
+            )
+            for key, flag, reasons, last_used in rows:
+                found[key] = (bool(flag), json.loads(reasons), last_used)
+        return found
+
+    def put_classifications(self, rows: Iterable[Tuple[str, int, bool, List[str], int]]) -> None:
+        """Upsert ``(input_hash, version, is_new_grad, reasons, last_used)`` rows.
+
+        Not committed here: they are written in the ingest transaction.
+        """
+        self.conn.executemany(
+            """
+            INSERT INTO classification_cache (input_hash, classifier_version, is_new_grad, reasons, last_used)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(input_hash) DO UPDATE SET
+                classifier_version=excluded.classifier_version, is_new_grad=excluded.is_new_grad,
+                reasons=excluded.reasons, last_used=excluded.last_used
+            """,
+            ((key, version, 1 if flag else 0, json.dumps(reasons), last_used)
+             for key, version, flag, reasons, last_used in rows),
+        )
+
+    def intern_reasons(self, reasons_lists: Iterable[List[str]]) -> Dict[Tuple[str, ...], int]:
+        """Return ``reasons_id`` for each distinct reasons list, storing new ones.
+
+        Keys are the lists as tuples. Not committed here: new rows are
+        written in the ingest transaction.
+        """
+        encoded = {tuple(reasons): encode_reasons(reasons) for reasons in reasons_lists}
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO classification_reasons (reasons) VALUES (?)",
+            ((text,) for text in encoded.values()),
+        )
+        by_text = {text: key for key, text in encoded.items()}
+        found: Dict[Tuple[str, ...], int] = {}
+        texts = list(by_text)
+        for i in range(0, len(texts), 500):
+            batch = texts[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            rows = self.conn.execute(
+                f"SELECT reasons, reasons_id FROM classification_reasons WHERE reasons IN ({placeholders})",
+                batch,
+            )
+            for text, reasons_id in rows:
+                found[by_text[text]] = reasons_id
+        return found
+
+    def get_reasons(self, reasons_ids: Iterable[Optional[int]]) -> Dict[int, List[str]]:
+        """Return stored reasons lists by ``reasons_id`` (None ids are skipped)."""
+        ids = list({i for i in reasons_ids if i is not None})
+        found: Dict[int, List[str]] = {}
+        for i in range(0, len(ids), 500):
+            batch = ids[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            rows = self.conn.execute(
+                f"SELECT reasons_id, reasons FROM classification_reasons WHERE reasons_id IN ({placeholders})",
+                batch,
+            )
+            for reasons_id, text in rows:
+                found[reasons_id] = decode_reasons(text)
+        return found
+
     def get_latest_job_version(self, job_id: str) -> Optional[sqlite3.Row]:
         cur = self.conn.cursor()
         cur.execute(
-            "SELECT * FROM job_versions WHERE job_id=? ORDER BY timestamp DESC LIMIT 1",
+            "SELECT v.*, j.job_id FROM job_versions v JOIN jobs j ON j.job_key = v.job_key "
+            "WHERE j.job_id=? ORDER BY v.timestamp DESC LIMIT 1",
             (job_id,),
         )
         return cur.fetchone()
@@ -639,10 +1994,10 @@ class Database:
         cur = self.conn.cursor()
         cur.execute(
             "INSERT INTO snapshots (timestamp, run_id) VALUES (?, ?)",
-            (timestamp, run_id),
+            (to_epoch(timestamp), run_id),
         )
         snapshot_id = cur.lastrowid
-        self.conn.commit()
+        self.commit()
         return snapshot_id
 
     def insert_snapshot_job(
@@ -651,16 +2006,332 @@ class Database:
         job_id: str,
         version_id: int,
         is_new_grad: bool,
+        reasons_id: int | None = None,
+    ) -> None:
+        """Record ``job_id`` as present in ``snapshot_id``.
+
+        Extends the job's interval if it ended at the previous snapshot with
+        the same version, flag and reasons; otherwise opens a new one.
+        Intervals recorded before reasons were stored take on ``reasons_id``.
+        """
+        cur = self.conn.cursor()
+        flag = 1 if is_new_grad else 0
+        row = cur.execute("SELECT job_key FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown job_id: {job_id}")
+        job_key = row[0]
+        cur.execute(
+            """
+            UPDATE snapshot_membership SET last_snapshot_id = ?, reasons_id = ?
+            WHERE job_key = ? AND version_id = ? AND is_new_grad = ?
+              AND (reasons_id IS ? OR reasons_id IS NULL)
+              AND last_snapshot_id = (
+                  SELECT MAX(snapshot_id) FROM snapshots WHERE snapshot_id < ?
+              )
+            """,
+            (snapshot_id, reasons_id, job_key, version_id, flag, reasons_id, snapshot_id),
+        )
+        if cur.rowcount == 0:
+            cur.execute(
+                "INSERT INTO snapshot_membership "
+                "(job_key, version_id, is_new_grad, reasons_id, first_snapshot_id, last_snapshot_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_key, version_id, flag, reasons_id, snapshot_id, snapshot_id),
+            )
+        self.commit()
+
+    # --- current-state operations ---
+    def get_job_current(self, job_id: str) -> Optional[sqlite3.Row]:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT jc.*, j.job_id FROM jobs_current jc JOIN jobs j ON j.job_key = jc.job_key "
+            "WHERE j.job_id=?",
+            (job_id,),
+        )
+        return cur.fetchone()
+
+    def upsert_job_current(
+        self,
+        job_id: str,
+        version_id: int,
+        is_new_grad: bool,
+        content_hash: str | None = None,
+        reasons_id: int | None = None,
+        search: Tuple[str, Optional[str], Optional[str]] = ("", None, None),
     ) -> None:
+        """Point ``jobs_current`` for ``job_id`` at ``version_id`` (a version of that job).
+
+        ``search`` is ``blobs.search_columns`` of the version's extra.
+        """
+        cur = self.conn.cursor()
+        self._upsert_jobs_current(
+            cur,
+            "SELECT ? AS version_id, ? AS is_new_grad, ? AS reasons_id, ? AS content_hash, "
+            "? AS search_text, ? AS experience_level, ? AS job_type",
+            (version_id, 1 if is_new_grad else 0, reasons_id, content_hash, *search),
+        )
+        self.commit()
+
+    def _upsert_jobs_current(self, cur: sqlite3.Cursor, source_sql: str, params: Tuple = ()) -> None:
+        """Refresh ``jobs_current`` rows from ``source_sql``.
+
+        ``source_sql`` is a SELECT producing ``version_id, is_new_grad,
+        reasons_id, content_hash, search_text, experience_level,
+        job_type``; the rest of each row is read from the version, the
+        job and its company.
+        Does not commit; callers own the transaction.
+        """
+        cur.execute(
+            f"""
+            INSERT INTO jobs_current (
+                job_key, company_id, company_name, version_id, title, location,
+                remote, sector, extra, is_new_grad, reasons_id, active, content_hash,
+                search_text, experience_level, job_type
+            )
+            SELECT v.job_key, j.company_id, c.name, v.version_id, v.title, v.location,
+                   v.remote, v.sector, v.extra, m.is_new_grad, m.reasons_id, j.active, m.content_hash,
+                   m.search_text, m.experience_level, m.job_type
+            FROM ({source_sql}) AS m
+            JOIN job_versions v ON v.version_id = m.version_id
+            JOIN jobs j ON j.job_key = v.job_key
+            JOIN companies c ON c.id = j.company_id
+            WHERE true
+            ON CONFLICT(job_key) DO UPDATE SET
+                company_id=excluded.company_id,
+                company_name=excluded.company_name,
+                version_id=excluded.version_id,
+                title=excluded.title,
+                location=excluded.location,
+                remote=excluded.remote,
+                sector=excluded.sector,
+                extra=excluded.extra,
+                is_new_grad=excluded.is_new_grad,
+                reasons_id=excluded.reasons_id,
+                active=excluded.active,
+                content_hash=excluded.content_hash,
+                search_text=excluded.search_text,
+                experience_level=excluded.experience_level,
+                job_type=excluded.job_type
+            """,
+            params,
+        )
+
+    # --- staged ingest operations ---
+    def upsert_companies(self, companies: Iterable[Tuple[str, str, str]]) -> Dict[str, int]:
+        """Upsert ``(slug, name, source)`` tuples and return a slug -> id map."""
+        rows = list(companies)
+        if not rows:
+            return {}
         cur = self.conn.cursor()
+        cur.executemany(
+            "INSERT INTO companies (slug, name, source) VALUES (?, ?, ?) "
+            "ON CONFLICT(slug) DO UPDATE SET name=excluded.name, source=excluded.source",
+            rows,
+        )
+        self.commit()
+        placeholders = ",".join("?" for _ in rows)
         cur.execute(
-            "INSERT INTO snapshot_jobs (snapshot_id, job_id, version_id, is_new_grad) "
-            "VALUES (?, ?, ?, ?)",
-            (snapshot_id, job_id, version_id, 1 if is_new_grad else 0),
+            f"SELECT slug, id FROM companies WHERE slug IN ({placeholders})",
+            [row[0] for row in rows],
         )
-        self.conn.commit()
+        return {row["slug"]: int(row["id"]) for row in cur.fetchall()}
+
+    def stage_snapshot_jobs(self, rows: Iterable[Tuple]) -> None:
+        """Bulk-load collected jobs into the ``temp.stage_jobs`` table.
+
+        Each row is ``(job_id, company_id, url, source, title, location,
+        remote, extra_json, is_new_grad, reasons, content_hash,
+        search_text, experience_level, job_type)``, ``reasons`` encoded
+        with ``encode_reasons``. Duplicate job ids keep the last row. Only
+        the TEMP table is written; ``merge_staged_snapshot`` writes the
+        catalog.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS stage_jobs (
+                job_id TEXT PRIMARY KEY,
+                company_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                location TEXT,
+                remote INTEGER,
+                extra TEXT,
+                is_new_grad INTEGER NOT NULL,
+                reasons TEXT,
+                reasons_id INTEGER,
+                content_hash TEXT NOT NULL,
+                search_text TEXT,
+                experience_level TEXT,
+                job_type TEXT,
+                job_key INTEGER,
+                version_id INTEGER
+            )
+            """
+        )
+        cur.execute("DELETE FROM temp.stage_jobs")
+        cur.executemany(
+            "INSERT OR REPLACE INTO temp.stage_jobs "
+            "(job_id, company_id, url, source, title, location, remote, extra, is_new_grad, reasons, "
+            "content_hash, search_text, experience_level, job_type) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def merge_staged_snapshot(
+        self,
+        timestamp: datetime,
+        company_slugs: Iterable[str],
+        run_id: int | None = None,
+        blobs: Dict[str, bytes] | None = None,
+        classifications: Iterable[Tuple[str, int, bool, List[str], int]] = (),
+    ) -> int:
+        """Merge ``temp.stage_jobs`` into the catalog as a new snapshot.
+
+        Job upserts, version inserts, snapshot membership and removals are
+        each one set-based statement, and the whole merge is one
+        transaction, together with the staged jobs' ``blobs`` (see
+        ``put_blobs``), their reasons lists and the ``classifications``
+        cache rows (see ``put_classifications``). A new version is only written for jobs whose content
+        hash differs from ``jobs_current``; membership intervals that ended
+        at the previous snapshot with the same version, flag and reasons
+        are extended.
+        ``company_slugs`` scopes removal detection to the companies fetched
+        successfully this run.
+
+        Returns:
+            The snapshot_id of the new snapshot.
+        """
+        cur = self.conn.cursor()
+        epoch = to_epoch(timestamp)
+        try:
+            self.put_blobs(blobs or {})
+            self.put_classifications(classifications)
+            cur.execute(
+                """
+                INSERT OR IGNORE INTO classification_reasons (reasons)
+                SELECT DISTINCT reasons FROM temp.stage_jobs WHERE reasons IS NOT NULL
+                """
+            )
+            cur.execute(
+                """
+                UPDATE temp.stage_jobs AS s SET reasons_id = r.reasons_id
+                FROM classification_reasons AS r WHERE r.reasons = s.reasons
+                """
+            )
+            cur.execute(
+                "INSERT INTO snapshots (timestamp, run_id) VALUES (?, ?)",
+                (epoch, run_id),
+            )
+            snapshot_id = int(cur.lastrowid)
+            prev_snapshot_id = cur.execute(
+                "SELECT MAX(snapshot_id) FROM snapshots WHERE snapshot_id < ?",
+                (snapshot_id,),
+            ).fetchone()[0]
+
+            # New jobs are inserted; existing ones are marked seen/reactivated.
+            cur.execute(
+                """
+                INSERT INTO jobs (job_id, company_id, url, source, first_seen, last_seen, active)
+                SELECT job_id, company_id, url, source, ?, ?, 1 FROM temp.stage_jobs WHERE true
+                ON CONFLICT(job_id) DO UPDATE SET
+                    last_seen=excluded.last_seen, active=1, removed_at=NULL
+                """,
+                (epoch, epoch),
+            )
+            # Everything below joins on the integer key.
+            cur.execute(
+                """
+                UPDATE temp.stage_jobs AS s SET job_key = j.job_key
+                FROM jobs AS j WHERE j.job_id = s.job_id
+                """
+            )
+
+            # Unchanged jobs keep their current version.
+            cur.execute(
+                """
+                UPDATE temp.stage_jobs AS s SET version_id = jc.version_id
+                FROM jobs_current AS jc
+                WHERE jc.job_key = s.job_key AND jc.content_hash = s.content_hash
+                """
+            )
+
+            # Changed and new jobs get contiguous new version ids; map them
+            # back onto the stage rows.
+            max_version_id = cur.execute(
+                "SELECT COALESCE(MAX(version_id), 0) FROM job_versions"
+            ).fetchone()[0]
+            cur.execute(
+                """
+                INSERT INTO job_versions (job_key, timestamp, title, location, remote, extra)
+                SELECT job_key, ?, title, location, remote, extra
+                FROM temp.stage_jobs WHERE version_id IS NULL ORDER BY job_id
+                """,
+                (epoch,),
+            )
+            cur.execute(
+                """
+                UPDATE temp.stage_jobs AS s SET version_id = v.version_id
+                FROM job_versions AS v
+                WHERE v.version_id > ? AND v.job_key = s.job_key
+                """,
+                (max_version_id,),
+            )
+
+            cur.execute(
+                """
+                UPDATE snapshot_membership AS m SET last_snapshot_id = ?, reasons_id = s.reasons_id
+                FROM temp.stage_jobs AS s
+                WHERE m.last_snapshot_id = ? AND m.job_key = s.job_key
+                  AND m.version_id = s.version_id AND m.is_new_grad = s.is_new_grad
+                  AND (m.reasons_id IS s.reasons_id OR m.reasons_id IS NULL)
+                """,
+                (snapshot_id, prev_snapshot_id),
+            )
+            cur.execute(
+                """
+                INSERT INTO snapshot_membership
+                    (job_key, version_id, is_new_grad, reasons_id, first_snapshot_id, last_snapshot_id)
+                SELECT s.job_key, s.version_id, s.is_new_grad, s.reasons_id, ?, ?
+                FROM temp.stage_jobs s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM snapshot_membership m
+                    WHERE m.job_key = s.job_key AND m.last_snapshot_id = ?
+                )
+                """,
+                (snapshot_id, snapshot_id, snapshot_id),
+            )
+
+            self._upsert_jobs_current(
+                cur,
+                "SELECT version_id, is_new_grad, reasons_id, content_hash, search_text, experience_level, "
+                "job_type FROM temp.stage_jobs",
+            )
+            # Keep denormalized company names in step with renames.
+            cur.execute(
+                """
+                UPDATE jobs_current AS jc SET company_name = c.name
+                FROM companies AS c
+                WHERE c.id = jc.company_id AND jc.company_name <> c.name
+                """
+            )
+
+            self._remove_unseen_jobs(cur, "temp.stage_jobs", company_slugs, epoch)
+            cur.execute("DELETE FROM temp.stage_jobs")
+            self.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return snapshot_id
 
     # Query helpers for demonstration
+    def execute_query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """Run a read-only query and return all rows."""
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        return cur.fetchall()
+
     def list_active_jobs(self) -> List[sqlite3.Row]:
         cur = self.conn.cursor()
         cur.execute(
@@ -732,7 +2403,7 @@ class Database:
             (application_id, "created", json.dumps({"status": status}), now)
         )
         
-        self.conn.commit()
+        self.commit()
         return int(application_id)
 
     def get_application(self, application_id: int, user_id: Optional[int] = None) -> Optional[sqlite3.Row]:
@@ -814,7 +2485,7 @@ class Database:
                 (application_id, "status_changed", json.dumps({"old_status": current_status, "new_status": status}), datetime.now())
             )
         
-        self.conn.commit()
+        self.commit()
         return True
 
     def delete_application(self, application_id: int, user_id: int) -> bool:
@@ -825,7 +2496,7 @@ class Database:
             (application_id, user_id)
         )
         deleted = cur.rowcount > 0
-        self.conn.commit()
+        self.commit()
         return deleted
 
     def list_applications(
@@ -885,7 +2556,7 @@ class Database:
             (application_id, event_type, json.dumps(event_data) if event_data else None, datetime.now())
         )
         event_id = cur.lastrowid
-        self.conn.commit()
+        self.commit()
         return int(event_id)
 
     # --- interview operations ---
@@ -921,7 +2592,7 @@ class Database:
             )
         )
         interview_id = cur.lastrowid
-        self.conn.commit()
+        self.commit()
         
         # Add event to application timeline
         self.add_application_event(
@@ -998,7 +2669,7 @@ class Database:
         params.append(interview_id)
         cur.execute(f"UPDATE interviews SET {', '.join(updates)} WHERE interview_id = ?", params)
         updated = cur.rowcount > 0
-        self.conn.commit()
+        self.commit()
         return updated
 
     def delete_interview(self, interview_id: int) -> bool:
@@ -1017,7 +2688,7 @@ class Database:
                 {"interview_id": interview_id}
             )
         
-        self.conn.commit()
+        self.commit()
         return deleted
 
     def list_interviews(
@@ -1088,7 +2759,7 @@ class Database:
             )
         )
         offer_id = cur.lastrowid
-        self.conn.commit()
+        self.commit()
         
         # Add event to application timeline
         self.add_application_event(
@@ -1161,7 +2832,7 @@ class Database:
         params.append(application_id)
         cur.execute(f"UPDATE offers SET {', '.join(updates)} WHERE application_id = ?", params)
         updated = cur.rowcount > 0
-        self.conn.commit()
+        self.commit()
         return updated
 
     def list_offers(self, user_id: int, status: Optional[str] = None) -> List[sqlite3.Row]:
@@ -1212,7 +2883,7 @@ class Database:
             (user_id,)
         )
         
-        self.conn.commit()
+        self.commit()
         return int(user_id)
 
     def get_user_by_username(self, username: str) -> Optional[sqlite3.Row]:
@@ -1240,14 +2911,14 @@ class Database:
             "UPDATE users SET last_login = ? WHERE user_id = ?",
             (datetime.now(), user_id)
         )
-        self.conn.commit()
+        self.commit()
 
     def delete_user_session(self, session_id: str) -> bool:
         """Delete a user session (for logout)."""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM user_sessions WHERE session_id = ?", (session_id,))
         deleted = cur.rowcount > 0
-        self.conn.commit()
+        self.commit()
         return deleted
 
     def delete_user_sessions(self, user_id: int) -> int:
@@ -1255,7 +2926,7 @@ class Database:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM user_sessions WHERE user_id = ?", (user_id,))
         count = cur.rowcount
-        self.conn.commit()
+        self.commit()
         return count
 
     def update_user_preferences(self, user_id: int, preferences: dict) -> bool:
@@ -1266,7 +2937,7 @@ class Database:
             "UPDATE users SET preferences = ? WHERE user_id = ?",
             (preferences_json, user_id)
         )
-        self.conn.commit()
+        self.commit()
         return cur.rowcount > 0
 
     def get_user_preferences(self, user_id: int) -> dict:
@@ -1290,7 +2961,7 @@ class Database:
             """,
             (user_id, token, created_at, expires_at),
         )
-        self.conn.commit()
+        self.commit()
 
     def get_valid_password_reset_token(self, token: str) -> Optional[sqlite3.Row]:
         """Retrieve a valid (unused, unexpired) password reset token."""
@@ -1320,7 +2991,7 @@ class Database:
             "UPDATE password_reset_tokens SET used_at = ? WHERE token_id = ?",
             (datetime.now(), token_id),
         )
-        self.conn.commit()
+        self.commit()
 
     def update_user_password_hash(self, user_id: int, password_hash: str) -> None:
         """Update the stored password hash for a user."""
@@ -1329,7 +3000,7 @@ class Database:
             "UPDATE users SET password_hash = ? WHERE user_id = ?",
             (password_hash, user_id),
         )
-        self.conn.commit()
+        self.commit()
 
     # ============================================================================
     # Company Operations
@@ -1377,7 +3048,7 @@ class Database:
             (company_id, website, description, industry, size, headquarters,
              founded_year, employee_count, linkedin_url, glassdoor_url, notes)
         )
-        self.conn.commit()
+        self.commit()
 
     def add_company_note(
         self,
@@ -1395,7 +3066,7 @@ class Database:
             """,
             (user_id, company_id, note_text, rating, datetime.now(), datetime.now())
         )
-        self.conn.commit()
+        self.commit()
         return cur.lastrowid
 
     def get_company_notes(self, company_id: int, user_id: Optional[int] = None) -> List[sqlite3.Row]:
@@ -1448,7 +3119,7 @@ class Database:
                 f"UPDATE company_notes SET {', '.join(updates)} WHERE note_id = ?",
                 params
             )
-            self.conn.commit()
+            self.commit()
             return cur.rowcount > 0
         
         return False
@@ -1465,7 +3136,7 @@ class Database:
         
         cur.execute("DELETE FROM company_notes WHERE note_id = ?", (note_id,))
         deleted = cur.rowcount > 0
-        self.conn.commit()
+        self.commit()
         return deleted
 
     def get_company_analytics(self, company_id: int) -> Optional[sqlite3.Row]:
@@ -1489,17 +3160,19 @@ class Database:
         return cur.fetchall()
 
     def get_company_jobs(self, company_id: int, active_only: bool = True) -> List[sqlite3.Row]:
-        """Get all jobs for a company."""
+        """Get all jobs for a company.
+
+        Timestamps are stored epoch seconds and ``extra`` is packed (see
+        ``blobs.py``); callers convert them with ``from_epoch`` and
+        ``hydrate_extra``.
+        """
         cur = self.conn.cursor()
         query = """
-            SELECT j.*, v.title, v.location, v.remote, v.sector
+            SELECT j.job_id, j.company_id, j.url, j.source, j.first_seen,
+                   j.last_seen, j.removed_at, j.active,
+                   v.title, v.location, v.remote, v.sector, v.extra, v.is_new_grad
             FROM jobs j
-            JOIN job_versions v ON v.job_id = j.job_id
-            JOIN (
-                SELECT job_id, MAX(timestamp) AS max_ts
-                FROM job_versions
-                GROUP BY job_id
-            ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+            JOIN jobs_current v ON v.job_key = j.job_key
             WHERE j.company_id = ?
         """
         params: List[Any] = [company_id]
@@ -1531,7 +3204,7 @@ class Database:
             """,
             (user_id, notification_type, title, message, related_job_id, related_application_id, datetime.now())
         )
-        self.conn.commit()
+        self.commit()
         return cur.lastrowid
 
     def get_notifications(
@@ -1560,7 +3233,7 @@ class Database:
             "UPDATE notifications SET read = 1 WHERE notification_id = ? AND user_id = ?",
             (notification_id, user_id)
         )
-        self.conn.commit()
+        self.commit()
 
     def mark_all_notifications_read(self, user_id: int) -> None:
         """Mark all notifications as read"""
@@ -1569,7 +3242,7 @@ class Database:
             "UPDATE notifications SET read = 1 WHERE user_id = ? AND read = 0",
             (user_id,)
         )
-        self.conn.commit()
+        self.commit()
 
     def get_notification_preferences(self, user_id: int) -> sqlite3.Row:
         """Get notification preferences"""
@@ -1587,7 +3260,7 @@ class Database:
                 """,
                 (user_id,)
             )
-            self.conn.commit()
+            self.commit()
             cur.execute(
                 "SELECT * FROM notification_preferences WHERE user_id = ?",
                 (user_id,)
@@ -1638,7 +3311,7 @@ class Database:
             f"UPDATE notification_preferences SET {', '.join(updates)} WHERE user_id = ?",
             params
         )
-        self.conn.commit()
+        self.commit()
 
     def __enter__(self):
         return self
@@ -14,7 +14,7 @@ from datetime import datetime
 from pathlib import Path
 
 from ..collector import CompanyConfig, collect_jobs
-from ..db import Database
+from ..db import Database, format_timestamp
 from ..persistence import persist_snapshot
 
 
@@ -25,12 +25,12 @@ def print_db_summary(db: Database, title: str) -> None:
     print(f"Active jobs: {len(active)}")
     for row in active:
         print(
-            f"  {row['job_id']}: {row['company_name']} (active since {row['first_seen']}, last seen {row['last_seen']})"
+            f"  {row['job_id']}: {row['company_name']} (active since {format_timestamp(row['first_seen'])}, last seen {format_timestamp(row['last_seen'])})"
         )
     print(f"Removed jobs: {len(removed)}")
     for row in removed:
         print(
-            f"  {row['job_id']}: {row['company_name']} removed at {row['removed_at']}"
+            f"  {row['job_id']}: {row['company_name']} removed at {format_timestamp(row['removed_at'])}"
         )
 
 
@@ -12,8 +12,10 @@ which makes it easy to plug into a database or other storage backend.
 
 from __future__ import annotations
 
+import hashlib
 import re
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from .models import Job, JobSnapshot
 
@@ -35,6 +37,10 @@ class JobDiff:
 def compute_diff(old_snapshot: JobSnapshot, new_snapshot: JobSnapshot) -> Dict[str, List]:
     """Compute differences between two job snapshots.
 
+    Jobs in both snapshots are first checked with ``Job.same_content``
+    (one tuple comparison); field-by-field changes are only collected for
+    jobs that differ.
+
     Args:
         old_snapshot: The previous snapshot of jobs.
         new_snapshot: The current snapshot of jobs.
@@ -57,6 +63,9 @@ def compute_diff(old_snapshot: JobSnapshot, new_snapshot: JobSnapshot) -> Dict[s
             new_jobs.append(new_job)
         else:
             old_job = old_index[job_id]
+            # Most jobs are unchanged and stop here.
+            if old_job.same_content(new_job):
+                continue
             changes: Dict[str, Tuple] = {}
             # Compare fields of interest.
             for field in ["title", "location", "remote", "extra"]:
@@ -82,6 +91,12 @@ def compute_diff(old_snapshot: JobSnapshot, new_snapshot: JobSnapshot) -> Dict[s
 # New-grad classification
 # -------------------------
 
+# Version of the classification rules below. Bump it whenever a keyword
+# list, pattern or the decision logic changes: cached classifications of
+# older versions (see ``classification.py``) are then treated as misses
+# and recomputed as jobs are next ingested.
+CLASSIFIER_VERSION = 2
+
 _POSITIVE_TITLE_KEYWORDS = [
     # explicit early-career signals
     "new grad",
@@ -145,6 +160,9 @@ _RESEARCH_TITLE_KEYWORDS = [
     "researcher",
 ]
 
+# Metadata fields checked for seniority / early-career labels
+_METADATA_KEYS = ["experienceLevel", "experience_level", "seniority", "level", "typeOfEmployment", "employmentType"]
+
 # Hard negatives (requirements / description / metadata)
 _NEGATIVE_TEXT_PATTERNS = [
     r"\b[3-9]\+?\s*(?:years|yrs)\b",
@@ -168,39 +186,138 @@ _POSITIVE_TEXT_PATTERNS = [
 ]
 
 
-def _collect_text_blobs(job: Job) -> List[str]:
-    """Collect likely text fields from job.extra for scanning."""
-    blobs: List[str] = []
+# Common description keys across ATSes, scanned before the other fields
+_DESCRIPTION_KEYS = [
+    "description",
+    "descriptionPlain",
+    "openingPlain",
+    "jobDescription",
+    "job_description",
+    "qualifications",
+    "requirements",
+    "responsibilities",
+    "content",
+]
+
+# Characters of extra text scanned per job (the title is not counted).
+# Descriptions are a few thousand characters; anything past this is
+# boilerplate or a runaway field, and the signals appear early.
+MAX_SCAN_CHARS = 50_000
+
+# How deep nested lists/dicts in extra are walked for strings
+_MAX_DEPTH = 4
+
+
+def _text_fields(job: Job) -> List[str]:
+    """Return the text fields of ``job.extra`` scanned by the classifier.
+
+    Walks ``extra`` once, description keys first: strings nested in lists
+    and dicts (Lever ``categories``, Greenhouse ``metadata``) are taken
+    individually, other values (numbers, booleans, None) and URLs are
+    skipped, and a string seen before is not taken again. At most
+    ``MAX_SCAN_CHARS`` characters are returned, the last field truncated.
+    """
     if not job.extra:
-        return blobs
-
-    # Common description keys across ATSes
-    for key in [
-        "description",
-        "descriptionPlain",
-        "openingPlain",
-        "jobDescription",
-        "job_description",
-        "qualifications",
-        "requirements",
-        "responsibilities",
-        "content",
-    ]:
-        val = job.extra.get(key)
-        if val:
-            blobs.append(str(val))
-
-    # Also flatten values (best-effort) without going too deep
-    for v in job.extra.values():
-        if isinstance(v, list):
-            blobs.extend(str(item) for item in v if item is not None)
-        elif isinstance(v, dict):
-            blobs.extend(str(val) for val in v.values() if val is not None)
-        elif v is not None:
-            # scalar
-            blobs.append(str(v))
-
-    return blobs
+        return []
+    extra = job.extra
+    fields: List[str] = []
+    seen: Set[str] = set()
+    for key in _DESCRIPTION_KEYS:
+        if key in extra:
+            _add_strings(extra[key], _MAX_DEPTH, fields, seen)
+    for key, value in extra.items():
+        if key not in _DESCRIPTION_KEYS:
+            _add_strings(value, _MAX_DEPTH, fields, seen)
+
+    budget = MAX_SCAN_CHARS
+    for i, text in enumerate(fields):
+        if len(text) >= budget:
+            fields[i] = text[:budget]
+            del fields[i + 1 :]
+            break
+        budget -= len(text)
+    return fields
+
+
+def _add_strings(value: Any, depth: int, fields: List[str], seen: Set[str]) -> None:
+    """Append the new, non-blank, non-URL strings in ``value`` to ``fields``."""
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        value = (value,)
+    for item in value:
+        if isinstance(item, str):
+            if item and item not in seen and not item.isspace() and not item.startswith(("http://", "https://")):
+                seen.add(item)
+                fields.append(item)
+        elif depth and isinstance(item, (dict, list, tuple)):
+            _add_strings(item, depth - 1, fields, seen)
+
+
+def classifier_input_hash(job: Job) -> str:
+    """Return a digest of everything ``classify_new_grad`` reads from ``job``.
+
+    Covers the title, the text fields it scans and the metadata fields it
+    checks, so jobs with equal hashes get the same verdict and reasons.
+
+    Returns:
+        A 32-character hexadecimal string.
+    """
+    metadata = [job.extra.get(key) for key in _METADATA_KEYS] if job.extra else []
+    payload = "\x00".join([job.title or "", *_text_fields(job), repr(metadata)])
+    return hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()[:32]
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """Match ``keyword`` as whole words: "sr" matches "sr." but not "israel"."""
+    return rf"\b{re.escape(keyword)}\b"
+
+
+class _Matcher:
+    """Scan text once for many word-anchored patterns and report every hit.
+
+    ``groups`` maps a kind to its pattern list; every pattern starts with
+    ``\\b``. One alternation of all of them behind a shared ``\\b`` finds
+    the positions where any pattern starts. It is a lookahead, so a match
+    never hides another pattern starting inside it, and the engine only
+    enters the alternation at word starts. The individual patterns are
+    tried only at those (few) positions to tell which ones hit.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self._patterns: List[Tuple[str, int, "re.Pattern[str]"]] = []
+        for kind, patterns in groups.items():
+            for i, pat in enumerate(patterns):
+                if not pat.startswith(r"\b"):
+                    raise ValueError(f"Pattern must start at a word boundary: {pat}")
+                self._patterns.append((kind, i, re.compile(pat[2:])))
+        alternation = "|".join(f"(?:{compiled.pattern})" for _, _, compiled in self._patterns)
+        self._scanner = re.compile(rf"\b(?={alternation})")
+
+    def scan(self, text: str, hits: Optional[Dict[str, Set[int]]] = None) -> Dict[str, Set[int]]:
+        """Indices of the patterns hit in ``text``, per kind.
+
+        Pass the result of a previous call as ``hits`` to scan a document
+        field by field; hits are added to it.
+        """
+        if hits is None:
+            hits = {}
+        for m in self._scanner.finditer(text):
+            start = m.start()
+            for kind, i, compiled in self._patterns:
+                if compiled.match(text, start):
+                    hits.setdefault(kind, set()).add(i)
+        return hits
+
+
+_TITLE_MATCHER = _Matcher(
+    {
+        "negative": [_keyword_pattern(k) for k in _NEGATIVE_TITLE_KEYWORDS],
+        "research": [_keyword_pattern(k) for k in _RESEARCH_TITLE_KEYWORDS],
+        "positive": [_keyword_pattern(k) for k in _POSITIVE_TITLE_KEYWORDS],
+    }
+)
+_TEXT_MATCHER = _Matcher({"negative": _NEGATIVE_TEXT_PATTERNS, "positive": _POSITIVE_TEXT_PATTERNS})
 
 
 def classify_new_grad(job: Job) -> Tuple[bool, List[str]]:
@@ -210,43 +327,46 @@ def classify_new_grad(job: Job) -> Tuple[bool, List[str]]:
     - Reject >=3 YOE / PhD / postdoc requirements
     - Require at least one positive new-grad signal to return True
     - Research roles require explicit positive signal
+    Title keywords match whole words only. The title and the text are
+    each scanned once; where several keywords or patterns hit, the
+    reason names the first in its list.
     Returns (is_new_grad, reasons)
     """
     reasons: List[str] = []
     title = (job.title or "").lower()
+    title_hits = _TITLE_MATCHER.scan(title)
 
     # Title hard negatives
-    for bad in _NEGATIVE_TITLE_KEYWORDS:
-        if bad in title:
-            return False, [f'title contains "{bad}" (seniority)']
+    if "negative" in title_hits:
+        bad = _NEGATIVE_TITLE_KEYWORDS[min(title_hits["negative"])]
+        return False, [f'title contains "{bad}" (seniority)']
 
-    is_research_role = any(bad in title for bad in _RESEARCH_TITLE_KEYWORDS)
+    is_research_role = "research" in title_hits
 
-    # Build text to scan
-    text_blobs = [title] + [b.lower() for b in _collect_text_blobs(job)]
-    full_text = "\n".join(text_blobs)
+    # Scan the title and extra text fields one at a time
+    text_hits = _TEXT_MATCHER.scan(title)
+    for text in _text_fields(job):
+        _TEXT_MATCHER.scan(text.lower(), text_hits)
 
     # Hard negative requirement patterns
-    for pat in _NEGATIVE_TEXT_PATTERNS:
-        if re.search(pat, full_text):
-            return False, [f"matched negative requirement pattern: {pat}"]
+    if "negative" in text_hits:
+        pat = _NEGATIVE_TEXT_PATTERNS[min(text_hits["negative"])]
+        return False, [f"matched negative requirement pattern: {pat}"]
 
     # Positive evidence
     positive_hits: List[str] = []
 
-    for good in _POSITIVE_TITLE_KEYWORDS:
-        if good in title:
-            positive_hits.append(f'title contains "{good}"')
-            break
+    if "positive" in title_hits:
+        good = _POSITIVE_TITLE_KEYWORDS[min(title_hits["positive"])]
+        positive_hits.append(f'title contains "{good}"')
 
-    for pat in _POSITIVE_TEXT_PATTERNS:
-        if re.search(pat, full_text):
-            positive_hits.append(f"matched positive requirement pattern: {pat}")
-            break
+    if "positive" in text_hits:
+        pat = _POSITIVE_TEXT_PATTERNS[min(text_hits["positive"])]
+        positive_hits.append(f"matched positive requirement pattern: {pat}")
 
     # Metadata signals (best-effort)
     if job.extra:
-        for key in ["experienceLevel", "experience_level", "seniority", "level", "typeOfEmployment", "employmentType"]:
+        for key in _METADATA_KEYS:
             val = job.extra.get(key)
             if isinstance(val, dict):
                 lab = (val.get("label") or val.get("name") or "").lower()
@@ -275,6 +395,41 @@ def classify_new_grad(job: Job) -> Tuple[bool, List[str]]:
     return True, reasons
 
 
+def classify_many(
+    jobs: Iterable[Job],
+    processes: int = 0,
+    chunk_size: int = 1000,
+    dedupe: bool = True,
+) -> List[Tuple[bool, List[str]]]:
+    """Classify many jobs; results are aligned with ``jobs``.
+
+    Jobs with equal ``classifier_input_hash`` are classified once (pass
+    ``dedupe=False`` when the caller already made them unique) and share
+    one result. With ``processes`` > 1, chunks of ``chunk_size`` jobs are
+    spread over a process pool; each worker compiles the matchers once,
+    at import. Worth it only for tens of thousands of jobs on several
+    cores: jobs and results are pickled across processes.
+    """
+    jobs = list(jobs)
+    if dedupe:
+        keys = [classifier_input_hash(job) for job in jobs]
+        unique: Dict[str, Job] = {}
+        for job, key in zip(jobs, keys):
+            unique.setdefault(key, job)
+        results = dict(zip(unique, classify_many(list(unique.values()), processes, chunk_size, dedupe=False)))
+        return [results[key] for key in keys]
+
+    if processes <= 1 or len(jobs) <= chunk_size:
+        return _classify_chunk(jobs)
+    chunks = [jobs[i : i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return [result for chunk in pool.map(_classify_chunk, chunks) for result in chunk]
+
+
+def _classify_chunk(jobs: List[Job]) -> List[Tuple[bool, List[str]]]:
+    return [classify_new_grad(job) for job in jobs]
+
+
 def is_new_grad(job: Job) -> bool:
     """Backwards-compatible boolean wrapper."""
     return classify_new_grad(job)[0]
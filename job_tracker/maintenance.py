@@ -0,0 +1,529 @@
+"""
+Retention and compaction for the job tracker database.
+
+Without maintenance the database only grows: every run adds a snapshot,
+and auth and notification rows are never cleaned up. ``run_maintenance``
+applies a ``RetentionPolicy``:
+
+- thin old snapshots, keeping every snapshot for a recent window, one
+  daily anchor for a longer window and one weekly anchor beyond that;
+- drop membership intervals that no longer cover any kept snapshot, merge
+  intervals that have become adjacent, and collapse consecutive versions
+  of a job with identical content;
+- delete versions nothing references any more, and the description
+  blobs (see ``blobs.py``) only they used. Intervals moved to the
+  archive (see ``archive.py``) count as references: versions they use
+  are neither deleted nor collapsed;
+- prune expired sessions, spent password reset tokens and old read
+  notifications;
+- drop cached classifications of older classifier versions or unused
+  for a while (see ``classification.py``);
+- return free pages to the OS with ``PRAGMA incremental_vacuum``.
+
+All work is done in small batches, each in its own short ``BEGIN
+IMMEDIATE`` transaction, so API readers and the collector are never
+blocked for long. Run it from the CLI (``job_tracker/cli/maintenance.py``)
+or from the scheduler (``run_live.py --maintenance-every N``).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .archive import ARCHIVE_SCHEMA_NAME, archive_path_for, attach_archive, is_archive_attached
+from .db import USER_SCHEMA_NAME, Database, from_epoch, immediate_transaction, to_epoch
+from .diff_engine import CLASSIFIER_VERSION
+from .models import content_hash
+
+
+@dataclass
+class RetentionPolicy:
+    """How much history to keep.
+
+    Attributes:
+        keep_all_days: Keep every snapshot younger than this.
+        keep_daily_days: Beyond that, keep the first snapshot of each day
+            younger than this.
+        keep_weekly_days: Beyond that, keep the first snapshot of each ISO
+            week younger than this. ``None`` keeps weekly anchors forever.
+        read_notification_days: Delete read notifications older than this.
+        classification_cache_days: Delete cached classifications not used
+            for this long.
+        batch_size: Rows (or jobs) handled per transaction.
+        vacuum_pages: Pages freed per ``incremental_vacuum`` step.
+    """
+
+    keep_all_days: int = 14
+    keep_daily_days: int = 90
+    keep_weekly_days: Optional[int] = None
+    read_notification_days: int = 90
+    classification_cache_days: int = 30
+    batch_size: int = 2000
+    vacuum_pages: int = 1000
+
+
+@dataclass
+class MaintenanceReport:
+    snapshots_deleted: int = 0
+    intervals_dropped: int = 0
+    intervals_merged: int = 0
+    versions_collapsed: int = 0
+    versions_deleted: int = 0
+    blobs_deleted: int = 0
+    sessions_deleted: int = 0
+    reset_tokens_deleted: int = 0
+    notifications_deleted: int = 0
+    classifications_deleted: int = 0
+    pages_vacuumed: int = 0
+    notes: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"snapshots_deleted={self.snapshots_deleted} intervals_dropped={self.intervals_dropped} "
+            f"intervals_merged={self.intervals_merged} versions_collapsed={self.versions_collapsed} "
+            f"versions_deleted={self.versions_deleted} blobs_deleted={self.blobs_deleted} "
+            f"sessions_deleted={self.sessions_deleted} "
+            f"reset_tokens_deleted={self.reset_tokens_deleted} "
+            f"notifications_deleted={self.notifications_deleted} "
+            f"classifications_deleted={self.classifications_deleted} pages_vacuumed={self.pages_vacuumed}"
+        )
+
+
+def run_maintenance(
+    db: Database,
+    policy: RetentionPolicy | None = None,
+    now: datetime | None = None,
+    vacuum: bool = True,
+    archive_path: Optional[Path] = None,
+) -> MaintenanceReport:
+    """Apply ``policy`` to ``db`` and return what was done.
+
+    ``archive_path`` is the archive file, if not the default next to
+    ``db`` (see ``archive_path_for``).
+    """
+    policy = policy or RetentionPolicy()
+    now = now or datetime.now(timezone.utc)
+    report = MaintenanceReport()
+
+    report.snapshots_deleted = thin_snapshots(db, policy, now)
+    report.intervals_dropped = drop_uncovered_intervals(db, policy)
+    collapsed, merged, deleted = compact_jobs(db, policy, archive_path)
+    report.versions_collapsed = collapsed
+    report.intervals_merged = merged
+    report.versions_deleted = deleted
+    report.blobs_deleted = prune_blobs(db, policy)
+    sessions, tokens, notifications = prune_user_rows(db, policy, now)
+    report.sessions_deleted = sessions
+    report.reset_tokens_deleted = tokens
+    report.notifications_deleted = notifications
+    report.classifications_deleted = prune_classification_cache(db, policy, now)
+
+    if vacuum:
+        if db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            report.pages_vacuumed = incremental_vacuum(db, policy.vacuum_pages)
+        else:
+            report.notes.append(
+                "auto_vacuum is not INCREMENTAL; run with --enable-incremental-vacuum once to convert"
+            )
+        # The user database is always created with auto_vacuum=INCREMENTAL.
+        report.pages_vacuumed += incremental_vacuum(db, policy.vacuum_pages, USER_SCHEMA_NAME)
+    db.conn.execute("PRAGMA optimize")
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return report
+
+
+# --- snapshots -------------------------------------------------------------
+
+def snapshots_to_delete(
+    snapshots: List[Tuple[int, datetime]],
+    policy: RetentionPolicy,
+    now: datetime,
+    protected: Set[int] = frozenset(),
+) -> List[int]:
+    """Return ids of snapshots the policy does not keep.
+
+    ``snapshots`` is ``(snapshot_id, timestamp)`` in id order. The newest
+    snapshot and ``protected`` ids are always kept.
+    """
+    if not snapshots:
+        return []
+    keep_all_after = now - timedelta(days=policy.keep_all_days)
+    daily_after = now - timedelta(days=policy.keep_daily_days)
+    weekly_after = (
+        now - timedelta(days=policy.keep_weekly_days) if policy.keep_weekly_days is not None else None
+    )
+
+    seen_days: Set[object] = set()
+    seen_weeks: Set[Tuple[int, int]] = set()
+    doomed: List[int] = []
+    for snapshot_id, ts in snapshots:
+        day = ts.date()
+        week = tuple(ts.isocalendar())[:2]
+        if ts >= keep_all_after:
+            keep = True
+        elif ts >= daily_after:
+            keep = day not in seen_days
+        elif weekly_after is None or ts >= weekly_after:
+            keep = week not in seen_weeks
+        else:
+            keep = False
+        seen_days.add(day)
+        seen_weeks.add(week)
+        if not keep and snapshot_id not in protected:
+            doomed.append(snapshot_id)
+
+    latest_id = snapshots[-1][0]
+    return [sid for sid in doomed if sid != latest_id]
+
+
+def plan_snapshot_thinning(db: Database, policy: RetentionPolicy, now: datetime) -> List[int]:
+    """Return ids of the snapshots ``thin_snapshots`` would delete."""
+    rows = db.conn.execute("SELECT snapshot_id, timestamp FROM snapshots ORDER BY snapshot_id").fetchall()
+    snapshots = [(int(r[0]), from_epoch(r[1])) for r in rows]
+    return snapshots_to_delete(snapshots, policy, now, protected=_digest_checkpoints(db.conn))
+
+
+def thin_snapshots(db: Database, policy: RetentionPolicy, now: datetime) -> int:
+    """Delete snapshots outside the retention anchors; return the count."""
+    doomed = plan_snapshot_thinning(db, policy, now)
+    for batch in _chunks(doomed, policy.batch_size):
+        with immediate_transaction(db.conn):
+            placeholders = ",".join("?" for _ in batch)
+            db.conn.execute(f"DELETE FROM snapshots WHERE snapshot_id IN ({placeholders})", batch)
+    return len(doomed)
+
+
+def _digest_checkpoints(conn: sqlite3.Connection) -> Set[int]:
+    """Snapshots referenced by the email digest checkpoint table, if present."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='digests'").fetchone()
+    if not exists:
+        return set()
+    rows = conn.execute(
+        "SELECT end_snapshot_id FROM digests ORDER BY digest_id DESC LIMIT 1"
+    ).fetchall()
+    return {int(r[0]) for r in rows if r[0] is not None}
+
+
+def drop_uncovered_intervals(db: Database, policy: RetentionPolicy) -> int:
+    """Delete membership intervals that no longer span any kept snapshot."""
+    dropped = 0
+    last_id = 0
+    while True:
+        with immediate_transaction(db.conn):
+            bounds = db.conn.execute(
+                """
+                SELECT MIN(membership_id), MAX(membership_id) FROM (
+                    SELECT membership_id FROM snapshot_membership
+                    WHERE membership_id > ? ORDER BY membership_id LIMIT ?
+                )
+                """,
+                (last_id, policy.batch_size),
+            ).fetchone()
+            if bounds[0] is None:
+                break
+            cur = db.conn.execute(
+                """
+                DELETE FROM snapshot_membership
+                WHERE membership_id BETWEEN ? AND ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM snapshots s
+                      WHERE s.snapshot_id BETWEEN first_snapshot_id AND last_snapshot_id
+                  )
+                """,
+                bounds,
+            )
+            dropped += cur.rowcount
+            last_id = bounds[1]
+    return dropped
+
+
+# --- per-job compaction ----------------------------------------------------
+
+def compact_jobs(
+    db: Database, policy: RetentionPolicy, archive_path: Optional[Path] = None
+) -> Tuple[int, int, int]:
+    """Drop orphan versions, collapse duplicate versions and merge intervals.
+
+    Jobs are processed in ``policy.batch_size`` groups by job_key, one short
+    transaction per group. If the archive exists its tables are attached,
+    and versions that archived intervals use are left in place.
+
+    Returns:
+        ``(versions_collapsed, intervals_merged, versions_deleted)``.
+    """
+    snapshot_ids = [
+        int(r[0]) for r in db.conn.execute("SELECT snapshot_id FROM snapshots ORDER BY snapshot_id")
+    ]
+    archived = _attach_archive(db, archive_path)
+    collapsed = merged = deleted = 0
+    last_job = 0
+    while True:
+        with immediate_transaction(db.conn):
+            job_keys = [
+                r[0]
+                for r in db.conn.execute(
+                    "SELECT job_key FROM jobs WHERE job_key > ? ORDER BY job_key LIMIT ?",
+                    (last_job, policy.batch_size),
+                )
+            ]
+            if not job_keys:
+                break
+            lo, hi = job_keys[0], job_keys[-1]
+            deleted += _delete_orphan_versions(db.conn, lo, hi, archived)
+            collapsed += _collapse_versions(db.conn, lo, hi, archived)
+            merged += _merge_intervals(db.conn, lo, hi, snapshot_ids)
+            last_job = hi
+    return collapsed, merged, deleted
+
+
+def _attach_archive(db: Database, archive_path: Optional[Path] = None) -> bool:
+    """Attach the archive's tables if the file exists; True if attached.
+
+    Only the tables: the history views would shadow the hot tables that
+    compaction rewrites.
+    """
+    if is_archive_attached(db):
+        return True
+    path = Path(archive_path) if archive_path is not None else archive_path_for(db.db_path)
+    return path.exists() and attach_archive(db, path, history=False)
+
+
+def _archived_version_ids(conn: sqlite3.Connection, lo: int, hi: int) -> Set[int]:
+    """Versions of jobs ``lo``..``hi`` that archived intervals use."""
+    rows = conn.execute(
+        f"SELECT DISTINCT version_id FROM {ARCHIVE_SCHEMA_NAME}.snapshot_membership WHERE job_key BETWEEN ? AND ?",
+        (lo, hi),
+    )
+    return {r[0] for r in rows}
+
+
+def _collapse_versions(conn: sqlite3.Connection, lo: int, hi: int, archived: bool = False) -> int:
+    """Point references to a version at its identical predecessor and delete it.
+
+    Versions that archived intervals use are kept: repointing those would
+    write both files, and a commit is only atomic per file.
+    """
+    rows = conn.execute(
+        """
+        SELECT version_id, job_key, title, location, remote, extra
+        FROM job_versions WHERE job_key BETWEEN ? AND ?
+        ORDER BY job_key, version_id
+        """,
+        (lo, hi),
+    ).fetchall()
+    pinned = _archived_version_ids(conn, lo, hi) if archived else set()
+    remap: Dict[int, int] = {}
+    prev_job, prev_hash, canonical = None, None, None
+    for version_id, job_key, title, location, remote, extra in rows:
+        digest = content_hash(title, location, remote, extra)
+        if job_key != prev_job or digest != prev_hash:
+            canonical = version_id
+        elif version_id not in pinned:
+            remap[version_id] = canonical
+        prev_job, prev_hash = job_key, digest
+    if not remap:
+        return 0
+
+    pairs = [(new, old) for old, new in remap.items()]
+    conn.executemany("UPDATE snapshot_membership SET version_id=? WHERE version_id=?", pairs)
+    conn.executemany("UPDATE jobs_current SET version_id=? WHERE version_id=?", pairs)
+    conn.executemany("DELETE FROM job_versions WHERE version_id=?", [(old,) for old in remap])
+    return len(remap)
+
+
+def _merge_intervals(conn: sqlite3.Connection, lo: int, hi: int, snapshot_ids: List[int]) -> int:
+    """Merge a job's intervals with the same version/flag/reasons and no kept snapshot between them."""
+    rows = conn.execute(
+        """
+        SELECT membership_id, job_key, version_id, is_new_grad, reasons_id, first_snapshot_id, last_snapshot_id
+        FROM snapshot_membership WHERE job_key BETWEEN ? AND ?
+        ORDER BY job_key, first_snapshot_id
+        """,
+        (lo, hi),
+    ).fetchall()
+    merged = 0
+    prev = None
+    for row in rows:
+        membership_id, job_key, version_id, flag, reasons_id, first, last = row
+        if (
+            prev is not None
+            and prev[1] == job_key
+            and prev[2] == version_id
+            and prev[3] == flag
+            and prev[4] == reasons_id
+            and not _snapshot_between(snapshot_ids, prev[6], first)
+        ):
+            new_last = max(prev[6], last)
+            conn.execute(
+                "UPDATE snapshot_membership SET last_snapshot_id=? WHERE membership_id=?",
+                (new_last, prev[0]),
+            )
+            conn.execute("DELETE FROM snapshot_membership WHERE membership_id=?", (membership_id,))
+            prev = (prev[0], job_key, version_id, flag, reasons_id, prev[5], new_last)
+            merged += 1
+        else:
+            prev = tuple(row)
+    return merged
+
+
+def _snapshot_between(snapshot_ids: List[int], after: int, before: int) -> bool:
+    """True if a snapshot id lies strictly between ``after`` and ``before``."""
+    i = bisect_right(snapshot_ids, after)
+    return i < len(snapshot_ids) and snapshot_ids[i] < before
+
+
+def _delete_orphan_versions(conn: sqlite3.Connection, lo: int, hi: int, archived: bool = False) -> int:
+    archived_refs = (
+        f"AND NOT EXISTS (SELECT 1 FROM {ARCHIVE_SCHEMA_NAME}.snapshot_membership a "
+        "WHERE a.version_id = job_versions.version_id)"
+        if archived
+        else ""
+    )
+    cur = conn.execute(
+        f"""
+        DELETE FROM job_versions
+        WHERE job_key BETWEEN ? AND ?
+          AND NOT EXISTS (SELECT 1 FROM snapshot_membership m WHERE m.version_id = job_versions.version_id)
+          AND NOT EXISTS (SELECT 1 FROM jobs_current jc WHERE jc.version_id = job_versions.version_id)
+          {archived_refs}
+        """,
+        (lo, hi),
+    )
+    return cur.rowcount
+
+
+# --- blobs -----------------------------------------------------------------
+
+_BLOB_REFS_SQL = """
+    SELECT DISTINCT json_extract(e.value, '$."$blob"')
+    FROM job_versions v, json_each(v.extra) e
+    WHERE json_valid(v.extra) AND e.type = 'object' AND v.version_id {cmp} ?
+      AND json_extract(e.value, '$."$blob"') IS NOT NULL
+"""
+
+
+def prune_blobs(db: Database, policy: RetentionPolicy) -> int:
+    """Delete blobs no version references.
+
+    References are collected without holding the write lock; each delete
+    batch re-checks versions written since, so a concurrent ingest that
+    reuses a blob is never left dangling. The newest blob is always kept
+    so rowids are never reused (the Parquet export appends by rowid).
+    """
+    high_water = db.conn.execute("SELECT COALESCE(MAX(version_id), 0) FROM job_versions").fetchone()[0]
+    referenced = {r[0] for r in db.conn.execute(_BLOB_REFS_SQL.format(cmp="<="), (high_water,))}
+    candidates = [
+        r[0]
+        for r in db.conn.execute("SELECT hash FROM blobs WHERE rowid < (SELECT MAX(rowid) FROM blobs)")
+        if r[0] not in referenced
+    ]
+    deleted = 0
+    for batch in _chunks(candidates, policy.batch_size):
+        with immediate_transaction(db.conn):
+            recent = {r[0] for r in db.conn.execute(_BLOB_REFS_SQL.format(cmp=">"), (high_water,))}
+            doomed = [key for key in batch if key not in recent]
+            db.conn.executemany("DELETE FROM blobs WHERE hash=?", [(key,) for key in doomed])
+            deleted += len(doomed)
+    return deleted
+
+
+# --- user rows -------------------------------------------------------------
+
+def prune_user_rows(db: Database, policy: RetentionPolicy, now: datetime) -> Tuple[int, int, int]:
+    """Delete expired sessions, spent reset tokens and old read notifications.
+
+    These tables store naive local timestamps, so the cutoff is compared
+    in local time.
+    """
+    local_now = now.astimezone().replace(tzinfo=None)
+    sessions = _delete_in_batches(
+        db.conn, "user_sessions", "expires_at < ?", (local_now,), policy.batch_size
+    )
+    tokens = _delete_in_batches(
+        db.conn,
+        "password_reset_tokens",
+        "used_at IS NOT NULL OR expires_at < ?",
+        (local_now,),
+        policy.batch_size,
+    )
+    notifications = _delete_in_batches(
+        db.conn,
+        "notifications",
+        "read = 1 AND created_at < ?",
+        (local_now - timedelta(days=policy.read_notification_days),),
+        policy.batch_size,
+    )
+    return sessions, tokens, notifications
+
+
+def prune_classification_cache(db: Database, policy: RetentionPolicy, now: datetime) -> int:
+    """Delete cached classifications of other classifier versions or unused for too long."""
+    cutoff = to_epoch(now - timedelta(days=policy.classification_cache_days))
+    return _delete_in_batches(
+        db.conn,
+        "classification_cache",
+        "classifier_version <> ? OR last_used < ?",
+        (CLASSIFIER_VERSION, cutoff),
+        policy.batch_size,
+        key="input_hash",
+    )
+
+
+def _delete_in_batches(
+    conn: sqlite3.Connection, table: str, where: str, params: Tuple, batch_size: int, key: str = "rowid"
+) -> int:
+    total = 0
+    while True:
+        with immediate_transaction(conn):
+            cur = conn.execute(
+                f"DELETE FROM {table} WHERE {key} IN (SELECT {key} FROM {table} WHERE {where} LIMIT ?)",
+                (*params, batch_size),
+            )
+        total += cur.rowcount
+        if cur.rowcount < batch_size:
+            return total
+
+
+# --- vacuum ----------------------------------------------------------------
+
+def incremental_vacuum(db: Database, pages_per_step: int, schema: str = "main") -> int:
+    """Free pages of ``schema`` in ``pages_per_step`` chunks, each its own short write.
+
+    Uses ``executescript`` because the sqlite3 module stops stepping this
+    pragma after the first page when run through ``execute``.
+    """
+    initial = db.conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+    free = initial
+    while free:
+        db.conn.executescript(f"PRAGMA {schema}.incremental_vacuum({int(pages_per_step)})")
+        remaining = db.conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+        if remaining >= free:
+            break
+        free = remaining
+    return initial - free
+
+
+def enable_incremental_vacuum(db: Database) -> bool:
+    """Switch an existing database to ``auto_vacuum=INCREMENTAL``.
+
+    Needs one full ``VACUUM``, which rewrites the file under an exclusive
+    lock, so this is an explicit one-off step. Returns True if converted.
+    """
+    if db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return False
+    db.conn.commit()
+    db.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    db.conn.execute("VACUUM")
+    return True
+
+
+# --- helpers ---------------------------------------------------------------
+
+def _chunks(items: List[int], size: int) -> Iterator[List[int]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
@@ -36,6 +36,28 @@ def stable_job_id(company: str, url: str) -> str:
     return hashlib.sha256(f"{company}|{url}".encode("utf-8")).hexdigest()[:24]
 
 
+def content_hash(
+    title: str,
+    location: Optional[str],
+    remote: Optional[int],
+    extra_json: Optional[str],
+) -> str:
+    """Return a digest of a job version's stored content.
+
+    Ingest compares it against the job's current hash and only records a
+    new version when they differ. Inputs are the values as stored in
+    ``job_versions`` (remote as 1/0/None, extra as serialized JSON) so the
+    hash can be recomputed from the database.
+
+    Returns:
+        A 32-character hexadecimal string.
+    """
+    payload = "\x1f".join(
+        [title or "", location or "", "" if remote is None else str(int(remote)), extra_json or ""]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
 @dataclass
 class Job:
     """Represents a single job posting.
@@ -62,6 +84,19 @@ class Job:
     posted_at: Optional[str] = None
     extra: Dict[str, str] = field(default_factory=dict)
 
+    def same_content(self, other: "Job") -> bool:
+        """True if title, location, remote and extra equal ``other``'s.
+
+        One tuple comparison, so equal jobs are settled without building
+        a per-field change map.
+        """
+        return (self.title, self.location, self.remote, self.extra) == (
+            other.title,
+            other.location,
+            other.remote,
+            other.extra,
+        )
+
     def to_dict(self) -> Dict[str, Optional[str]]:
         """Serialize the job to a dictionary.
 
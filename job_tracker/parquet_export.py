@@ -0,0 +1,248 @@
+"""
+Incremental Parquet export of job history for offline analytics.
+
+Long analytical scans over ``live_jobs.db`` compete with the API and the
+collector for the same file. ``export_parquet`` copies the history into a
+directory of Parquet datasets (Hive-style ``key=value`` partitions) that
+pandas, DuckDB, Polars or Spark can read directly::
+
+    <out>/companies/companies.parquet                       rewritten each run
+    <out>/jobs/jobs.parquet                                 rewritten each run
+    <out>/snapshots/snapshot_date=D/snapshot-<id>.parquet
+    <out>/snapshot_jobs/snapshot_date=D/company_id=C/snapshot-<id>.parquet
+    <out>/job_versions/version_date=D/versions-<first id>.parquet
+    <out>/blobs/blobs-<first rowid>.parquet
+
+``snapshot_jobs`` is membership expanded to one row per (snapshot, job).
+That is what analysts want, and dictionary encoding keeps it small on disk.
+Snapshots, versions and blobs never change once written, so each run only
+appends rows past the watermarks kept in ``<out>/_export_state.json``.
+File names are derived from the watermark, so a run that fails before
+saving the state is simply redone by the next one. ``companies`` and
+``jobs`` are small, mutable dimensions and are rewritten.
+
+History moved to the archive file (``job_tracker.archive``) is included
+when the archive is attached with ``attach_archive`` before exporting.
+
+pyarrow is an optional dependency, imported only when an export runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .archive import ARCHIVE_SCHEMA_NAME, is_archive_attached
+from .db import Database, from_epoch
+
+STATE_FILE = "_export_state.json"
+
+
+@dataclass
+class ExportState:
+    snapshot_id: int = 0
+    version_id: int = 0
+    blob_rowid: int = 0
+
+
+@dataclass
+class ExportReport:
+    snapshots: int = 0
+    memberships: int = 0
+    versions: int = 0
+    blobs: int = 0
+    jobs: int = 0
+    companies: int = 0
+
+    def summary(self) -> str:
+        return " ".join(f"{name}={value}" for name, value in asdict(self).items())
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "Parquet export requires pyarrow. Install it with: pip install pyarrow"
+        ) from exc
+    return pyarrow, pyarrow.parquet
+
+
+def load_state(out_dir: Path) -> ExportState:
+    path = out_dir / STATE_FILE
+    if not path.exists():
+        return ExportState()
+    return ExportState(**json.loads(path.read_text(encoding="utf-8")))
+
+
+def _save_state(out_dir: Path, state: ExportState) -> None:
+    tmp = out_dir / (STATE_FILE + ".tmp")
+    tmp.write_text(json.dumps(asdict(state)), encoding="utf-8")
+    os.replace(tmp, out_dir / STATE_FILE)
+
+
+def export_parquet(db: Database, out_dir: Path, batch_size: int = 50_000) -> ExportReport:
+    """Append everything new since the last export to ``out_dir``.
+
+    Args:
+        db: Source database.
+        out_dir: Export root; created if missing.
+        batch_size: Versions/blobs read per query.
+
+    Returns:
+        Counts of rows written by this run.
+    """
+    pa, pq = _require_pyarrow()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state = load_state(out_dir)
+    report = ExportReport()
+    # Fix the snapshot range first: versions are committed with their
+    # snapshot, so every version those snapshots reference is read below.
+    last_snapshot = db.conn.execute("SELECT COALESCE(MAX(snapshot_id), 0) FROM snapshots").fetchone()[0]
+    ts_type = pa.timestamp("us", tz="UTC")
+
+    def write(table_rows: List[Dict[str, Any]], schema, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(pa.Table.from_pylist(table_rows, schema=schema), tmp, compression="zstd")
+        os.replace(tmp, path)
+
+    # Dimensions: small and mutable, rewritten each run.
+    companies = [dict(r) for r in db.conn.execute("SELECT id, slug, name, source FROM companies")]
+    write(
+        companies,
+        pa.schema([("id", pa.int64()), ("slug", pa.string()), ("name", pa.string()), ("source", pa.string())]),
+        out_dir / "companies" / "companies.parquet",
+    )
+    report.companies = len(companies)
+
+    jobs = [
+        {**dict(r), "first_seen": from_epoch(r["first_seen"]), "last_seen": from_epoch(r["last_seen"]),
+         "removed_at": from_epoch(r["removed_at"])}
+        for r in db.conn.execute(
+            "SELECT job_id, company_id, url, source, first_seen, last_seen, removed_at, active FROM jobs"
+        )
+    ]
+    write(
+        jobs,
+        pa.schema([
+            ("job_id", pa.string()), ("company_id", pa.int64()), ("url", pa.string()),
+            ("source", pa.string()), ("first_seen", ts_type), ("last_seen", ts_type),
+            ("removed_at", ts_type), ("active", pa.int8()),
+        ]),
+        out_dir / "jobs" / "jobs.parquet",
+    )
+    report.jobs = len(jobs)
+
+    # Versions, appended past the watermark and partitioned by date.
+    version_schema = pa.schema([
+        ("version_id", pa.int64()), ("job_id", pa.string()), ("timestamp", ts_type),
+        ("title", pa.string()), ("location", pa.string()), ("remote", pa.int8()),
+        ("sector", pa.string()), ("extra", pa.string()),
+    ])
+    by_date: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    first_version = state.version_id + 1
+    while True:
+        rows = db.conn.execute(
+            """
+            SELECT v.version_id, j.job_id, v.timestamp, v.title, v.location, v.remote, v.sector, v.extra
+            FROM job_versions v JOIN jobs j ON j.job_key = v.job_key
+            WHERE v.version_id > ? ORDER BY v.version_id LIMIT ?
+            """,
+            (state.version_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        for r in rows:
+            row = dict(r)
+            row["timestamp"] = from_epoch(row["timestamp"])
+            by_date[row["timestamp"].date().isoformat()].append(row)
+        state.version_id = rows[-1]["version_id"]
+        report.versions += len(rows)
+    for day, rows in by_date.items():
+        write(rows, version_schema, out_dir / "job_versions" / f"version_date={day}" / f"versions-{first_version}.parquet")
+
+    # Blobs referenced by version extras, stored decompressed. The
+    # watermark is the hot table's rowid; a first export also picks up
+    # blobs that only the archive still has.
+    blob_schema = pa.schema([("hash", pa.string()), ("value", pa.string())])
+    blob_rows: List[Dict[str, Any]] = []
+    first_blob = state.blob_rowid + 1
+    if first_blob == 1 and is_archive_attached(db):
+        blob_rows.extend(
+            {"hash": r[0], "value": zlib.decompress(r[1]).decode("utf-8")}
+            for r in db.conn.execute(
+                f"""
+                SELECT hash, data FROM {ARCHIVE_SCHEMA_NAME}.blobs a
+                WHERE NOT EXISTS (SELECT 1 FROM main.blobs h WHERE h.hash = a.hash)
+                """
+            )
+        )
+    while True:
+        rows = db.conn.execute(
+            "SELECT rowid, hash, data FROM main.blobs WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (state.blob_rowid, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        blob_rows.extend({"hash": r[1], "value": zlib.decompress(r[2]).decode("utf-8")} for r in rows)
+        state.blob_rowid = rows[-1][0]
+    if blob_rows:
+        write(blob_rows, blob_schema, out_dir / "blobs" / f"blobs-{first_blob}.parquet")
+        report.blobs = len(blob_rows)
+
+    # Snapshots and their membership, one file per snapshot and partition.
+    snapshot_schema = pa.schema([("snapshot_id", pa.int64()), ("timestamp", ts_type), ("run_id", pa.int64())])
+    member_schema = pa.schema([
+        ("snapshot_id", pa.int64()), ("job_id", pa.string()), ("version_id", pa.int64()),
+        ("is_new_grad", pa.int8()),
+    ])
+    snapshots = db.conn.execute(
+        """
+        SELECT snapshot_id, timestamp, run_id FROM snapshots
+        WHERE snapshot_id > ? AND snapshot_id <= ? ORDER BY snapshot_id
+        """,
+        (state.snapshot_id, last_snapshot),
+    ).fetchall()
+    for snap in snapshots:
+        snapshot_id = snap["snapshot_id"]
+        ts = from_epoch(snap["timestamp"])
+        day = ts.date().isoformat()
+        by_company: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for r in db.conn.execute(
+            """
+            SELECT sj.job_id, sj.version_id, sj.is_new_grad, j.company_id
+            FROM snapshot_jobs sj
+            JOIN jobs j ON j.job_key = sj.job_key
+            WHERE sj.snapshot_id = ?
+            """,
+            (snapshot_id,),
+        ):
+            by_company[r["company_id"]].append(
+                {"snapshot_id": snapshot_id, "job_id": r["job_id"], "version_id": r["version_id"],
+                 "is_new_grad": r["is_new_grad"]}
+            )
+        for company_id, rows in by_company.items():
+            write(
+                rows,
+                member_schema,
+                out_dir / "snapshot_jobs" / f"snapshot_date={day}" / f"company_id={company_id}"
+                / f"snapshot-{snapshot_id}.parquet",
+            )
+            report.memberships += len(rows)
+        write(
+            [{"snapshot_id": snapshot_id, "timestamp": ts, "run_id": snap["run_id"]}],
+            snapshot_schema,
+            out_dir / "snapshots" / f"snapshot_date={day}" / f"snapshot-{snapshot_id}.parquet",
+        )
+        state.snapshot_id = snapshot_id
+        report.snapshots += 1
+
+    _save_state(out_dir, state)
+    return report
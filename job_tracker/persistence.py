@@ -3,29 +3,46 @@ Persistence utilities to ingest collected jobs into the database.
 
 This module takes the list of jobs produced by the collector and writes
 them into the database schema defined in ``db.py``. It handles
-insertion of companies, jobs, versions, and snapshot associations. It
-also updates the ``active`` and ``removed_at`` flags on jobs that are
-no longer present in the latest snapshot.
+insertion of companies, jobs, versions, and snapshot associations, and
+keeps the ``jobs_current`` read model pointed at each job's latest
+version. It also updates the ``active`` and ``removed_at`` flags on jobs that are
+no longer present in the latest snapshot. Large ``extra`` fields such as
+descriptions are moved to the compressed blob store (see ``blobs.py``).
+Jobs are classified through the classification cache, so only new or
+changed postings run the classifier (see ``classification.py``), and the
+reasons are stored with the flag so reports and the API can show them
+without classifying again.
+
+Two ingest engines are available. ``"staged"`` (the default) bulk-loads
+the snapshot into a TEMP table and merges it with a handful of set-based
+statements in one transaction. ``"rows"`` is the original row-at-a-time
+path, kept as a reference implementation and for benchmarking.
 """
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Tuple
 
-from .models import Job
-from .db import Database
-from .diff_engine import is_new_grad
+from .blobs import pack_extra, search_columns
+from .models import Job, content_hash
+from .db import Database, encode_reasons
+from .classification import classify_jobs, lookup_classifications
 from .collector import CompanyConfig
 
 
+INGEST_ENGINES = ("staged", "rows")
+
+
 def persist_snapshot(
     db: Database,
     timestamp: datetime,
     jobs: List[Job],
     company_configs: List[CompanyConfig],
     run_id: int | None = None,
+    failed_slugs: Iterable[str] | None = None,
+    engine: str = "staged",
+    classify_processes: int = 0,
 ) -> int:
     """Persist a snapshot of jobs into the database.
 
@@ -34,31 +51,121 @@ def persist_snapshot(
         timestamp: Datetime of the snapshot.
         jobs: List of jobs collected.
         company_configs: Configuration list to resolve company ids.
+        run_id: Optional run the snapshot belongs to.
+        failed_slugs: Slugs of companies whose fetch failed this run. Their
+            jobs are left untouched instead of being marked removed.
+        engine: Ingest engine, one of ``INGEST_ENGINES``.
+        classify_processes: Worker processes for classifying new or
+            changed postings (0 classifies in this process).
 
     Returns:
         The snapshot_id of the newly inserted snapshot.
     """
+    failed = set(failed_slugs or ())
+    fetched_slugs = [cfg.slug for cfg in company_configs if cfg.slug not in failed]
+    if engine == "staged":
+        return _persist_staged(db, timestamp, jobs, company_configs, run_id, fetched_slugs, classify_processes)
+    if engine == "rows":
+        return _persist_rows(db, timestamp, jobs, company_configs, run_id, fetched_slugs, classify_processes)
+    raise ValueError(f"Unknown ingest engine: {engine!r} (expected one of {INGEST_ENGINES})")
+
+
+def _iter_mappable_jobs(
+    jobs: Iterable[Job], name_to_config: Dict[str, CompanyConfig]
+) -> Iterator[Tuple[Job, CompanyConfig]]:
+    """Yield ``(job, config)`` pairs, skipping jobs with no company config."""
+    for job in jobs:
+        cfg = name_to_config.get(job.company)
+        if cfg is None:
+            # Production-safe: skip jobs we can't map back to a configured company.
+            # This can happen if a company name changes upstream or configs drift.
+            print(f"[persistence] WARNING: no config for job.company='{job.company}', skipping job_id={job.job_id}")
+            continue
+        yield job, cfg
+
+
+def _persist_staged(
+    db: Database,
+    timestamp: datetime,
+    jobs: List[Job],
+    company_configs: List[CompanyConfig],
+    run_id: int | None,
+    fetched_slugs: List[str],
+    classify_processes: int = 0,
+) -> int:
+    """Staging pipeline: bulk-load into a TEMP table, then merge set-wise."""
+    name_to_config: Dict[str, CompanyConfig] = {
+        cfg.name: cfg for cfg in company_configs
+    }
+    mapped = list(_iter_mappable_jobs(jobs, name_to_config))
+
+    # Companies are few; upsert them once instead of once per job.
+    company_ids = db.upsert_companies(
+        {cfg.slug: (cfg.slug, cfg.name, cfg.ats) for _, cfg in mapped}.values()
+    )
+
+    # Nothing is written until the merge: the cache rows and new reasons
+    # are stored in its transaction.
+    classified, cache_rows = lookup_classifications(
+        db, (job for job, _ in mapped), timestamp, classify_processes
+    )
+    blobs: Dict[str, bytes] = {}
+
+    def stage_row(job: Job, cfg: CompanyConfig) -> Tuple:
+        location = job.location or ""
+        remote = 1 if job.remote is True else 0 if job.remote is False else None
+        extra_json, job_blobs = pack_extra(job.extra)
+        blobs.update(job_blobs)
+        new_grad_flag, reasons = classified[job.job_id]
+        return (
+            job.job_id,
+            company_ids[cfg.slug],
+            job.url,
+            job.source,
+            job.title,
+            location,
+            remote,
+            extra_json,
+            1 if new_grad_flag else 0,
+            encode_reasons(reasons),
+            content_hash(job.title, location, remote, extra_json),
+            *search_columns(job.extra),
+        )
+
+    db.stage_snapshot_jobs(stage_row(job, cfg) for job, cfg in mapped)
+    return db.merge_staged_snapshot(
+        timestamp, fetched_slugs, run_id=run_id, blobs=blobs, classifications=cache_rows
+    )
+
+
+def _persist_rows(
+    db: Database,
+    timestamp: datetime,
+    jobs: List[Job],
+    company_configs: List[CompanyConfig],
+    run_id: int | None,
+    fetched_slugs: List[str],
+    classify_processes: int = 0,
+) -> int:
+    """Row-at-a-time reference path: one round of statements per job."""
     # Build mapping from company name to (slug, ats)
     name_to_config: Dict[str, CompanyConfig] = {
         cfg.name: cfg for cfg in company_configs
     }
 
+    mapped = list(_iter_mappable_jobs(jobs, name_to_config))
+    classified = classify_jobs(db, (job for job, _ in mapped), timestamp, classify_processes)
+    reasons_ids = db.intern_reasons(reasons for _, reasons in classified.values())
+
     # Step 1: Insert snapshot row
     snapshot_id = db.insert_snapshot(timestamp, run_id=run_id)
 
     # Collect job_ids from snapshot to detect removals later
     snapshot_job_ids = set()
 
-    # Step 2: Upsert companies and jobs, insert versions, snapshot_jobs
-    for job in jobs:
+    # Step 2: Upsert companies and jobs, insert changed versions, membership
+    for job, cfg in mapped:
         snapshot_job_ids.add(job.job_id)
-        # Resolve company config by name; fallback to None
-        cfg = name_to_config.get(job.company)
-        if cfg is None:
-            # Production-safe: skip jobs we can't map back to a configured company.
-            # This can happen if a company name changes upstream or configs drift.
-            print(f"[persistence] WARNING: no config for job.company='{job.company}', skipping job_id={job.job_id}")
-            continue
         # Upsert company and get id
         company_id = db.upsert_company(slug=cfg.slug, name=cfg.name, source=cfg.ats)
         existing = db.get_job(job.job_id)
@@ -75,32 +182,43 @@ def persist_snapshot(
         else:
             # Update existing job's last_seen and reactivate if necessary
             db.update_job_seen(job.job_id, last_seen=timestamp)
-        # Insert job version record
-        # Serialize extra dictionary to JSON string
-        extra_json = json.dumps(job.extra, ensure_ascii=False) if job.extra else "{}"
-        version_id = db.insert_job_version(
-            job_id=job.job_id,
-            timestamp=timestamp,
-            title=job.title,
-            location=job.location or "",
-            remote=job.remote,
-            extra_json=extra_json,
-        )
-        # Determine new grad status
-        new_grad_flag = is_new_grad(job)
+        # Insert a job version record only if the content changed
+        # Serialize extra, moving large fields to the blob store
+        extra_json, blobs = pack_extra(job.extra)
+        db.put_blobs(blobs)
+        remote = 1 if job.remote is True else 0 if job.remote is False else None
+        digest = content_hash(job.title, job.location or "", remote, extra_json)
+        current = db.get_job_current(job.job_id)
+        if current is not None and current["content_hash"] == digest:
+            version_id = current["version_id"]
+        else:
+            version_id = db.insert_job_version(
+                job_id=job.job_id,
+                timestamp=timestamp,
+                title=job.title,
+                location=job.location or "",
+                remote=job.remote,
+                extra_json=extra_json,
+            )
+        # New grad status and reasons (cached by content, see classification.py)
+        new_grad_flag, reasons = classified[job.job_id]
+        reasons_id = reasons_ids[tuple(reasons)]
         # Record snapshot-job association
         db.insert_snapshot_job(
             snapshot_id=snapshot_id,
             job_id=job.job_id,
             version_id=version_id,
             is_new_grad=new_grad_flag,
+            reasons_id=reasons_id,
+        )
+        db.upsert_job_current(
+            job.job_id, version_id=version_id, is_new_grad=new_grad_flag, content_hash=digest,
+            reasons_id=reasons_id, search=search_columns(job.extra),
         )
 
-    # Step 3: Mark removed jobs (jobs previously active but not present now)
-    # Get list of active jobs in DB
-    active_jobs = db.list_active_jobs()
-    # Determine which active job_ids are not in current snapshot
-    removed_ids = [row["job_id"] for row in active_jobs if row["job_id"] not in snapshot_job_ids]
-    db.mark_jobs_removed(removed_ids, removed_at=timestamp)
+    # Step 3: Mark removed jobs (jobs previously active but not present now).
+    # Only companies fetched successfully this run are considered, so a
+    # transient fetch failure doesn't deactivate (and later re-add) their jobs.
+    db.mark_missing_jobs_removed(fetched_slugs, snapshot_job_ids, removed_at=timestamp)
 
     return snapshot_id
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""
+Hot queries and their expected plans.
+
+``HOT_QUERIES`` lists the read paths behind the API routes, the db
+helpers and the alert service. ``full_scans`` runs ``EXPLAIN QUERY
+PLAN`` on one of them and reports any step that falls back to a full
+table scan. ``tests/test_query_plans.py`` asserts there are none, and
+``job_tracker/cli/check_query_plans.py`` reports them for a live
+database.
+
+Tables that are expected to stay small (e.g. ``companies``) may be listed,
+by the name or alias the plan reports, in a query's ``allow_scan`` tuple.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Union
+
+from .snapshot_diff import diff_sql
+
+
+@dataclass
+class HotQuery:
+    name: str
+    sql: str
+    params: Union[Tuple, Dict[str, Any]] = ()
+    allow_scan: Tuple[str, ...] = field(default_factory=tuple)
+
+
+HOT_QUERIES: List[HotQuery] = [
+    # --- /api/jobs ---
+    HotQuery(
+        "jobs.search_jobs",
+        """
+        SELECT j.job_id, v.company_name, v.title, v.location, v.remote, j.url,
+               j.source, v.sector, j.first_seen, j.last_seen, v.extra, v.is_new_grad
+        FROM jobs j
+        JOIN jobs_current v ON v.job_key = j.job_key
+        WHERE j.active = 1
+        ORDER BY j.last_seen DESC LIMIT ? OFFSET ?
+        """,
+        (50, 0),
+    ),
+    HotQuery(
+        "jobs.search_jobs(company)",
+        """
+        SELECT j.job_id, v.title
+        FROM jobs j
+        JOIN jobs_current v ON v.job_key = j.job_key
+        WHERE j.active = 1 AND v.company_id IN (?, ?)
+        ORDER BY j.last_seen DESC LIMIT ? OFFSET ?
+        """,
+        (1, 2, 50, 0),
+    ),
+    HotQuery(
+        "jobs.get_job",
+        """
+        SELECT j.job_id, v.company_name, v.title, v.extra, v.is_new_grad
+        FROM jobs j
+        JOIN jobs_current v ON v.job_key = j.job_key
+        WHERE j.job_id = ?
+        """,
+        ("job",),
+    ),
+    HotQuery(
+        "jobs.filter_options.companies",
+        """
+        SELECT c.id, c.name, COUNT(DISTINCT j.job_id) AS job_count
+        FROM companies c
+        JOIN jobs j ON j.company_id = c.id
+        WHERE j.active = 1
+        GROUP BY c.id, c.name
+        ORDER BY c.name ASC
+        """,
+        allow_scan=("c",),
+    ),
+    HotQuery(
+        "jobs.filter_options.sectors",
+        """
+        SELECT v.sector, COUNT(*) AS job_count
+        FROM jobs_current v
+        WHERE v.active = 1 AND v.sector IS NOT NULL AND v.sector != ''
+        GROUP BY v.sector
+        """,
+    ),
+    HotQuery(
+        "jobs.saved_list",
+        """
+        SELECT sj.saved_id, j.job_id, v.title, v.is_new_grad
+        FROM saved_jobs sj
+        JOIN jobs j ON sj.job_id = j.job_id
+        JOIN jobs_current v ON v.job_key = j.job_key
+        WHERE sj.user_id = ? AND j.active = 1
+        ORDER BY sj.saved_at DESC
+        LIMIT ? OFFSET ?
+        """,
+        (1, 50, 0),
+    ),
+    HotQuery(
+        "db.get_company_jobs",
+        """
+        SELECT j.job_id, j.first_seen, j.last_seen, j.removed_at, v.title, v.extra, v.is_new_grad
+        FROM jobs j
+        JOIN jobs_current v ON v.job_key = j.job_key
+        WHERE j.company_id = ? AND j.active = 1
+        ORDER BY j.last_seen DESC
+        """,
+        (1,),
+    ),
+    HotQuery(
+        "db.get_latest_job_version",
+        "SELECT v.*, j.job_id FROM job_versions v JOIN jobs j ON j.job_key = v.job_key "
+        "WHERE j.job_id=? ORDER BY v.timestamp DESC LIMIT 1",
+        ("job",),
+    ),
+    # --- dashboard ---
+    HotQuery(
+        "dashboard.total_jobs",
+        """
+        SELECT COUNT(DISTINCT job_id) AS total
+        FROM jobs
+        WHERE active = 1 AND last_seen > ?
+        """,
+        (0,),
+    ),
+    HotQuery(
+        "dashboard.recent_activity",
+        """
+        SELECT a.application_id, a.status, v.title, c.name
+        FROM applications a
+        LEFT JOIN jobs j ON a.job_id = j.job_id
+        LEFT JOIN companies c ON j.company_id = c.id
+        LEFT JOIN jobs_current v ON v.job_key = j.job_key
+        WHERE a.user_id = ?
+          AND COALESCE(a.updated_at, a.created_at) > datetime('now', ?)
+        ORDER BY COALESCE(a.updated_at, a.created_at) DESC
+        LIMIT 10
+        """,
+        (1, "-7 days"),
+    ),
+    # --- applications / interviews / offers ---
+    HotQuery(
+        "db.list_applications",
+        "SELECT * FROM applications WHERE user_id = ? ORDER BY updated_at DESC",
+        (1,),
+    ),
+    HotQuery(
+        "db.get_application_events",
+        "SELECT * FROM application_events WHERE application_id = ? ORDER BY created_at ASC",
+        (1,),
+    ),
+    HotQuery(
+        "db.list_interviews(user)",
+        """
+        SELECT i.* FROM interviews i
+        JOIN applications a ON i.application_id = a.application_id
+        WHERE a.user_id = ?
+        ORDER BY scheduled_at ASC
+        """,
+        (1,),
+    ),
+    HotQuery(
+        "db.list_offers",
+        """
+        SELECT o.* FROM offers o
+        JOIN applications a ON o.application_id = a.application_id
+        WHERE a.user_id = ?
+        ORDER BY o.offer_date DESC
+        """,
+        (1,),
+    ),
+    # --- auth ---
+    HotQuery(
+        "auth.session_lookup",
+        "SELECT user_id, expires_at FROM user_sessions WHERE session_id = ?",
+        ("sid",),
+    ),
+    HotQuery(
+        "db.delete_user_sessions",
+        "DELETE FROM user_sessions WHERE user_id = ?",
+        (1,),
+    ),
+    # --- notifications ---
+    HotQuery(
+        "db.get_notifications(unread)",
+        "SELECT * FROM notifications WHERE user_id = ? AND read = 0 ORDER BY created_at DESC LIMIT ?",
+        (1, 50),
+    ),
+    HotQuery(
+        "db.mark_all_notifications_read",
+        "UPDATE notifications SET read = 1 WHERE user_id = ? AND read = 0",
+        (1,),
+    ),
+    # --- per-user collections ---
+    HotQuery(
+        "searches.list",
+        "SELECT * FROM saved_searches WHERE user_id = ? ORDER BY created_at DESC",
+        (1,),
+    ),
+    HotQuery(
+        "job_alerts.enabled_searches",
+        "SELECT search_id, user_id, name, filters FROM saved_searches WHERE notification_enabled = 1",
+    ),
+    HotQuery(
+        "tags.delete_job_tags",
+        "DELETE FROM job_tags WHERE tag_id = ?",
+        (1,),
+    ),
+    HotQuery(
+        "documents.list_resumes",
+        "SELECT * FROM resumes WHERE user_id = ? ORDER BY is_default DESC, created_at DESC",
+        (1,),
+    ),
+    HotQuery(
+        "sharing.list",
+        "SELECT * FROM share_links WHERE user_id = ? ORDER BY created_at DESC",
+        (1,),
+    ),
+    # --- analytics ---
+    HotQuery(
+        "analytics.new_grad_share",
+        """
+        SELECT COUNT(DISTINCT CASE WHEN sj.is_new_grad = 1 THEN j.job_key END),
+               COUNT(DISTINCT j.job_key)
+        FROM jobs j
+        JOIN snapshot_jobs sj ON sj.job_key = j.job_key
+        JOIN snapshots s ON s.snapshot_id = sj.snapshot_id
+        WHERE j.company_id = ?
+          AND s.timestamp >= ?
+        """,
+        (1, 0),
+    ),
+    HotQuery(
+        "snapshot_jobs.members",
+        "SELECT job_id, version_id FROM snapshot_jobs WHERE snapshot_id = ? AND is_new_grad = 1",
+        (1,),
+    ),
+    # --- snapshot diffs (report, digest, alerts, /api/snapshots) ---
+    # "d" is the materialized UNION of change kinds, already index-driven.
+    HotQuery("snapshot_diff", *diff_sql(1, 2), allow_scan=("d",)),
+    HotQuery(
+        "snapshot_diff(new_grad, company)",
+        *diff_sql(1, 2, new_grad=True, company_ids=[1]),
+        allow_scan=("d",),
+    ),
+    HotQuery(
+        "snapshots.latest",
+        "SELECT snapshot_id FROM snapshots ORDER BY timestamp DESC LIMIT 1",
+    ),
+]
+
+# "SCAN t" without an index; "SCAN t USING [COVERING] INDEX ..." is fine.
+_SCAN = re.compile(r"^SCAN (\w+)(.*)$")
+
+
+def full_scans(conn: sqlite3.Connection, query: HotQuery) -> Tuple[List[str], List[str]]:
+    """Return (plan_lines, offending_lines) for ``query``."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + query.sql, query.params).fetchall()
+    plan = [row[3] for row in rows]
+    offending = []
+    for detail in plan:
+        m = _SCAN.match(detail)
+        if m and "USING" not in m.group(2) and m.group(1) not in query.allow_scan:
+            offending.append(detail)
+    return plan, offending
@@ -27,8 +27,12 @@ from urllib.parse import urlparse
 
 import yaml
 
+from job_tracker.archive import ArchivePolicy, archive_cold_rows, attach_archive
+from job_tracker.backup import BackupError, backup_all
 from job_tracker.collector import collect_jobs
 from job_tracker.db import Database
+from job_tracker.maintenance import RetentionPolicy, run_maintenance
+from job_tracker.parquet_export import export_parquet
 from job_tracker.persistence import persist_snapshot
 
 
@@ -150,9 +154,29 @@ def run_scheduler(
     interval_seconds: int = 6 * 3600,
     iterations: int = 0,
     allow_remote: bool = True,
+    ingest_engine: str = "staged",
+    maintenance_every: int = 0,
+    retention: Optional[RetentionPolicy] = None,
+    parquet_dir: Optional[Path] = None,
+    archive_after_days: Optional[int] = None,
+    users_path: Optional[Path] = None,
+    backup_dir: Optional[Path] = None,
+    classify_processes: int = 0,
 ) -> None:
     """
     Main loop. iterations=0 means infinite.
+
+    ingest_engine selects the persist_snapshot engine ("staged" or "rows").
+    maintenance_every=N runs retention/compaction (see job_tracker.maintenance)
+    after every Nth run; 0 disables it.
+    parquet_dir, if set, receives an incremental Parquet export after each run.
+    archive_after_days, if set, moves history older than that many days to
+    the archive file after each run (see job_tracker.archive).
+    users_path is the user database (default: next to db_path).
+    backup_dir, if set, receives an online backup of every database file
+    after each run (see job_tracker.backup).
+    classify_processes>1 classifies new or changed postings on that many
+    worker processes.
     """
     i = 0
     while True:
@@ -164,7 +188,7 @@ def run_scheduler(
         jobs, errors = collect_jobs(companies=companies, allow_remote=allow_remote, return_errors=True)
         succeeded = len(companies) - len(errors)
 
-        with Database(db_path) as db:
+        with Database(db_path, profile="ingest", users_path=users_path) as db:
             run_id = db.insert_run(started_at=ts, companies_total=len(companies))
             for err in errors:
                 db.insert_run_error(
@@ -182,6 +206,9 @@ def run_scheduler(
                 jobs=jobs,
                 company_configs=companies,
                 run_id=run_id,
+                failed_slugs=[err["company_slug"] for err in errors],
+                engine=ingest_engine,
+                classify_processes=classify_processes,
             )
 
             status = "ok" if not errors else "error"
@@ -200,6 +227,31 @@ def run_scheduler(
             f"companies_ok={succeeded} companies_failed={len(errors)}"
         )
 
+        if parquet_dir is not None:
+            with Database(db_path, profile="api-read", users_path=users_path) as db:
+                attach_archive(db)
+                report = export_parquet(db, parquet_dir)
+            print(f"[scheduler] Parquet export {report.summary()}")
+
+        if archive_after_days is not None:
+            with Database(db_path, users_path=users_path) as db:
+                report = archive_cold_rows(db, ArchivePolicy(after_days=archive_after_days))
+            print(f"[scheduler] Archive {report.summary()}")
+
+        if maintenance_every and i % maintenance_every == 0:
+            with Database(db_path, users_path=users_path) as db:
+                report = run_maintenance(db, retention)
+            print(f"[scheduler] Maintenance {report.summary()}")
+
+        if backup_dir is not None:
+            with Database(db_path, profile="api-read", users_path=users_path) as db:
+                attach_archive(db)
+                try:
+                    for result in backup_all(db, backup_dir):
+                        print(f"[scheduler] Backup {result.summary()}")
+                except BackupError as exc:
+                    print(f"[scheduler] Backup failed verification: {exc}")
+
         if iterations and i >= iterations:
             break
 
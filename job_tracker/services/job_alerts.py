@@ -6,8 +6,9 @@ from datetime import datetime
 from typing import List, Dict, Any
 import json
 
-from job_tracker.db import Database
+from job_tracker.db import Database, from_epoch
 from job_tracker.services.notifications import notify_job_alert
+from job_tracker.snapshot_diff import diff_snapshots
 
 
 def check_saved_searches(db: Database, new_job_ids: List[str]):
@@ -46,9 +47,11 @@ def check_saved_searches(db: Database, new_job_ids: List[str]):
             if last_run:
                 # Filter out jobs that existed before last run
                 last_run_dt = datetime.fromisoformat(last_run) if isinstance(last_run, str) else last_run
+                # last_run_at is naive local time; first_seen is aware UTC
+                since = last_run_dt.astimezone()
                 matching_jobs = [
                     job for job in matching_jobs
-                    if datetime.fromisoformat(job["first_seen"]) > last_run_dt
+                    if job["first_seen"] > since
                 ]
             
             # Send notifications for matching jobs
@@ -72,7 +75,23 @@ def check_saved_searches(db: Database, new_job_ids: List[str]):
             print(f"Error checking saved search {search.get('search_id')}: {e}")
             continue
     
-    db.conn.commit()
+    db.commit()
+
+
+def check_snapshot_alerts(db: Database, old_snapshot_id: int, new_snapshot_id: int):
+    """
+    Check saved searches against the jobs added between two snapshots.
+
+    The new jobs come from the SQL snapshot diff, so neither snapshot is
+    loaded into memory.
+
+    Args:
+        db: Database instance
+        old_snapshot_id: Snapshot the alerts were last checked at
+        new_snapshot_id: Snapshot just persisted
+    """
+    new_job_ids = [c.job_id for c in diff_snapshots(db.conn, old_snapshot_id, new_snapshot_id, kinds=["new"])]
+    check_saved_searches(db, new_job_ids)
 
 
 def _find_matching_jobs(db: Database, filters: Dict[str, Any], job_ids: List[str]) -> List[Dict[str, Any]]:
@@ -101,12 +120,7 @@ def _find_matching_jobs(db: Database, filters: Dict[str, Any], job_ids: List[str
             v.extra
         FROM jobs j
         JOIN companies c ON j.company_id = c.id
-        JOIN job_versions v ON v.job_id = j.job_id
-        JOIN (
-            SELECT job_id, MAX(timestamp) AS max_ts
-            FROM job_versions
-            GROUP BY job_id
-        ) latest ON latest.job_id = v.job_id AND latest.max_ts = v.timestamp
+        JOIN jobs_current v ON v.job_key = j.job_key
         WHERE j.job_id IN ({placeholders}) AND j.active = 1
     """
     
@@ -142,12 +156,11 @@ def _find_matching_jobs(db: Database, filters: Dict[str, Any], job_ids: List[str
     
     if filters.get("keywords"):
         keyword_pattern = f"%{filters['keywords']}%"
-        conditions.append("(v.title LIKE ? OR v.extra LIKE ?)")
+        conditions.append("(v.title LIKE ? OR v.search_text LIKE ?)")
         params.extend([keyword_pattern, keyword_pattern])
     
     if filters.get("new_grad"):
-        # This would require joining with snapshot_jobs, simplified for now
-        pass
+        conditions.append("v.is_new_grad = 1")
     
     if conditions:
         query += " AND " + " AND ".join(conditions)
@@ -159,7 +172,7 @@ def _find_matching_jobs(db: Database, filters: Dict[str, Any], job_ids: List[str
             "job_id": row["job_id"],
             "company": row["company"],
             "title": row["title"],
-            "first_seen": row["first_seen"]
+            "first_seen": from_epoch(row["first_seen"])
         }
         for row in rows
     ]
@@ -0,0 +1,181 @@
+"""
+Diff two catalog snapshots inside SQLite.
+
+``diff_engine.compute_diff`` compares two in-memory ``JobSnapshot``s;
+this module answers the same question for snapshots already in the
+database without loading either side. A snapshot's jobs are the
+membership intervals covering it, so one statement finds:
+
+- ``new``: jobs in the new snapshot with no interval covering the old one;
+- ``removed``: jobs in the old snapshot with none covering the new one;
+- ``updated``: jobs in both whose ``version_id`` differs.
+
+The ``new_grad`` and ``company_ids`` filters restrict both snapshots
+before they are compared, so with ``new_grad=True`` a job that became
+new-grad without changing is ``new`` to the new-grad list and one that
+stopped being new-grad is ``removed`` from it. ``diff_snapshots`` yields
+changes as SQLite produces them, so a diff of two 100k-job snapshots
+holds one row in Python at a time.
+
+Used by ``report_new_grad.py``, the email digest, saved-search alerts
+and ``GET /api/snapshots/{a}/diff/{b}``. Unqualified table names are
+used throughout, so on a connection with the archive attached (see
+``archive.py``) diffs reach archived snapshots too.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CHANGE_KINDS = ("new", "updated", "removed")
+
+
+@dataclass(frozen=True)
+class JobChange:
+    """One job that differs between two snapshots.
+
+    Title, location, remote, ``is_new_grad`` and ``reasons_id`` describe
+    the job as of the new snapshot, or the old one for ``removed`` jobs.
+    """
+
+    kind: str
+    job_id: str
+    company_id: int
+    company: str
+    title: str
+    location: str
+    remote: Optional[bool]
+    url: str
+    is_new_grad: bool
+    reasons_id: Optional[int]
+    old_version_id: Optional[int]
+    new_version_id: Optional[int]
+
+    @property
+    def version_id(self) -> int:
+        """The version the change is reported from."""
+        return self.new_version_id if self.new_version_id is not None else self.old_version_id
+
+
+# Jobs in snapshot :{side} matching the filters, as alias {alias}.
+_SIDE = "{alias}.first_snapshot_id <= :{side} AND {alias}.last_snapshot_id >= :{side}{flag}"
+
+_KIND_SQL = {
+    "new": """
+        SELECT 0 AS kind_order, 'new' AS kind, b.job_key, NULL AS old_version_id,
+               b.version_id AS new_version_id, b.is_new_grad, b.reasons_id
+        FROM snapshot_membership b
+        WHERE {b} AND NOT EXISTS (
+            SELECT 1 FROM snapshot_membership a WHERE a.job_key = b.job_key AND {a}
+        )
+    """,
+    "updated": """
+        SELECT 1 AS kind_order, 'updated' AS kind, b.job_key, a.version_id AS old_version_id,
+               b.version_id AS new_version_id, b.is_new_grad, b.reasons_id
+        FROM snapshot_membership b
+        JOIN snapshot_membership a ON a.job_key = b.job_key AND {a}
+        WHERE {b} AND a.version_id <> b.version_id
+    """,
+    "removed": """
+        SELECT 2 AS kind_order, 'removed' AS kind, a.job_key, a.version_id AS old_version_id,
+               NULL AS new_version_id, a.is_new_grad, a.reasons_id
+        FROM snapshot_membership a
+        WHERE {a} AND NOT EXISTS (
+            SELECT 1 FROM snapshot_membership b WHERE b.job_key = a.job_key AND {b}
+        )
+    """,
+}
+
+
+def diff_snapshots(
+    conn: sqlite3.Connection,
+    old_snapshot_id: int,
+    new_snapshot_id: int,
+    new_grad: Optional[bool] = None,
+    company_ids: Optional[Iterable[int]] = None,
+    kinds: Iterable[str] = CHANGE_KINDS,
+    ordered: bool = False,
+) -> Iterator[JobChange]:
+    """Yield the jobs that differ between two snapshots.
+
+    Args:
+        conn: Catalog connection.
+        old_snapshot_id: Snapshot to diff from.
+        new_snapshot_id: Snapshot to diff to.
+        new_grad: If set, only jobs with this flag in each snapshot are
+            compared.
+        company_ids: If set, only jobs of these companies are compared.
+        kinds: Change kinds to report, a subset of ``CHANGE_KINDS``.
+        ordered: Yield by kind (in ``CHANGE_KINDS`` order), company name
+            and title instead of in storage order. SQLite sorts the rows,
+            which it spills to temporary storage when large.
+    """
+    kinds = list(kinds)
+    company_ids = list(company_ids) if company_ids is not None else None
+    if not kinds or company_ids == []:
+        return
+    sql, params = diff_sql(old_snapshot_id, new_snapshot_id, new_grad, company_ids, kinds, ordered)
+    for row in conn.execute(sql, params):
+        kind, job_id, company_id, company, title, location, remote, url, flag, reasons_id, old_v, new_v = row
+        yield JobChange(
+            kind=kind,
+            job_id=job_id,
+            company_id=company_id,
+            company=company,
+            title=title,
+            location=location or "",
+            remote=bool(remote) if remote is not None else None,
+            url=url,
+            is_new_grad=bool(flag),
+            reasons_id=reasons_id,
+            old_version_id=old_v,
+            new_version_id=new_v,
+        )
+
+
+def diff_sql(
+    old_snapshot_id: int,
+    new_snapshot_id: int,
+    new_grad: Optional[bool] = None,
+    company_ids: Optional[List[int]] = None,
+    kinds: Iterable[str] = CHANGE_KINDS,
+    ordered: bool = False,
+) -> Tuple[str, Dict[str, Any]]:
+    """Return the statement and named parameters behind ``diff_snapshots``.
+
+    ``kinds`` and ``company_ids`` must not be empty.
+    """
+    kinds = list(kinds)
+    unknown = [kind for kind in kinds if kind not in CHANGE_KINDS]
+    if unknown or not kinds:
+        raise ValueError(f"Bad change kinds: {kinds} (expected a non-empty subset of {CHANGE_KINDS})")
+
+    params: Dict[str, Any] = {"old": old_snapshot_id, "new": new_snapshot_id}
+    flag = ""
+    if new_grad is not None:
+        flag = " AND {alias}.is_new_grad = :new_grad"
+        params["new_grad"] = 1 if new_grad else 0
+    sides = {
+        alias: _SIDE.format(alias=alias, side=side, flag=flag.format(alias=alias))
+        for alias, side in (("a", "old"), ("b", "new"))
+    }
+    changes = " UNION ALL ".join(_KIND_SQL[kind].format(**sides) for kind in kinds)
+
+    where = ""
+    if company_ids is not None:
+        where = "WHERE j.company_id IN ({})".format(",".join(f":c{i}" for i in range(len(company_ids))))
+        params.update({f"c{i}": company_id for i, company_id in enumerate(company_ids)})
+
+    sql = f"""
+        SELECT d.kind, j.job_id, j.company_id, c.name, v.title, v.location, v.remote, j.url,
+               d.is_new_grad, d.reasons_id, d.old_version_id, d.new_version_id
+        FROM ({changes}) AS d
+        JOIN jobs j ON j.job_key = d.job_key
+        JOIN companies c ON c.id = j.company_id
+        JOIN job_versions v ON v.version_id = COALESCE(d.new_version_id, d.old_version_id)
+        {where}
+        {"ORDER BY d.kind_order, c.name, v.title, j.job_id" if ordered else ""}
+    """
+    return sql, params
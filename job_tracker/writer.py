@@ -0,0 +1,204 @@
+"""
+Single-writer service with group commit.
+
+SQLite allows one writer at a time. When many threads each open a
+transaction and commit on their own, they queue on the file's write lock
+(and give up with "database is locked" once the busy timeout runs out),
+and every commit pays its own WAL append. ``WriteService`` funnels a
+process's writes through one connection owned by a dedicated thread:
+
+- ``submit(fn, *args)`` queues ``fn(db, *args)`` and returns a
+  ``concurrent.futures.Future``; ``run`` waits for it and ``run_async``
+  awaits it from a coroutine.
+- The writer thread takes everything queued (up to ``max_batch`` tasks),
+  opens one ``BEGIN IMMEDIATE`` transaction, runs each task under its own
+  savepoint and commits once. A task that raises only rolls back its own
+  savepoint. Futures resolve after the commit, so a result means the write
+  is durable.
+- ``session()`` lends the writer's connection to the calling thread for
+  one unit of work in the next group. The API's ``get_write_db``
+  dependency uses it, so mutating route handlers run unchanged.
+
+The writer's connection opens the catalog read-only (see ``Database``),
+so ``BEGIN IMMEDIATE`` takes only the user database's write lock and a
+running ingest never delays user writes.
+
+Tasks run with ``Database.commit()`` deferred. They must not call
+``conn.commit()``/``conn.rollback()`` or open their own transactions, and
+must not call back into the service (the writer thread would wait on
+itself). The bulk snapshot merge (``persist_snapshot``) manages its own
+transaction and keeps its own connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .db import Database
+
+DEFAULT_MAX_BATCH = 64
+
+
+@dataclass
+class _Task:
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+
+class WriteService:
+    """Serialize writes to ``db_path`` through one connection and thread.
+
+    Args:
+        db_path: Catalog database file.
+        max_batch: Most tasks committed together.
+        linger: Seconds to wait for more tasks before committing a batch
+            that is not full. 0 commits whatever is queued right away;
+            tasks that arrive during a commit form the next group anyway.
+        users_path: User database file (default: next to ``db_path``).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        linger: float = 0.0,
+        users_path: Optional[Path] = None,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.db_path = Path(db_path)
+        self.max_batch = max_batch
+        self.linger = linger
+        self.commits = 0
+        self.tasks = 0
+        self._db = Database(self.db_path, users_path=users_path, catalog_read_only=True)
+        self.users_path = self._db.users_path
+        self._queue: "queue.SimpleQueue[_Task | None]" = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue ``fn(db, *args, **kwargs)``; the future holds its result."""
+        if self._closed:
+            raise RuntimeError("Write service is closed")
+        task = _Task(fn, args, kwargs)
+        self._queue.put(task)
+        return task.future
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Submit ``fn`` and wait for its group to commit."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Awaitable ``run`` for coroutines."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    @contextmanager
+    def session(self) -> Iterator[Database]:
+        """Use the writer's connection from this thread for one task.
+
+        The block runs as a task of the next group: the writer thread
+        waits while it runs, an exception rolls back its savepoint, and
+        leaving the block waits for the group commit.
+        """
+        ready = threading.Event()
+        done = threading.Event()
+        failure: List[BaseException] = []
+
+        def lease(db: Database) -> None:
+            ready.set()
+            done.wait()
+            if failure:
+                raise failure[0]
+
+        future = self.submit(lease)
+        # The task may fail before it runs (e.g. BEGIN could not get the lock).
+        future.add_done_callback(lambda _: ready.set())
+        ready.wait()
+        if future.done():
+            future.result()
+        try:
+            yield self._db
+        except BaseException as exc:
+            failure.append(exc)
+            done.set()
+            try:
+                future.result()
+            except BaseException:
+                pass
+            raise
+        done.set()
+        future.result()
+
+    def close(self) -> None:
+        """Commit what is queued, then stop the thread and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._db.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            while len(batch) < self.max_batch:
+                try:
+                    task = self._queue.get(timeout=self.linger) if self.linger else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if task is None:
+                    stopping = True
+                    break
+                batch.append(task)
+            self._commit_group(batch)
+
+    def _commit_group(self, batch: List[_Task]) -> None:
+        tasks = [t for t in batch if t.future.set_running_or_notify_cancel()]
+        if not tasks:
+            return
+        conn = self._db.conn
+        outcomes: List[Tuple[_Task, bool, Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            with self._db.deferred_commits():
+                for task in tasks:
+                    conn.execute("SAVEPOINT write_task")
+                    try:
+                        result = task.fn(self._db, *task.args, **task.kwargs)
+                    except Exception as exc:
+                        conn.execute("ROLLBACK TO write_task")
+                        conn.execute("RELEASE write_task")
+                        outcomes.append((task, False, exc))
+                    else:
+                        conn.execute("RELEASE write_task")
+                        outcomes.append((task, True, result))
+            conn.commit()
+        except sqlite3.Error as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            for task in tasks:
+                task.future.set_exception(exc)
+            return
+        self.commits += 1
+        self.tasks += len(tasks)
+        for task, ok, value in outcomes:
+            if ok:
+                task.future.set_result(value)
+            else:
+                task.future.set_exception(value)
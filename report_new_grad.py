@@ -2,12 +2,9 @@
 """
 Report new-grad jobs since the previous snapshot.
 
-Works with the current SQLite schema:
-- snapshots(snapshot_id, timestamp)
-- snapshot_jobs(snapshot_id, job_id, version_id, is_new_grad)
-- job_versions(version_id, job_id, timestamp, title, location, remote, extra)
-- jobs(job_id, company_id, url, source, first_seen, last_seen, removed_at, active)
-- companies(id, slug, name, source)
+The delta is computed in SQLite by ``job_tracker.snapshot_diff``; the
+"Why" line is the classifier reasons stored at ingest (jobs ingested
+before reasons were stored are classified again).
 
 Usage:
   python report_new_grad.py --db live_jobs.db
@@ -17,19 +14,18 @@ Usage:
 
 from __future__ import annotations
 
-from job_tracker.diff_engine import classify_new_grad
+from job_tracker.archive import attach_archive
+from job_tracker.blobs import hydrate_extra
+from job_tracker.db import Database, format_timestamp
+from job_tracker.diff_engine import classify_many
 from job_tracker.models import Job
+from job_tracker.snapshot_diff import CHANGE_KINDS, JobChange, diff_snapshots
 
 import argparse
 import json
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple
-
-
-def _connect(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 
 def _get_latest_snapshots(conn: sqlite3.Connection, snapshots_back: int = 1) -> Tuple[int, int]:
@@ -54,68 +50,6 @@ def _get_latest_snapshots(conn: sqlite3.Connection, snapshots_back: int = 1) ->
     return latest, previous
 
 
-def _fetch_new_grad_map(conn: sqlite3.Connection, snapshot_id: int) -> Dict[str, int]:
-    """
-    job_id -> version_id for jobs that are marked is_new_grad=1 in the given snapshot.
-    """
-    rows = conn.execute(
-        """
-        SELECT job_id, version_id
-        FROM snapshot_jobs
-        WHERE snapshot_id = ? AND is_new_grad = 1
-        """,
-        (snapshot_id,),
-    ).fetchall()
-    return {str(r["job_id"]): int(r["version_id"]) for r in rows}
-
-
-def _fetch_job_details_by_job_ids(
-    conn: sqlite3.Connection,
-    snapshot_id: int,
-    job_ids: List[str],
-) -> List[sqlite3.Row]:
-    """
-    Fetch job details for a list of job_ids at a given snapshot_id.
-    Pulls title/location/remote/extra from the job_versions linked by snapshot_jobs,
-    plus company name + url.
-    """
-    if not job_ids:
-        return []
-
-    # SQLite has a variable limit; chunk to be safe.
-    CHUNK = 500
-    out: List[sqlite3.Row] = []
-
-    base_sql = """
-    SELECT
-        c.name AS company_name,
-        j.url  AS url,
-        j.source AS source,
-        j.first_seen AS first_seen,
-        j.last_seen  AS last_seen,
-        v.title AS title,
-        v.location AS location,
-        v.remote AS remote,
-        v.extra AS extra
-    FROM snapshot_jobs sj
-    JOIN job_versions v ON v.version_id = sj.version_id
-    JOIN jobs j         ON j.job_id = sj.job_id
-    JOIN companies c    ON c.id = j.company_id
-    WHERE sj.snapshot_id = ?
-      AND sj.job_id IN ({placeholders})
-    ORDER BY c.name ASC, v.title ASC
-    """
-
-    for i in range(0, len(job_ids), CHUNK):
-        chunk = job_ids[i : i + CHUNK]
-        placeholders = ",".join(["?"] * len(chunk))
-        sql = base_sql.format(placeholders=placeholders)
-        params = [snapshot_id] + chunk
-        out.extend(conn.execute(sql, params).fetchall())
-
-    return out
-
-
 def _pretty_remote(remote_val: Any) -> str:
     if remote_val is None:
         return "Unknown"
@@ -125,32 +59,72 @@ def _pretty_remote(remote_val: Any) -> str:
         return "Unknown"
 
 
-def _why_new_grad(row):
-    # rebuild a Job object from the row so we can reuse the classifier
+def _change_to_job(conn: sqlite3.Connection, change: JobChange, row) -> Job:
+    # rebuild a Job object from the version row so we can reuse the classifier
     extra = None
     if row["extra"]:
         try:
-            extra = json.loads(row["extra"])
+            json.loads(row["extra"])
+            extra = hydrate_extra(conn, row["extra"])
         except Exception:
             extra = {"raw_extra": row["extra"]}
 
-    job = Job(
+    return Job(
         job_id="report",
-        company=row["company_name"],
-        title=row["title"],
-        location=row["location"] or "",
-        url=row["url"],
+        company=change.company,
+        title=change.title,
+        location=change.location,
+        url=change.url,
         source=row["source"] or "",
-        remote=row["remote"],
+        remote=change.remote,
         extra=extra,
     )
-    ok, reasons = classify_new_grad(job)
-    if not ok:
-        return "NOT new-grad by strict rules: " + "; ".join(reasons)
-    return "; ".join(reasons)
 
 
-def _print_section(title: str, rows: List[sqlite3.Row], limit: int) -> None:
+def _fetch_versions(conn: sqlite3.Connection, version_ids: List[int]) -> Dict[int, sqlite3.Row]:
+    """version_id -> (extra, source) for the given versions."""
+    out: Dict[int, sqlite3.Row] = {}
+    for i in range(0, len(version_ids), 500):
+        chunk = version_ids[i : i + 500]
+        placeholders = ",".join(["?"] * len(chunk))
+        rows = conn.execute(
+            f"""
+            SELECT v.version_id, v.extra, j.source
+            FROM job_versions v
+            JOIN jobs j ON j.job_key = v.job_key
+            WHERE v.version_id IN ({placeholders})
+            """,
+            chunk,
+        )
+        out.update((r["version_id"], r) for r in rows)
+    return out
+
+
+def _why_new_grad(db: Database, changes: List[JobChange]) -> List[str]:
+    """Reasons recorded at ingest for each change.
+
+    Jobs ingested before reasons were stored are classified again, in
+    one batch.
+    """
+    stored = db.get_reasons(c.reasons_id for c in changes)
+    missing = [c for c in changes if c.reasons_id not in stored]
+    fresh = iter([])
+    if missing:
+        versions = _fetch_versions(db.conn, [c.version_id for c in missing])
+        fresh = iter(classify_many(_change_to_job(db.conn, c, versions[c.version_id]) for c in missing))
+    whys = []
+    for c in changes:
+        reasons = stored.get(c.reasons_id)
+        if reasons is None:
+            ok, reasons = next(fresh)
+            if not ok:
+                whys.append("NOT new-grad by strict rules: " + "; ".join(reasons))
+                continue
+        whys.append("; ".join(reasons))
+    return whys
+
+
+def _print_section(db: Database, title: str, rows: List[JobChange], limit: int) -> None:
     print("\n" + "=" * 80)
     print(title)
     print("=" * 80)
@@ -160,13 +134,12 @@ def _print_section(title: str, rows: List[sqlite3.Row], limit: int) -> None:
         return
 
     shown = rows[:limit] if limit > 0 else rows
-    for r in shown:
-        company = r["company_name"]
-        job_title = r["title"]
-        loc = r["location"] or ""
-        remote = _pretty_remote(r["remote"])
-        url = r["url"]
-        why = _why_new_grad(r)
+    for r, why in zip(shown, _why_new_grad(db, shown)):
+        company = r.company
+        job_title = r.title
+        loc = r.location
+        remote = _pretty_remote(r.remote)
+        url = r.url
 
         line1 = f"[{company}] {job_title}"
         if loc:
@@ -193,37 +166,29 @@ def main() -> None:
     )
     args = ap.parse_args()
 
-    conn = _connect(args.db)
+    # Opening through Database applies pending migrations (stored reasons);
+    # the archive lets --snapshots-back reach archived snapshots.
+    db = Database(Path(args.db))
+    attach_archive(db)
+    conn = db.conn
     latest_id, prev_id = _get_latest_snapshots(conn, snapshots_back=args.snapshots_back)
 
-    latest_ts = conn.execute("SELECT timestamp FROM snapshots WHERE snapshot_id=?", (latest_id,)).fetchone()["timestamp"]
-    prev_ts = conn.execute("SELECT timestamp FROM snapshots WHERE snapshot_id=?", (prev_id,)).fetchone()["timestamp"]
-
-    latest_map = _fetch_new_grad_map(conn, latest_id)  # job_id -> version_id
-    prev_map = _fetch_new_grad_map(conn, prev_id)
+    latest_ts = format_timestamp(conn.execute("SELECT timestamp FROM snapshots WHERE snapshot_id=?", (latest_id,)).fetchone()["timestamp"])
+    prev_ts = format_timestamp(conn.execute("SELECT timestamp FROM snapshots WHERE snapshot_id=?", (prev_id,)).fetchone()["timestamp"])
 
-    latest_job_ids = set(latest_map.keys())
-    prev_job_ids = set(prev_map.keys())
-
-    new_ids = sorted(list(latest_job_ids - prev_job_ids))
-    removed_ids = sorted(list(prev_job_ids - latest_job_ids))
-
-    # UPDATED = present in both, but version changed
-    updated_ids = sorted(
-        [jid for jid in (latest_job_ids & prev_job_ids) if latest_map[jid] != prev_map[jid]]
-    )
+    # Both snapshots are restricted to new-grad jobs before comparing, so a
+    # job that became new-grad is NEW and one that stopped being it REMOVED.
+    sections: Dict[str, List[JobChange]] = {kind: [] for kind in CHANGE_KINDS}
+    for change in diff_snapshots(conn, prev_id, latest_id, new_grad=True, ordered=True):
+        sections[change.kind].append(change)
 
     print(f"Comparing snapshots: latest={latest_id} ({latest_ts}) vs previous={prev_id} ({prev_ts})")
-    print(f"NEW: {len(new_ids)} | UPDATED: {len(updated_ids)} | REMOVED: {len(removed_ids)}")
-
-    new_rows = _fetch_job_details_by_job_ids(conn, latest_id, new_ids)
-    updated_rows = _fetch_job_details_by_job_ids(conn, latest_id, updated_ids)
-    removed_rows = _fetch_job_details_by_job_ids(conn, prev_id, removed_ids)
-
-    _print_section("NEW (new-grad)", new_rows, args.limit)
-    _print_section("UPDATED (new-grad)", updated_rows, args.limit)
-    _print_section("REMOVED (new-grad)", removed_rows, args.limit)
+    print(f"NEW: {len(sections['new'])} | UPDATED: {len(sections['updated'])} | REMOVED: {len(sections['removed'])}")
 
+    _print_section(db, "NEW (new-grad)", sections["new"], args.limit)
+    _print_section(db, "UPDATED (new-grad)", sections["updated"], args.limit)
+    _print_section(db, "REMOVED (new-grad)", sections["removed"], args.limit)
+    db.close()
 
 if __name__ == "__main__":
     main()
@@ -16,17 +16,53 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from job_tracker.persistence import INGEST_ENGINES
 from job_tracker.scheduler import load_company_configs_from_yaml, run_scheduler
 
 
 def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--db", default="live_jobs.db", help="SQLite DB path")
+    p.add_argument("--users-db", default=None, help="User database path (default: <db>.users.db)")
     p.add_argument("--companies", default="companies.yaml", help="YAML config path")
     p.add_argument("--interval-seconds", type=int, default=6 * 3600, help="Seconds between runs")
     p.add_argument("--iterations", type=int, default=0, help="0 = infinite, 1 = run once, N = run N times")
     p.add_argument("--once", action="store_true", help="Run exactly one collection (iterations=1)")
     p.add_argument("--allow-remote", action="store_true", default=True, help="Include remote roles")
+    p.add_argument(
+        "--ingest-engine",
+        choices=INGEST_ENGINES,
+        default="staged",
+        help="Snapshot ingest engine: set-based staging (default) or row-at-a-time",
+    )
+    p.add_argument(
+        "--classify-processes",
+        type=int,
+        default=0,
+        help="Classify new or changed postings on N worker processes (default: in-process)",
+    )
+    p.add_argument(
+        "--maintenance-every",
+        type=int,
+        default=0,
+        help="Run retention/compaction after every N runs (0 = never)",
+    )
+    p.add_argument(
+        "--parquet-dir",
+        default=None,
+        help="Append each run to a Parquet export in this directory (requires pyarrow)",
+    )
+    p.add_argument(
+        "--archive-after-days",
+        type=int,
+        default=None,
+        help="After each run, move history older than N days to <db>.archive.db (default: off)",
+    )
+    p.add_argument(
+        "--backup-dir",
+        default=None,
+        help="After each run, back up every database file to this directory (default: off)",
+    )
     args = p.parse_args()
 
     yaml_path = Path(args.companies)
@@ -42,6 +78,13 @@ def main() -> None:
         interval_seconds=args.interval_seconds,
         iterations=iterations,
         allow_remote=args.allow_remote,
+        ingest_engine=args.ingest_engine,
+        classify_processes=args.classify_processes,
+        maintenance_every=args.maintenance_every,
+        parquet_dir=Path(args.parquet_dir) if args.parquet_dir else None,
+        archive_after_days=args.archive_after_days,
+        users_path=Path(args.users_db) if args.users_db else None,
+        backup_dir=Path(args.backup_dir) if args.backup_dir else None,
     )
 
 
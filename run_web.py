@@ -61,6 +61,13 @@ Examples:
         help="Database path (default: live_jobs.db)"
     )
     
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=8,
+        help="Database connections per worker process (default: 8)"
+    )
+    
     parser.add_argument(
         "--reload",
         action="store_true",
@@ -78,6 +85,7 @@ Examples:
     
     # Set environment variable for database path
     os.environ["DB_PATH"] = str(Path(args.db).absolute())
+    os.environ["DB_POOL_SIZE"] = str(args.pool_size)
     
     # Verify database exists (or will be created on first connection)
     db_path = Path(args.db)
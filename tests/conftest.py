@@ -0,0 +1,56 @@
+"""
+Shared fixtures: a small catalog ingested through ``persist_snapshot``.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from job_tracker.collector import CompanyConfig
+from job_tracker.db import Database
+from job_tracker.models import Job
+from job_tracker.persistence import persist_snapshot
+
+COMPANIES = [CompanyConfig("acme", "Acme", "greenhouse")]
+
+INGESTED_AT = datetime(2026, 3, 2, 9, 30, 15, tzinfo=timezone.utc)
+
+# Long enough to be moved to the blob store (see blobs.BLOB_MIN_CHARS).
+LONG_DESCRIPTION = (
+    "We are hiring recent graduates to join the platform team. " * 12
+).strip()
+
+
+def catalog_jobs():
+    return [
+        Job(
+            job_id="acme-grad",
+            company="Acme",
+            title="Software Engineer",
+            location="New York, NY",
+            url="https://example.com/grad",
+            source="greenhouse",
+            remote=False,
+            extra={"description": LONG_DESCRIPTION, "experience_level": "entry", "job_type": "full_time"},
+        ),
+        Job(
+            job_id="acme-staff",
+            company="Acme",
+            title="Staff Engineer",
+            location="Remote",
+            url="https://example.com/staff",
+            source="greenhouse",
+            remote=True,
+            extra={"description": "Lead the storage team.", "experience_level": "senior", "job_type": "contract"},
+        ),
+    ]
+
+
+@pytest.fixture
+def catalog_path(tmp_path, monkeypatch):
+    """Path of a database holding ``catalog_jobs``; the API is pointed at it."""
+    path = tmp_path / "jobs.db"
+    with Database(path) as db:
+        persist_snapshot(db, INGESTED_AT, catalog_jobs(), COMPANIES)
+    monkeypatch.setenv("DB_PATH", str(path))
+    return path
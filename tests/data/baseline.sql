@@ -0,0 +1,380 @@
+-- A database written by the code before schema versioning (user_version 0):
+-- tests/conftest.py's catalog_jobs ingested on 2026-03-01 09:00:00, then
+-- again on 2026-03-02 09:00:00 with acme-grad retitled "Software Engineer I"
+-- and acme-staff gone; user alice saved acme-staff and applied to acme-grad.
+BEGIN TRANSACTION;
+CREATE TABLE application_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    event_data TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(application_id) REFERENCES applications(application_id)
+);
+INSERT INTO "application_events" VALUES(1,1,'created','{"status": "applied"}','2026-10-19 00:44:45.167677');
+CREATE TABLE application_templates (
+                template_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                application_method TEXT,
+                default_notes TEXT,
+                url_pattern TEXT,
+                resume_id INTEGER,
+                cover_letter_id INTEGER,
+                is_default INTEGER DEFAULT 0,
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(user_id),
+                FOREIGN KEY(resume_id) REFERENCES resumes(resume_id),
+                FOREIGN KEY(cover_letter_id) REFERENCES cover_letters(cover_letter_id)
+            );
+CREATE TABLE applications (
+    application_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    applied_at TIMESTAMP,
+    application_method TEXT,
+    application_url TEXT,
+    notes TEXT,
+    tags TEXT,
+    priority INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL, resume_id INTEGER REFERENCES resumes(resume_id), cover_letter_id INTEGER REFERENCES cover_letters(cover_letter_id),
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id)
+);
+INSERT INTO "applications" VALUES(1,1,'acme-grad','applied','2026-10-19 00:44:45.167677',NULL,NULL,'Referred',NULL,0,'2026-10-19 00:44:45.167677','2026-10-19 00:44:45.167677',NULL,NULL);
+CREATE TABLE companies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+INSERT INTO "companies" VALUES(1,'acme','Acme','greenhouse');
+CREATE TABLE company_analytics (
+    analytics_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company_id INTEGER NOT NULL,
+    snapshot_date DATE NOT NULL,
+    total_jobs_posted INTEGER DEFAULT 0,
+    total_jobs_removed INTEGER DEFAULT 0,
+    avg_posting_duration_days REAL,
+    ghost_posting_rate REAL,
+    posting_frequency_per_month REAL,
+    removal_frequency_per_month REAL,
+    job_churn_rate REAL,
+    reliability_score REAL,
+    new_grad_friendly_score REAL,
+    metrics_json TEXT,
+    FOREIGN KEY(company_id) REFERENCES companies(id),
+    UNIQUE(company_id, snapshot_date)
+);
+CREATE TABLE company_notes (
+    note_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    company_id INTEGER NOT NULL,
+    note_text TEXT NOT NULL,
+    rating INTEGER,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(company_id) REFERENCES companies(id)
+);
+CREATE TABLE company_profiles (
+    company_id INTEGER PRIMARY KEY,
+    website TEXT,
+    description TEXT,
+    industry TEXT,
+    size TEXT,
+    headquarters TEXT,
+    founded_year INTEGER,
+    employee_count INTEGER,
+    linkedin_url TEXT,
+    glassdoor_url TEXT,
+    notes TEXT,
+    FOREIGN KEY(company_id) REFERENCES companies(id)
+);
+CREATE TABLE cover_letters (
+                cover_letter_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                content TEXT,
+                file_url TEXT,
+                file_path TEXT,
+                version TEXT,
+                notes TEXT,
+                is_default INTEGER DEFAULT 0,
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            );
+CREATE TABLE interviews (
+    interview_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    interview_type TEXT NOT NULL,
+    scheduled_at TIMESTAMP,
+    duration_minutes INTEGER,
+    interviewer_name TEXT,
+    interviewer_email TEXT,
+    location TEXT,
+    notes TEXT,
+    preparation_notes TEXT,
+    follow_up_required INTEGER DEFAULT 0,
+    follow_up_date DATE,
+    status TEXT DEFAULT 'scheduled',
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(application_id) REFERENCES applications(application_id)
+);
+CREATE TABLE job_recommendations (
+    recommendation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    reason TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id)
+);
+CREATE TABLE job_tags (
+    job_id TEXT NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY(job_id, tag_id),
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id),
+    FOREIGN KEY(tag_id) REFERENCES tags(tag_id)
+);
+CREATE TABLE job_versions (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT,
+    remote INTEGER,
+    extra TEXT, sector TEXT,
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id)
+);
+INSERT INTO "job_versions" VALUES(1,'acme-grad','2026-03-01 09:00:00','Software Engineer','New York, NY',0,'{"description": "We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team.", "experience_level": "entry", "job_type": "full_time"}',NULL);
+INSERT INTO "job_versions" VALUES(2,'acme-staff','2026-03-01 09:00:00','Staff Engineer','Remote',1,'{"description": "Lead the storage team.", "experience_level": "senior", "job_type": "contract"}',NULL);
+INSERT INTO "job_versions" VALUES(3,'acme-grad','2026-03-02 09:00:00','Software Engineer I','New York, NY',0,'{"description": "We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team. We are hiring recent graduates to join the platform team.", "experience_level": "entry", "job_type": "full_time"}',NULL);
+CREATE TABLE jobs (
+    job_id TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    first_seen TIMESTAMP NOT NULL,
+    last_seen TIMESTAMP NOT NULL,
+    removed_at TIMESTAMP,
+    active INTEGER NOT NULL DEFAULT 1,
+    FOREIGN KEY(company_id) REFERENCES companies(id)
+);
+INSERT INTO "jobs" VALUES('acme-grad',1,'https://example.com/grad','greenhouse','2026-03-01 09:00:00','2026-03-02 09:00:00',NULL,1);
+INSERT INTO "jobs" VALUES('acme-staff',1,'https://example.com/staff','greenhouse','2026-03-01 09:00:00','2026-03-01 09:00:00','2026-03-02 09:00:00',0);
+CREATE TABLE market_analytics (
+    analytics_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_date DATE NOT NULL,
+    sector_trends TEXT,
+    degree_compatibility TEXT,
+    company_reliability TEXT,
+    hiring_velocity TEXT,
+    insights_json TEXT
+);
+CREATE TABLE notification_preferences (
+    user_id INTEGER PRIMARY KEY,
+    email_enabled INTEGER DEFAULT 1,
+    job_alerts INTEGER DEFAULT 1,
+    status_changes INTEGER DEFAULT 1,
+    reminders INTEGER DEFAULT 1,
+    deadlines INTEGER DEFAULT 1,
+    weekly_digest INTEGER DEFAULT 1,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+INSERT INTO "notification_preferences" VALUES(1,1,1,1,1,1,1);
+CREATE TABLE notifications (
+    notification_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    related_job_id TEXT,
+    related_application_id INTEGER,
+    read INTEGER DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(related_job_id) REFERENCES jobs(job_id),
+    FOREIGN KEY(related_application_id) REFERENCES applications(application_id)
+);
+CREATE TABLE offers (
+    offer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL UNIQUE,
+    offer_date DATE NOT NULL,
+    salary_amount REAL,
+    salary_currency TEXT DEFAULT 'USD',
+    salary_period TEXT,
+    equity TEXT,
+    benefits TEXT,
+    start_date DATE,
+    decision_deadline DATE,
+    status TEXT DEFAULT 'pending',
+    notes TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(application_id) REFERENCES applications(application_id)
+);
+CREATE TABLE password_reset_tokens (
+    token_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    token TEXT NOT NULL UNIQUE,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    used_at TIMESTAMP,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+CREATE TABLE resumes (
+                resume_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                file_url TEXT,
+                file_path TEXT,
+                version TEXT,
+                notes TEXT,
+                is_default INTEGER DEFAULT 0,
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            );
+CREATE TABLE run_errors (
+    error_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    company_slug TEXT,
+    company_name TEXT,
+    ats TEXT,
+    error TEXT NOT NULL,
+    FOREIGN KEY(run_id) REFERENCES runs(run_id)
+);
+CREATE TABLE runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    status TEXT NOT NULL, -- 'running' | 'ok' | 'error'
+    companies_total INTEGER NOT NULL DEFAULT 0,
+    companies_succeeded INTEGER NOT NULL DEFAULT 0,
+    companies_failed INTEGER NOT NULL DEFAULT 0,
+    jobs_collected INTEGER NOT NULL DEFAULT 0,
+    notes TEXT
+);
+CREATE TABLE saved_jobs (
+    saved_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    saved_at TIMESTAMP NOT NULL,
+    notes TEXT,
+    tags TEXT,
+    priority INTEGER DEFAULT 0,
+    deadline DATE,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id),
+    UNIQUE(user_id, job_id)
+);
+INSERT INTO "saved_jobs" VALUES(1,1,'acme-staff','2026-03-01 10:00:00',NULL,NULL,0,NULL);
+CREATE TABLE saved_searches (
+    search_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    filters TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    last_run_at TIMESTAMP,
+    notification_enabled INTEGER DEFAULT 1,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+CREATE TABLE share_links (
+                share_id TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                resource_type TEXT NOT NULL,
+                resource_id TEXT,
+                expires_at TIMESTAMP,
+                created_at TIMESTAMP NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(user_id)
+            );
+CREATE TABLE snapshot_jobs (
+    snapshot_id INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    version_id INTEGER NOT NULL,
+    is_new_grad INTEGER NOT NULL,
+    PRIMARY KEY(snapshot_id, job_id),
+    FOREIGN KEY(snapshot_id) REFERENCES snapshots(snapshot_id),
+    FOREIGN KEY(job_id) REFERENCES jobs(job_id),
+    FOREIGN KEY(version_id) REFERENCES job_versions(version_id)
+);
+INSERT INTO "snapshot_jobs" VALUES(1,'acme-grad',1,1);
+INSERT INTO "snapshot_jobs" VALUES(1,'acme-staff',2,0);
+INSERT INTO "snapshot_jobs" VALUES(2,'acme-grad',3,1);
+CREATE TABLE snapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TIMESTAMP NOT NULL,
+    run_id INTEGER,
+    FOREIGN KEY(run_id) REFERENCES runs(run_id)
+);
+INSERT INTO "snapshots" VALUES(1,'2026-03-01 09:00:00',NULL);
+INSERT INTO "snapshots" VALUES(2,'2026-03-02 09:00:00',NULL);
+CREATE TABLE tags (
+    tag_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    color TEXT,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id),
+    UNIQUE(user_id, name)
+);
+CREATE TABLE user_analytics (
+    analytics_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    computed_at TIMESTAMP NOT NULL,
+    total_applications INTEGER DEFAULT 0,
+    total_saved_jobs INTEGER DEFAULT 0,
+    applications_by_status TEXT,
+    success_rate REAL,
+    avg_response_time_days REAL,
+    top_companies TEXT,
+    top_sectors TEXT,
+    insights_json TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+CREATE TABLE user_profiles (
+    profile_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    full_name TEXT,
+    degree_type TEXT,
+    graduation_year INTEGER,
+    skills TEXT,
+    location_preference TEXT,
+    remote_preference INTEGER,
+    target_sectors TEXT,
+    resume_url TEXT,
+    notes TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+CREATE TABLE user_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+CREATE TABLE users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE,
+    password_hash TEXT,
+    created_at TIMESTAMP NOT NULL,
+    last_login TIMESTAMP,
+    preferences TEXT
+);
+INSERT INTO "users" VALUES(1,'alice','alice@example.com','x','2026-10-19 00:44:45.167039',NULL,NULL);
+DELETE FROM "sqlite_sequence";
+INSERT INTO "sqlite_sequence" VALUES('snapshots',2);
+INSERT INTO "sqlite_sequence" VALUES('companies',3);
+INSERT INTO "sqlite_sequence" VALUES('job_versions',3);
+INSERT INTO "sqlite_sequence" VALUES('users',1);
+INSERT INTO "sqlite_sequence" VALUES('saved_jobs',1);
+INSERT INTO "sqlite_sequence" VALUES('applications',1);
+INSERT INTO "sqlite_sequence" VALUES('application_events',1);
+COMMIT;
@@ -0,0 +1,73 @@
+"""
+Catalog read routes: public fields with decoded timestamps and full
+``extra`` text, and search that sees blob-backed descriptions.
+"""
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from job_tracker.api.main import app
+from job_tracker.blobs import BLOB_REF
+from job_tracker.db import Database
+
+from conftest import LONG_DESCRIPTION
+
+
+def test_company_jobs_shape(catalog_path):
+    with TestClient(app) as client:
+        company_id = client.get("/api/companies").json()[0]["id"]
+        jobs = client.get(f"/api/companies/{company_id}/jobs").json()
+
+    assert {job["job_id"] for job in jobs} == {"acme-grad", "acme-staff"}
+    grad = next(job for job in jobs if job["job_id"] == "acme-grad")
+    assert set(grad) == {
+        "job_id", "company_id", "url", "source", "first_seen", "last_seen", "removed_at",
+        "active", "title", "location", "remote", "sector", "extra", "is_new_grad",
+    }
+    assert grad["first_seen"] == grad["last_seen"] == "2026-03-02T09:30:15Z"
+    assert grad["removed_at"] is None
+    assert grad["active"] is True
+    assert grad["extra"]["description"] == LONG_DESCRIPTION
+
+
+def _search(client, **params):
+    body = client.get("/api/jobs", params=params).json()
+    return sorted(job["job_id"] for job in body["jobs"])
+
+
+def test_keyword_search_reads_blob_backed_text(catalog_path):
+    with Database(catalog_path) as db:
+        extra = db.conn.execute(
+            "SELECT v.extra FROM jobs_current v JOIN jobs j ON j.job_key = v.job_key WHERE j.job_id = 'acme-grad'"
+        ).fetchone()[0]
+    key = json.loads(extra)["description"][BLOB_REF]
+
+    with TestClient(app) as client:
+        # Only in the description, which is stored in the blob table.
+        assert _search(client, keywords="graduates") == ["acme-grad"]
+        assert _search(client, keywords="storage team") == ["acme-staff"]
+        assert _search(client, keywords="Engineer") == ["acme-grad", "acme-staff"]
+        assert _search(client, keywords=key) == []
+
+
+def test_extra_filters(catalog_path):
+    with TestClient(app) as client:
+        assert _search(client, experience_level="entry") == ["acme-grad"]
+        assert _search(client, experience_level="SENIOR") == ["acme-staff"]
+        assert _search(client, job_type="full_time") == ["acme-grad"]
+        assert _search(client, job_type="full") == []
+        assert _search(client, experience_level="entry", job_type="contract") == []
+
+
+def test_jobs_csv_keeps_timestamp_layout(catalog_path):
+    with TestClient(app) as client:
+        token = client.post(
+            "/api/auth/register", json={"username": "carol", "password": "Correct-Horse-42"}
+        ).json()["session_token"]
+        r = client.get("/api/export/jobs/csv", headers={"Authorization": f"Bearer {token}"})
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 2
+    assert {(row["Posted At"], row["Last Seen"]) for row in rows} == {("2026-03-02 09:30:15", "2026-03-02 09:30:15")}
@@ -0,0 +1,22 @@
+"""
+Route handlers run on the threadpool: they make blocking sqlite3 calls,
+which would stall the event loop inside ``async def``.
+"""
+
+import importlib
+import inspect
+import pkgutil
+
+from fastapi.routing import APIRoute
+
+import job_tracker.api.routes
+
+
+def test_route_handlers_are_synchronous():
+    offenders = []
+    for module in pkgutil.iter_modules(job_tracker.api.routes.__path__):
+        router = importlib.import_module(f"job_tracker.api.routes.{module.name}").router
+        for route in router.routes:
+            if isinstance(route, APIRoute) and inspect.iscoroutinefunction(route.endpoint):
+                offenders.append(f"{sorted(route.methods)} {route.path}")
+    assert offenders == []
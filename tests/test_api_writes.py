@@ -0,0 +1,73 @@
+"""
+API write path: commits land before the response, and password hashing
+stays out of the writer.
+"""
+
+import importlib
+import pkgutil
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+import job_tracker.api.routes
+from job_tracker.api.dependencies import get_write_db
+from job_tracker.api.main import app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "jobs.db"))
+    sent_after_commits = []
+
+    async def recording_app(scope, receive, send):
+        async def record(message):
+            if message["type"] == "http.response.start":
+                sent_after_commits.append(app.state.writer.commits)
+            await send(message)
+
+        await app(scope, receive, record if scope["type"] == "http" else send)
+
+    with TestClient(recording_app) as c:
+        c.sent_after_commits = sent_after_commits
+        yield c
+
+
+def _dependencies(dependant):
+    for dep in dependant.dependencies:
+        yield dep
+        yield from _dependencies(dep)
+
+
+def test_write_routes_exit_before_response():
+    """Request-scoped get_write_db would commit after the response is sent."""
+    offenders = []
+    for module in pkgutil.iter_modules(job_tracker.api.routes.__path__):
+        router = importlib.import_module(f"job_tracker.api.routes.{module.name}").router
+        for route in router.routes:
+            if not isinstance(route, APIRoute):
+                continue
+            for dep in _dependencies(route.dependant):
+                if dep.call is get_write_db and dep.scope != "function":
+                    offenders.append(f"{sorted(route.methods)} {route.path}")
+    assert offenders == []
+
+
+def test_write_committed_before_response(client):
+    r = client.post("/api/auth/password/reset-request", json={"email": "nobody@example.com"})
+    assert r.status_code == 200
+    assert client.sent_after_commits == [1]
+
+
+def test_auth_round_trip(client):
+    r = client.post("/api/auth/register", json={"username": "alice", "password": "Correct-Horse-42"})
+    assert r.status_code == 201, r.text
+    assert client.post("/api/auth/register", json={"username": "alice", "password": "Correct-Horse-42"}).status_code == 400
+
+    r = client.post("/api/auth/login", json={"username": "alice", "password": "Correct-Horse-42"})
+    assert r.status_code == 200, r.text
+    token = r.json()["session_token"]
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).json()["username"] == "alice"
+    assert client.post("/api/auth/login", json={"username": "alice", "password": "wrong"}).status_code == 401
+    # Only the user/session rows went through the writer: one task per call.
+    assert app.state.writer.tasks == 2
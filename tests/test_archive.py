@@ -0,0 +1,75 @@
+"""
+Reading and compacting after archiving: jobs and versions that archived
+rows use stay reachable.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from job_tracker.api.main import app
+from job_tracker.archive import ArchivePolicy, archive_cold_rows, archive_path_for
+from job_tracker.db import Database
+from job_tracker.maintenance import RetentionPolicy, compact_jobs
+
+
+def test_compact_keeps_versions_of_archived_intervals(tmp_path):
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    old, recent = now - timedelta(days=200), now - timedelta(days=1)
+    with Database(tmp_path / "jobs.db") as db:
+        company_id = db.upsert_company("acme", "Acme", "greenhouse")
+        db.insert_job("acme-1", company_id, "https://example.com/1", "greenhouse", old, now)
+        # Two identical versions recorded recently, so they stay hot, but
+        # only seen in snapshots old enough for their intervals to move.
+        v1 = db.insert_job_version("acme-1", now, "Engineer", "NYC", False, "{}")
+        v2 = db.insert_job_version("acme-1", now, "Engineer", "NYC", False, "{}")
+        v3 = db.insert_job_version("acme-1", now, "Senior Engineer", "NYC", False, "{}")
+        for version_id, when in ((v1, old), (v2, old), (v3, recent), (v3, now)):
+            db.insert_snapshot_job(db.insert_snapshot(when), "acme-1", version_id, False)
+        db.upsert_job_current("acme-1", v3, False)
+
+        report = archive_cold_rows(db, ArchivePolicy(after_days=90), now=now)
+        assert report.intervals_archived == 2
+        assert report.versions_archived == 0
+
+        compact_jobs(db, RetentionPolicy())
+
+        dangling = db.conn.execute(
+            """
+            SELECT a.version_id FROM archive.snapshot_membership a
+            WHERE NOT EXISTS (SELECT 1 FROM main.job_versions v WHERE v.version_id = a.version_id)
+              AND NOT EXISTS (SELECT 1 FROM archive.job_versions v WHERE v.version_id = a.version_id)
+            """
+        ).fetchall()
+        assert dangling == []
+    assert archive_path_for(tmp_path / "jobs.db").exists()
+
+
+def test_retired_job_detail_comes_from_archive(tmp_path, monkeypatch):
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    old = now - timedelta(days=200)
+    with Database(tmp_path / "jobs.db") as db:
+        company_id = db.upsert_company("acme", "Acme", "greenhouse")
+        for job_id in ("acme-1", "acme-2"):
+            db.insert_job(job_id, company_id, f"https://example.com/{job_id}", "greenhouse", old, old)
+        v1 = db.insert_job_version("acme-1", old, "Engineer", "NYC", False, '{"description": "Build things"}')
+        v2 = db.insert_job_version("acme-2", old, "Designer", "LA", True, "{}")
+        db.insert_snapshot_job(db.insert_snapshot(old), "acme-1", v1, True)
+        for when in (old, now - timedelta(days=1), now):
+            db.insert_snapshot_job(db.insert_snapshot(when), "acme-2", v2, False)
+        db.upsert_job_current("acme-1", v1, True)
+        db.upsert_job_current("acme-2", v2, False)
+        db.mark_jobs_removed(["acme-1"], old + timedelta(days=1))
+
+        report = archive_cold_rows(db, ArchivePolicy(after_days=90), now=now)
+        assert (report.jobs_retired, report.versions_archived) == (1, 1)
+
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "jobs.db"))
+    with TestClient(app) as client:
+        retired = client.get("/api/jobs/acme-1")
+        assert retired.status_code == 200
+        body = retired.json()
+        assert (body["title"], body["company"], body["is_new_grad"]) == ("Engineer", "Acme", True)
+        assert body["description"] == "Build things"
+        assert client.get("/api/jobs/acme-2").json()["title"] == "Designer"
+        assert client.get("/api/jobs/missing").status_code == 404
@@ -0,0 +1,68 @@
+"""
+Blob store: pack_extra moves large values out of the stored JSON and
+hydrate_extra puts them back unchanged.
+"""
+
+import json
+
+import pytest
+
+from job_tracker.blobs import BLOB_MIN_CHARS, BLOB_REF, blob_key, hydrate_extra, pack_extra, strip_blob_refs
+from job_tracker.db import Database
+
+from conftest import LONG_DESCRIPTION
+
+EXTRA = {
+    "experience_level": "entry",
+    "description": LONG_DESCRIPTION,
+    "remote": False,
+    "offices": [f"Office {i} — Zürich" for i in range(60)],
+    "compensation": {"notes": "x" * BLOB_MIN_CHARS, "currency": "USD"},
+    "team": "platform",
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    with Database(tmp_path / "jobs.db") as db:
+        yield db
+
+
+def test_small_extra_stays_inline():
+    extra = {"experience_level": "entry", "tags": ["python"], "note": "x" * (BLOB_MIN_CHARS - 10)}
+    packed, blobs = pack_extra(extra)
+    assert blobs == {}
+    assert json.loads(packed) == extra
+    assert pack_extra(None) == ("{}", {})
+
+
+def test_round_trip(db):
+    packed, blobs = pack_extra(EXTRA)
+    stored = json.loads(packed)
+    assert {name for name, value in stored.items() if isinstance(value, dict) and BLOB_REF in value} == {
+        "description", "offices", "compensation",
+    }
+    assert stored["description"] == {BLOB_REF: blob_key(json.dumps(LONG_DESCRIPTION, ensure_ascii=False))}
+    assert strip_blob_refs(stored) == {"experience_level": "entry", "remote": False, "team": "platform"}
+
+    db.put_blobs(blobs)
+    hydrated = hydrate_extra(db.conn, packed)
+    assert hydrated == EXTRA
+    assert list(hydrated) == list(EXTRA)
+
+
+def test_identical_values_stored_once(db):
+    first, blobs = pack_extra({"description": LONG_DESCRIPTION})
+    second, more = pack_extra({"content": LONG_DESCRIPTION, "title": "changed"})
+    assert blobs == more
+    db.put_blobs(blobs)
+    db.put_blobs(more)
+    assert db.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 1
+    assert hydrate_extra(db.conn, second) == {"content": LONG_DESCRIPTION, "title": "changed"}
+
+
+def test_missing_blob_is_dropped(db):
+    packed, _ = pack_extra(EXTRA)
+    assert hydrate_extra(db.conn, packed) == {"experience_level": "entry", "remote": False, "team": "platform"}
+    assert hydrate_extra(db.conn, "not json") == {}
+    assert hydrate_extra(db.conn, None) == {}
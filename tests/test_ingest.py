@@ -0,0 +1,129 @@
+"""
+Ingest: the staged and rows engines agree, classifier results are cached
+per ``CLASSIFIER_VERSION``, and the staged engine writes them only in its
+merge transaction.
+"""
+
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from job_tracker import classification, persistence
+from job_tracker.collector import CompanyConfig
+from job_tracker.db import Database
+from job_tracker.diff_engine import CLASSIFIER_VERSION
+from job_tracker.maintenance import RetentionPolicy, prune_classification_cache
+from job_tracker.models import Job
+
+from conftest import COMPANIES, INGESTED_AT, catalog_jobs
+
+GLOBEX = CompanyConfig("globex", "Globex", "lever")
+
+
+def _runs():
+    """Snapshots exercising new, changed, removed, returning and unfetched jobs."""
+    grad, staff = catalog_jobs()
+    intern = replace(staff, job_id="acme-intern", title="Engineering Intern", url="https://example.com/intern",
+                     extra={"description": "Summer internship for students."})
+    globex = Job("globex-1", "Globex", "Analyst", "Springfield", "https://example.com/g1", "lever")
+    retitled = replace(grad, title="Software Engineer I")
+    companies = COMPANIES + [GLOBEX]
+    return [
+        ([grad, staff, globex], companies, ()),
+        ([retitled, intern, globex], companies, ()),
+        # Globex's fetch failed: its job must not be marked removed.
+        ([retitled, staff, intern], companies, ("globex",)),
+    ]
+
+
+def _ingest(path, engine):
+    with Database(path) as db:
+        for i, (jobs, companies, failed) in enumerate(_runs()):
+            persistence.persist_snapshot(
+                db, INGESTED_AT + timedelta(days=i), jobs, companies, failed_slugs=failed, engine=engine
+            )
+        return _state(db)
+
+
+def _state(db):
+    """Catalog contents, independent of row ids."""
+    def rows(sql):
+        return sorted((tuple(row) for row in db.conn.execute(sql)), key=repr)
+
+    return {
+        "jobs": rows("SELECT job_id, url, source, first_seen, last_seen, removed_at, active FROM jobs"),
+        "versions": rows(
+            "SELECT j.job_id, v.timestamp, v.title, v.location, v.remote, v.extra "
+            "FROM job_versions v JOIN jobs j USING (job_key)"
+        ),
+        "members": rows(
+            "SELECT sj.snapshot_id, sj.job_id, v.title, sj.is_new_grad, r.reasons FROM snapshot_jobs sj "
+            "JOIN job_versions v ON v.version_id = sj.version_id "
+            "LEFT JOIN classification_reasons r ON r.reasons_id = sj.reasons_id"
+        ),
+        "current": rows(
+            "SELECT j.job_id, v.company_name, v.title, v.extra, v.is_new_grad, r.reasons, v.active, "
+            "v.content_hash, v.search_text, v.experience_level, v.job_type "
+            "FROM jobs_current v JOIN jobs j USING (job_key) LEFT JOIN classification_reasons r USING (reasons_id)"
+        ),
+        "blobs": rows("SELECT hash, data FROM blobs"),
+        "cache": rows("SELECT input_hash, classifier_version, is_new_grad, reasons FROM classification_cache"),
+    }
+
+
+def test_engines_agree(tmp_path):
+    staged = _ingest(tmp_path / "staged.db", "staged")
+    assert staged == _ingest(tmp_path / "rows.db", "rows")
+    active = {row[0]: row[-1] for row in staged["jobs"]}
+    assert active == {"acme-grad": 1, "acme-staff": 1, "acme-intern": 1, "globex-1": 1}
+    assert len(staged["versions"]) == 5
+    assert len(staged["blobs"]) == 1
+
+
+@pytest.mark.parametrize("engine", ["staged", "rows"])
+def test_classifier_cache(tmp_path, monkeypatch, engine):
+    classified = []
+
+    def counting_classify_many(jobs, **kwargs):
+        jobs = list(jobs)
+        classified.extend(job.job_id for job in jobs)
+        return real_classify_many(jobs, **kwargs)
+
+    real_classify_many = classification.classify_many
+    monkeypatch.setattr(classification, "classify_many", counting_classify_many)
+
+    def ingest(db, day):
+        persistence.persist_snapshot(db, INGESTED_AT + timedelta(days=day), catalog_jobs(), COMPANIES, engine=engine)
+
+    with Database(tmp_path / "jobs.db") as db:
+        ingest(db, 0)
+        assert sorted(classified) == ["acme-grad", "acme-staff"]
+        ingest(db, 1)
+        assert len(classified) == 2  # all hits
+
+        # New rules: every cached row is a miss and is overwritten.
+        monkeypatch.setattr(classification, "CLASSIFIER_VERSION", CLASSIFIER_VERSION + 1)
+        ingest(db, 2)
+        assert len(classified) == 4
+        versions = db.conn.execute("SELECT DISTINCT classifier_version FROM classification_cache").fetchall()
+        assert [row[0] for row in versions] == [CLASSIFIER_VERSION + 1]
+
+    # Maintenance drops rows written by another classifier version.
+    with Database(tmp_path / "jobs.db") as db:
+        deleted = prune_classification_cache(db, RetentionPolicy(), INGESTED_AT + timedelta(days=2))
+        assert deleted == 2
+
+
+def test_staged_failure_before_merge_leaves_no_cache_rows(tmp_path, monkeypatch):
+    def broken_pack(extra):
+        raise RuntimeError("pack failed")
+
+    monkeypatch.setattr(persistence, "pack_extra", broken_pack)
+    with Database(tmp_path / "jobs.db") as db:
+        with pytest.raises(RuntimeError):
+            persistence.persist_snapshot(db, INGESTED_AT, catalog_jobs(), COMPANIES)
+        # Whatever commits next on this connection must not store them.
+        db.conn.commit()
+        assert db.conn.execute("SELECT COUNT(*) FROM classification_cache").fetchone()[0] == 0
+        assert db.conn.execute("SELECT COUNT(*) FROM classification_reasons").fetchone()[0] == 0
@@ -0,0 +1,90 @@
+"""
+Migrating a database written before schema versioning to the current
+schema, in one open.
+"""
+
+import sqlite3
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from job_tracker.blobs import BLOB_REF, hydrate_extra
+from job_tracker.db import USER_SCHEMA_NAME, Database, to_epoch
+from job_tracker.persistence import persist_snapshot
+
+from conftest import COMPANIES, LONG_DESCRIPTION, catalog_jobs
+
+BASELINE_SQL = Path(__file__).parent / "data" / "baseline.sql"
+
+
+@pytest.fixture
+def migrated(tmp_path):
+    path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SQL.read_text())
+    conn.close()
+    with Database(path) as db:
+        yield db
+
+
+def _current(db):
+    rows = db.conn.execute(
+        """
+        SELECT j.job_id, j.first_seen, j.removed_at, v.title, v.active, v.extra,
+               v.search_text, v.experience_level
+        FROM jobs j JOIN jobs_current v ON v.job_key = j.job_key ORDER BY j.job_id
+        """
+    )
+    return {row["job_id"]: row for row in rows}
+
+
+def test_schema_version(migrated):
+    version = migrated.conn.execute("PRAGMA main.user_version").fetchone()[0]
+    assert version == len(Database._MIGRATIONS)
+
+
+def test_catalog(migrated):
+    current = _current(migrated)
+    assert set(current) == {"acme-grad", "acme-staff"}
+    grad, staff = current["acme-grad"], current["acme-staff"]
+    assert grad["title"] == "Software Engineer I" and grad["active"] == 1
+    assert staff["active"] == 0
+    assert grad["first_seen"] == to_epoch(datetime(2026, 3, 1, 9, tzinfo=timezone.utc))
+    assert staff["removed_at"] == to_epoch(datetime(2026, 3, 2, 9, tzinfo=timezone.utc))
+
+    members = migrated.conn.execute("SELECT snapshot_id, job_id FROM snapshot_jobs ORDER BY 1, 2").fetchall()
+    assert [tuple(row) for row in members] == [(1, "acme-grad"), (1, "acme-staff"), (2, "acme-grad")]
+
+
+def test_extra_packed_and_searchable(migrated):
+    grad = _current(migrated)["acme-grad"]
+    assert BLOB_REF in grad["extra"]
+    assert hydrate_extra(migrated.conn, grad["extra"])["description"] == LONG_DESCRIPTION
+    assert "graduates" in grad["search_text"]
+    assert grad["experience_level"] == "entry"
+    versions = migrated.conn.execute("SELECT extra FROM job_versions").fetchall()
+    assert all(hydrate_extra(migrated.conn, row[0])["description"] for row in versions)
+
+
+def test_user_data_moved(migrated):
+    catalog_tables = {
+        row[0] for row in migrated.conn.execute("SELECT name FROM main.sqlite_master WHERE type='table'")
+    }
+    assert "users" not in catalog_tables and "saved_jobs" not in catalog_tables
+    saved = migrated.conn.execute(f"SELECT job_id FROM {USER_SCHEMA_NAME}.saved_jobs").fetchall()
+    assert [row[0] for row in saved] == ["acme-staff"]
+    notes = migrated.conn.execute(f"SELECT notes FROM {USER_SCHEMA_NAME}.applications").fetchall()
+    assert [row[0] for row in notes] == ["Referred"]
+
+
+def test_ingest_after_migration(migrated):
+    grad, staff = catalog_jobs()
+    versions = migrated.conn.execute("SELECT COUNT(*) FROM job_versions").fetchone()[0]
+    jobs = [replace(grad, title="Software Engineer I"), staff]
+    persist_snapshot(migrated, datetime(2026, 3, 3, 9, tzinfo=timezone.utc), jobs, COMPANIES)
+    assert _current(migrated)["acme-staff"]["active"] == 1
+    # Content hashes were recomputed over the packed extra, so both jobs
+    # are recognized as unchanged and keep their versions.
+    assert migrated.conn.execute("SELECT COUNT(*) FROM job_versions").fetchone()[0] == versions
@@ -0,0 +1,20 @@
+"""
+Hot queries are served by indexes on a freshly migrated database.
+"""
+
+import pytest
+
+from job_tracker.db import Database
+from job_tracker.query_plans import HOT_QUERIES, full_scans
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    with Database(tmp_path_factory.mktemp("plans") / "plans.db") as db:
+        yield db
+
+
+@pytest.mark.parametrize("query", HOT_QUERIES, ids=lambda query: query.name)
+def test_no_full_scan(db, query):
+    plan, offending = full_scans(db.conn, query)
+    assert not offending, "\n".join(plan)
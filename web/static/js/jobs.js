@@ -433,6 +433,12 @@ async function viewJobDetail(jobId) {
                     <span class="badge badge-new-grad">New Grad Position</span>
                 </div>
             ` : ''}
+            ${job.new_grad_reasons && job.new_grad_reasons.length ? `
+                <div class="modal-body-section">
+                    <h3>${job.is_new_grad ? 'Why New Grad' : 'Why Not New Grad'}</h3>
+                    <ul>${job.new_grad_reasons.map(reason => `<li>${escapeHtml(reason)}</li>`).join('')}</ul>
+                </div>
+            ` : ''}
         `;
         
         modal.classList.add('show');